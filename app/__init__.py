@@ -1 +1,4 @@
-from app.init import run
\ No newline at end of file
+def run() -> int:
+    # Qt erst beim Start der Oberfläche importieren, der Headless-Collector kommt ohne aus
+    from app.init import run as run_gui
+    return run_gui()
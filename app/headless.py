@@ -0,0 +1,45 @@
+import argparse
+import signal
+import sys
+from typing import Optional, Sequence
+
+from app.utilities.AppConfig import AppConfig
+from app.utilities.HeadlessCollector import HeadlessCollector
+from app.utilities.Session import Session
+
+
+def run(argv: Optional[Sequence[str]] = None) -> int:
+    """Sammelt ohne Oberfläche, importiert weder Qt noch WebEngine"""
+    parser = argparse.ArgumentParser(description="Collect mesh traffic without the GUI")
+    parser.add_argument("--headless", action="store_true")
+    # Wertet main.py aus, hier nur damit argparse die Option kennt
+    parser.add_argument("--startup-timing", action="store_true", help="log startup phases")
+    parser.add_argument("--type", default="serial",
+                        choices=["serial", "tcp", "ble", "replay", "synthetic"])
+    parser.add_argument("--port", default="", help="serial port")
+    parser.add_argument("--host", default="", help="TCP host")
+    parser.add_argument("--addr", default="", help="BLE address")
+    parser.add_argument("--file", help="capture file to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 = unthrottled")
+    parser.add_argument("--name", help="radio name stored with each packet")
+    parser.add_argument("--record", help="also record raw packets to a capture file")
+    parser.add_argument("--capture", help="SQLite capture store, default from [capture] in config.ini")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="write JSON lines to stdout, the default without a capture store")
+    args = parser.parse_args(argv)
+
+    config = AppConfig().load()
+    capture = args.capture
+    if capture is None and config.getboolean('capture', 'enabled', fallback=False):
+        capture = config.get('capture', 'path', fallback='capture.sqlite')
+
+    collector = HeadlessCollector(
+        capture=capture,
+        output=sys.stdout if args.jsonl or not capture else None,
+        batch_interval=config.getint('interface', 'batch_interval_ms', fallback=250) / 1000,
+        batch_size=config.getint('interface', 'batch_size', fallback=500),
+        reconnect=Session.reconnect_options(config),
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: collector.stop())
+    return collector.run(args.type, port=args.port, host=args.host, addr=args.addr,
+                         file=args.file, speed=args.speed, record=args.record, name=args.name)
@@ -1,12 +1,35 @@
 import sys
 
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QApplication
 
-from app.ui.MainWindow import MainWindow
+from app.utilities.StartupTimer import startup_timer
+
+startup_timer.mark("Qt import")
+
+from app.ui.MainWindow import MainWindow  # pylint: disable=wrong-import-position
+
+startup_timer.mark("UI import")
+
+
+def create_application(argv: list) -> QApplication:
+    # QtWebEngine wird erst mit dem MapWindow importiert, also nach QApplication
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    return QApplication(argv)
 
 
 def run() -> int:
-    app: QApplication = QApplication(sys.argv)
+    app: QApplication = create_application(sys.argv)
+    startup_timer.mark("QApplication")
+
     window: MainWindow = MainWindow()
     window.show()
+    startup_timer.mark("show")
+
+    # Die erste Runde der Event-Loop zeichnet die Node-Liste, ab dann ist sie bedienbar
+    def first_frame() -> None:
+        startup_timer.mark("first frame")
+        startup_timer.report()
+
+    QTimer.singleShot(0, first_frame)
     return sys.exit(app.exec())
@@ -1,16 +1,37 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+import logging
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
 from app.ui.views import LogTableView
+from app.utilities.AppConfig import AppConfig
+from app.utilities.LogPipeline import LogCollector, add_repeat_filter
 from app.utilities.SettingsManager import SettingsManager
 
 
 class LogWindow(QWidget):
-    def __init__(self, interface) -> None:
+    def __init__(self, interface, log_collector: LogCollector = None) -> None:
         super().__init__()
         self.interface = interface
+
+        # Alle Meldungen des Root-Loggers landen gepuffert in der Tabelle. Wird das
+        # Fenster erst später geöffnet, sammelt der übergebene Collector schon ab Start
+        self.logCollector = log_collector
+        if self.logCollector is None:
+            self.logCollector = self.create_collector()
+
         self.readSettings()
         self.initUi()
 
+    @staticmethod
+    def create_collector() -> LogCollector:
+        config = AppConfig().load()
+        collector = LogCollector(config.getint('logging', 'buffer', fallback=10000))
+        # Dieselbe Drosselung wie für Konsole und Datei, sonst landet jeder Schwall in der Tabelle
+        add_repeat_filter(collector, config.getfloat('logging', 'repeat_interval', fallback=10.0))
+        logging.getLogger().addHandler(collector)
+        return collector
+
     def initUi(self) -> None:
         self.setWindowTitle("Log")
         self.setMinimumSize(800, 200)
@@ -18,8 +39,24 @@ class LogWindow(QWidget):
         layout = QVBoxLayout()
 
         layout.addWidget(LogTableView(self))
+
+        self.countsLabel = QLabel()
+        layout.addWidget(self.countsLabel)
         self.setLayout(layout)
 
+        self.countsTimer = QTimer(self)
+        self.countsTimer.setInterval(1000)
+        self.countsTimer.timeout.connect(self.update_counts)
+        self.countsTimer.start()
+
+    def update_counts(self) -> None:
+        counts = self.logCollector.counts
+        text = "  ".join(f"{level}: {counts[level]}" for level in
+                         ('CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG') if counts[level])
+        if self.logCollector.dropped:
+            text += f"  (dropped: {self.logCollector.dropped})"
+        self.countsLabel.setText(text)
+
     def writeSettings(self):
         SettingsManager().save_window_state("Log", self.saveGeometry())
 
@@ -1,32 +1,144 @@
-from PyQt6.QtCore import Qt, QSize, QSettings, QByteArray
+import logging
+
+from PyQt6.QtCore import Qt, QSize, QSettings, QByteArray, QTimer
 from PyQt6.QtGui import QShortcut, QKeySequence
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QWidget
 
 from app.ui.LogWindow import LogWindow
-from app.ui.MapWindow import MapWindow
 from app.ui.PacketWindow import PacketWindow
+from app.ui.TopologyWindow import TopologyWindow
+from app.ui.UpdateCoordinator import UpdateCoordinator
 from app.ui.views import NodeListView
+from app.ui.views.PacketTableView import PacketTableView
 from app.ui.widgets import MenuBar, ToolBar, StatusBar, ConnectDialog
+from app.utilities.Airtime import AirtimeStatistics, MODEM_PRESETS
 from app.utilities.AppConfig import AppConfig
-from app.utilities.Interface import Interface
+from app.utilities.CaptureStore import CaptureStore
+from app.utilities.InterfaceHub import InterfaceHub
+from app.utilities.LinkStatistics import LinkStatistics
+from app.utilities.Session import Session
 from app.utilities.SettingsManager import SettingsManager
+from app.utilities.SignalHeatmap import SignalHeatmap, METRIC_RANGES
+from app.utilities.StartupTimer import startup_timer
+from app.utilities.TopologyGraph import TopologyGraph
 
 
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
-        self.interface = Interface()
-
-        self.packetWindow = PacketWindow(interface=self.interface)
-        self.mapWindow = MapWindow(interface=self.interface)
-        self.logWindow = LogWindow(interface=self.interface)
+        config = AppConfig().load()
+        # Alle verbundenen Funkgeräte als ein Paketstrom, Kopien desselben Pakets zusammengefasst
+        self.interface = InterfaceHub(
+            batch_interval=config.getint('interface', 'batch_interval_ms', fallback=250) / 1000,
+            batch_size=config.getint('interface', 'batch_size', fallback=500),
+            merge_delay=config.getint('interface', 'merge_delay_ms', fallback=1000) / 1000,
+            dedupe_window=config.getfloat('interface', 'dedupe_window_s', fallback=60),
+            reconnect=Session.reconnect_options(config),
+            parent=self,
+        )
+        self.nodeUpdates = UpdateCoordinator(
+            self.interface, config.getint('ui', 'max_fps', fallback=10), self
+        )
+
+        self.linkStatistics = LinkStatistics(
+            window=config.getfloat('statistics', 'window_s', fallback=600),
+            bucket=config.getfloat('statistics', 'bucket_s', fallback=10),
+            outages=self.interface.outages,
+        )
+        self.interface.packets_received.connect(self.linkStatistics.add_packets)
+
+        preset = config.get('lora', 'modem_preset', fallback='LONG_FAST').upper()
+        if preset not in MODEM_PRESETS:
+            logging.error(f"Unknown modem preset {preset}, using LONG_FAST")
+            preset = 'LONG_FAST'
+        self.airtime = AirtimeStatistics(
+            preset,
+            window=config.getfloat('lora', 'airtime_window_s', fallback=3600),
+            bucket=config.getfloat('lora', 'airtime_bucket_s', fallback=60),
+            outages=self.interface.outages,
+        )
+        self.interface.packets_received.connect(self.airtime.add_packets)
+
+        self.topology = TopologyGraph(
+            max_age=config.getfloat('topology', 'max_age_s', fallback=3600),
+            max_edges=config.getint('topology', 'max_edges', fallback=20000),
+        )
+        self.interface.packets_received.connect(self.update_topology)
+        self.nodeUpdates.nodes_updated.connect(self.topology.add_nodes)
+
+        metric = config.get('heatmap', 'metric', fallback='rssi').lower()
+        if metric not in METRIC_RANGES:
+            logging.error(f"Unknown heatmap metric {metric}, using rssi")
+            metric = 'rssi'
+        self.heatmap = SignalHeatmap(metric, cell_size=config.getint('heatmap', 'cell_px', fallback=16))
+        self.nodeUpdates.nodes_updated.connect(self.heatmap.add_nodes)
+        self.interface.packets_received.connect(self.heatmap.add_packets)
+
+        self.captureStore = None
+        if config.getboolean('capture', 'enabled', fallback=False):
+            self.captureStore = CaptureStore(config.get('capture', 'path', fallback='capture.sqlite'))
+            self.interface.packets_received.connect(self.captureStore.add_packets)
+            self.interface.node_discovered.connect(self.captureStore.add_node)
+            self.interface.outage_recorded.connect(self.captureStore.add_outage)
+        startup_timer.mark("statistics")
+
+        # Fenster entstehen erst bei der ersten Benutzung, Pakete und Meldungen
+        # werden aber schon ab Start gesammelt
+        self.packetModel = PacketTableView.create_model(self.interface)
+        self.logCollector = LogWindow.create_collector()
+        self.windows = {}
 
         self.toolbar = None
 
         self.initUi()
         self.settings = SettingsManager().settings
         self.readSettings()
-        self.restoreWindowStates()
+        startup_timer.mark("main window")
+        # Nach dem ersten Anzeigen, damit die Node-Liste nicht auf die Karte wartet
+        QTimer.singleShot(0, self.restoreWindowStates)
+
+    def window(self, name: str) -> QWidget:
+        """Sekundärfenster, beim ersten Zugriff erzeugt"""
+        window = self.windows.get(name)
+        if window is None:
+            window = self.windows[name] = self.create_window(name)
+        return window
+
+    def create_window(self, name: str) -> QWidget:
+        if name == "Packets":
+            return PacketWindow(interface=self.interface, capture_store=self.captureStore,
+                                packet_model=self.packetModel)
+        if name == "Map":
+            # QtWebEngine und folium kosten beim Import am meisten
+            from app.ui.MapWindow import MapWindow
+            return MapWindow(interface=self.interface, updates=self.nodeUpdates,
+                             topology=self.topology, heatmap=self.heatmap)
+        if name == "Topology":
+            return TopologyWindow(topology=self.topology, updates=self.nodeUpdates)
+        if name == "Log":
+            return LogWindow(interface=self.interface, log_collector=self.logCollector)
+        raise KeyError(name)
+
+    def window_visible(self, name: str) -> bool:
+        # Ein nie erzeugtes Fenster war nicht sichtbar
+        window = self.windows.get(name)
+        return window is not None and window.isVisible()
+
+    @property
+    def packetWindow(self) -> PacketWindow:
+        return self.window("Packets")
+
+    @property
+    def mapWindow(self) -> QWidget:
+        return self.window("Map")
+
+    @property
+    def topologyWindow(self) -> TopologyWindow:
+        return self.window("Topology")
+
+    @property
+    def logWindow(self) -> LogWindow:
+        return self.window("Log")
 
     def initUi(self) -> None:
         self.setWindowTitle(f"{AppConfig().load()['app']['name']}")
@@ -52,9 +164,10 @@ class MainWindow(QMainWindow):
     def writeSettings(self):
         SettingsManager().save_window_state("Main", self.saveGeometry(), self.saveState())
 
-        self.settings.setValue("logWindowVisible", self.logWindow.isVisible())
-        self.settings.setValue("packetWindowVisible", self.packetWindow.isVisible())
-        self.settings.setValue("mapWindowVisible", self.mapWindow.isVisible())
+        self.settings.setValue("logWindowVisible", self.window_visible("Log"))
+        self.settings.setValue("packetWindowVisible", self.window_visible("Packets"))
+        self.settings.setValue("mapWindowVisible", self.window_visible("Map"))
+        self.settings.setValue("topologyWindowVisible", self.window_visible("Topology"))
 
     def readSettings(self):
         geometry, windowState = SettingsManager().read_window_state("Main")
@@ -74,8 +187,14 @@ class MainWindow(QMainWindow):
             self.mapWindow.show()
             self.toolbar.actions_call["Map"].setChecked(True)
 
+        if self.settings.value("topologyWindowVisible", False, type=bool):
+            self.topologyWindow.show()
+            self.toolbar.actions_call["Topology"].setChecked(True)
+
     def closeEvent(self, event):
         self.writeSettings()
+        if self.captureStore:
+            self.captureStore.close()
         super().closeEvent(event)
         event.accept()
 
@@ -92,6 +211,7 @@ class MainWindow(QMainWindow):
 
         self.toolbar.add_button("Packets", "packets.svg", self.togglePacketWindow, True, True)
         self.toolbar.add_button("Map", "map.svg", self.toggleMapWindow, True, True)
+        self.toolbar.add_button("Topology", "topology.svg", self.toggleTopologyWindow, True, True)
 
         self.toolbar.add_separator()
 
@@ -106,19 +226,34 @@ class MainWindow(QMainWindow):
         QShortcut(QKeySequence("Ctrl+L"), self, self.toggleLogWindow)
         QShortcut(QKeySequence("Ctrl+M"), self, self.toggleMapWindow)
         QShortcut(QKeySequence("Ctrl+P"), self, self.togglePacketWindow)
+        QShortcut(QKeySequence("Ctrl+T"), self, self.toggleTopologyWindow)
 
     def connect(self) -> None:
-        if not self.interface.running:
-            dlg = ConnectDialog(self)
-            if dlg.exec():
-                _type = dlg.type_combo.currentText().lower()
-                _port = dlg.port_combo.currentText()
-                _host = dlg.host_line.text()
-                _addr = dlg.addr_combo.currentText()
-
-                self.interface.connect(connection_type=_type, port=_port, host=_host, addr=_addr)
-                # self.topbar.actions_call["Connect"].setVisible(False)
-                # self.topbar.actions_call["Disconnect"].setVisible(True)
+        # Jede Verbindung kommt als weiteres Funkgerät hinzu
+        dlg = ConnectDialog(self)
+        if dlg.exec():
+            _type = dlg.type_combo.currentText().lower()
+            _port = dlg.port_combo.currentText()
+            _host = dlg.host_line.text()
+            _addr = dlg.addr_combo.currentText()
+            _file = dlg.file_line.text()
+            _speed = dlg.speed_combo.currentData()
+            _record = dlg.record_line.text() if _type != 'replay' else None
+            _name = dlg.name_line.text().strip()
+
+            self.interface.connect(connection_type=_type, port=_port, host=_host, addr=_addr,
+                                   file=_file, speed=_speed, record=_record or None,
+                                   name=_name or None)
+            # self.topbar.actions_call["Connect"].setVisible(False)
+            # self.topbar.actions_call["Disconnect"].setVisible(True)
+        dlg.deleteLater()
+
+    def update_topology(self, packets: list) -> None:
+        # Die eigenen Node-Nummern sind erst nach dem Verbinden bekannt, jedes
+        # Paket verbindet sich mit dem Funkgerät, das es empfangen hat
+        self.topology.receivers = {session.name: session.local_num
+                                   for session in self.interface.sessions if session.local_num}
+        self.topology.add_packets(packets)
 
     def disconnect(self) -> None:
         if self.interface.running:
@@ -148,4 +283,12 @@ class MainWindow(QMainWindow):
             self.toolbar.actions_call["Map"].setChecked(False)
         else:
             self.mapWindow.show()
-            self.toolbar.actions_call["Map"].setChecked(True)
\ No newline at end of file
+            self.toolbar.actions_call["Map"].setChecked(True)
+
+    def toggleTopologyWindow(self) -> None:
+        if self.topologyWindow.isVisible():
+            self.topologyWindow.hide()
+            self.toolbar.actions_call["Topology"].setChecked(False)
+        else:
+            self.topologyWindow.show()
+            self.toolbar.actions_call["Topology"].setChecked(True)
\ No newline at end of file
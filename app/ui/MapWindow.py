@@ -1,31 +1,117 @@
 import io
+import json
+import os
+import time
+
 import folium
+from branca.element import MacroElement
+from jinja2 import Template
 
 from PyQt6.QtGui import QAction, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal, pyqtSlot
+from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWidgets import QMenu, QWidget, QVBoxLayout
 from folium.plugins import MarkerCluster, HeatMap
 
+from app.utilities.AppConfig import AppConfig
 from app.utilities.Interface import Interface
 from app.utilities.NodeInfo import NodeInfo
 from app.utilities.SettingsManager import SettingsManager
+from app.utilities.SignalHeatmap import SignalHeatmap
+from app.utilities.SpatialIndex import SpatialIndex
+from app.utilities.TopologyGraph import TopologyGraph, TopologyEdge, edge_color, edge_width
+
+
+class MapBridge(MacroElement):
+    """Stellt die Marker-Funktionen aus map.js als window.meshMap bereit"""
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            {{ this.source }}
+            window.meshMap = createMeshMap({{ this._parent.get_name() }}, {{ this.cluster.get_name() }},
+                {{ this.heat.get_name() if this.heat else "null" }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, cluster: MarkerCluster, heat: HeatMap = None) -> None:
+        super().__init__()
+        self._name = "MapBridge"
+        self.cluster = cluster
+        self.heat = heat
+        with open(os.path.join("resources/assets/js/", "map.js"), encoding="utf-8") as source:
+            self.source = source.read()
+
+
+class MapEvents(QObject):
+    """Wird per QWebChannel als mapEvents in die Seite gereicht"""
+    view_changed = pyqtSignal(int, float, float, float, float)
+
+    @pyqtSlot(int, float, float, float, float)
+    def moved(self, zoom: int, south: float, west: float, north: float, east: float) -> None:
+        self.view_changed.emit(zoom, south, west, north, east)
 
 
 class MapWindow(QWidget):
-    def __init__(self, interface) -> None:
+    # Ab dieser Zoomstufe werden immer einzelne Marker gezeigt
+    CLUSTER_MAX_ZOOM = 15
+
+    def __init__(self, interface, updates, topology: TopologyGraph = None,
+                 heatmap: SignalHeatmap = None) -> None:
         super().__init__()
         self.interface = interface
+        self.updates = updates
+        self.topology = topology
+        self.heatmap = heatmap
+
+        # Zoomstufe und Ausschnitt (Süd, West, Nord, Ost) der Seite
+        self.zoom = None
+        self.bounds = None
+        # Stand der zuletzt übertragenen Heatmap: (Zoom, Ausschnitt mit Rand, Messwerte)
+        self.heat_sent = None
+
+        # Die Seite bekommt nur Marker im Ausschnitt mit Rand, bei zu vielen nur Cluster
+        self.max_markers = AppConfig().load().getint('map', 'max_markers', fallback=1000)
+        self.index = SpatialIndex()
+        self.shown = set()
+        # (Zoom, Ausschnitt mit Rand) der zuletzt übertragenen Marker
+        self.view_sent = None
+        self.clustered = False
+        self.clusters_dirty = False
+        self.fitted = False
 
         self.webView = None
+        self.page_ready = False
         self.highlighted_node = None
 
         self.readSettings()
         self.initUi()
 
         self.nodes = {}
-        self.interface.node_discovered.connect(self.add_node)
-        self.update_map()
+        # Node-Nummer -> [lat, lon] für die Endpunkte der Verbindungen
+        self.positions = {}
+        self.links = set()
+        self.topology_version = 0
+        self.updates.nodes_updated.connect(self.add_nodes)
+        # Das Fenster entsteht erst bei Bedarf, bis dahin bekannte Nodes übernehmen
+        self.add_nodes(list(self.updates.nodes.values()))
+        self.load_map()
+
+        self.viewTimer = QTimer(self)
+        self.viewTimer.setInterval(2000)
+        self.viewTimer.timeout.connect(self.update_view)
+        self.viewTimer.start()
+
+        if self.topology is not None:
+            self.linkTimer = QTimer(self)
+            self.linkTimer.setInterval(2000)
+            self.linkTimer.timeout.connect(self.update_links)
+            self.linkTimer.start()
+
+        if self.heatmap is not None:
+            self.heatTimer = QTimer(self)
+            self.heatTimer.setInterval(2000)
+            self.heatTimer.timeout.connect(self.update_heatmap)
+            self.heatTimer.start()
 
     def initUi(self) -> None:
         self.setWindowTitle("Map")
@@ -34,6 +120,13 @@ class MapWindow(QWidget):
         layout = QVBoxLayout()
 
         self.webView = QWebEngineView()
+        self.webView.loadFinished.connect(self.on_load_finished)
+
+        self.mapEvents = MapEvents(self)
+        self.mapEvents.view_changed.connect(self.view_changed)
+        self.webChannel = QWebChannel(self)
+        self.webChannel.registerObject("mapEvents", self.mapEvents)
+        self.webView.page().setWebChannel(self.webChannel)
         layout.addWidget(self.webView)
 
         self.setLayout(layout)
@@ -54,13 +147,121 @@ class MapWindow(QWidget):
         event.accept()
 
     def add_node(self, node_info: NodeInfo) -> None:
-        self.nodes[node_info.user.id] = node_info
-        self.update_map()
+        self.add_nodes([node_info])
+
+    def add_nodes(self, nodes: list) -> None:
+        updated = []
+        removed = []
+        moved = []
+        for node_info in nodes:
+            # Nach Nummer, die user.id ist bei unvollständigen Einträgen 'Unknown'
+            node_id = node_info.num
+            self.nodes[node_id] = node_info
+            if self.has_position(node_info):
+                lat, lon = node_info.position.latitude, node_info.position.longitude
+                if self.index.update(node_id, lat, lon):
+                    self.clusters_dirty = True
+                if self.positions.get(node_info.num) != [lat, lon]:
+                    self.positions[node_info.num] = [lat, lon]
+                    moved.append(node_info.num)
+                if not self.clustered and self.in_view(lat, lon):
+                    updated.append(self.marker_data(node_info))
+                elif node_id in self.shown:
+                    removed.append(node_id)
+            else:
+                if self.index.remove(node_id):
+                    self.clusters_dirty = True
+                if node_id in self.shown:
+                    removed.append(node_id)
+                if self.positions.pop(node_info.num, None) is not None:
+                    moved.append(node_info.num)
+
+        if not self.page_ready:
+            return
+
+        # Ein Skriptaufruf pro Flush des UpdateCoordinators
+        if updated:
+            self.shown.update(marker["id"] for marker in updated)
+            self.run_script(f"meshMap.update({json.dumps(updated)});")
+        if removed:
+            self.shown.difference_update(removed)
+            self.run_script(f"meshMap.remove({json.dumps(removed)});")
+        if not self.fitted:
+            self.fit()
+        if moved and self.topology is not None:
+            self.update_node_links(moved)
+
+    def in_view(self, lat: float, lon: float) -> bool:
+        # Solange die Seite ihren Ausschnitt nicht gemeldet hat, gilt alles als sichtbar
+        if self.view_sent is None:
+            return True
+        south, west, north, east = self.view_sent[1]
+        return south <= lat <= north and west <= lon <= east
+
+    def fit(self) -> None:
+        """Zentriert die Karte einmalig auf alle Nodes, danach bleiben Zoom und Ausschnitt beim Nutzer"""
+        bounds = self.index.bounds()
+        if bounds is not None:
+            self.fitted = True
+            self.run_script(f"meshMap.fit({json.dumps(bounds)});")
+
+    def update_view(self) -> None:
+        """Gleicht Marker oder Cluster der Seite mit dem aktuellen Ausschnitt ab"""
+        if not self.page_ready or self.bounds is None:
+            return
+
+        if self.view_sent is not None and self.view_sent[0] == self.zoom \
+                and self.contains(self.view_sent[1], self.bounds):
+            if self.clustered and self.clusters_dirty:
+                self.send_clusters(self.view_sent[1])
+            return
+
+        bounds = self.padded(self.bounds)
+        clustered = (self.zoom <= self.CLUSTER_MAX_ZOOM and
+                     self.index.count(bounds, self.zoom) > self.max_markers)
+        if clustered:
+            if self.shown:
+                self.run_script(f"meshMap.remove({json.dumps(list(self.shown))});")
+                self.shown.clear()
+            self.send_clusters(bounds)
+        else:
+            if self.clustered:
+                self.run_script("meshMap.setClusters([]);")
+            visible = set(self.index.query(bounds, self.zoom))
+            added = [self.marker_data(self.nodes[node_id]) for node_id in visible - self.shown]
+            removed = list(self.shown - visible)
+            if added:
+                self.run_script(f"meshMap.update({json.dumps(added)});")
+            if removed:
+                self.run_script(f"meshMap.remove({json.dumps(removed)});")
+            self.shown = visible
+
+        self.clustered = clustered
+        self.view_sent = (self.zoom, bounds)
+
+    def send_clusters(self, bounds: tuple) -> None:
+        clusters = [{"lat": lat, "lon": lon, "count": count}
+                    for lat, lon, count in self.index.clusters(bounds, self.zoom)]
+        self.clusters_dirty = False
+        self.run_script(f"meshMap.setClusters({json.dumps(clusters)});")
+
+    @staticmethod
+    def padded(bounds: tuple) -> tuple:
+        # Ein halber Ausschnitt Rand, damit kleines Verschieben ohne neue Daten auskommt
+        south, west, north, east = bounds
+        margin_lat = (north - south) / 2
+        margin_lon = (east - west) / 2
+        return south - margin_lat, west - margin_lon, north + margin_lat, east + margin_lon
+
+    @staticmethod
+    def contains(outer: tuple, inner: tuple) -> bool:
+        return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+                outer[2] >= inner[2] and outer[3] >= inner[3])
 
     def highlight_node(self, node: NodeInfo):
         """Hebt einen bestimmten Node auf der Karte hervor"""
         self.highlighted_node = node
-        self.update_map()
+        self.run_script(self.highlight_script(node))
 
         # Fenster in den Vordergrund bringen
         self.raise_()
@@ -69,7 +270,7 @@ class MapWindow(QWidget):
     def clear_highlight(self):
         """Entfernt die Hervorhebung von allen Nodes"""
         self.highlighted_node = None
-        self.update_map()
+        self.run_script("meshMap.clearHighlight();")
 
     def show_map_context_menu(self, position):
         """Zeigt Kontext-Menü für die Karte an"""
@@ -87,112 +288,204 @@ class MapWindow(QWidget):
         global_pos = self.mapToGlobal(position)
         menu.exec(global_pos)
 
-    def update_map(self):
-        """Aktualisiert die Karte mit allen bekannten Nodes"""
-        # Standard-Standort (Deutschland Mitte) falls keine Nodes vorhanden
-        center_lat, center_lon = 51.1657, 10.4515
-        zoom_level = 10
-
-        # Wenn Nodes vorhanden sind, Zentrum basierend auf Nodes berechnen
-        if self.nodes:
-            valid_positions = []
-            for node in self.nodes.values():
-                if (node.position and
-                        node.position.latitude and node.position.longitude and
-                        node.position.latitude != 0 and node.position.longitude != 0):
-                    valid_positions.append((node.position.latitude, node.position.longitude))
-
-            if valid_positions:
-                center_lat = sum(pos[0] for pos in valid_positions) / len(valid_positions)
-                center_lon = sum(pos[1] for pos in valid_positions) / len(valid_positions)
-
-        # Wenn ein Node hervorgehoben werden soll, auf diesen zentrieren
-        if (self.highlighted_node and
-                self.highlighted_node.position and
-                self.highlighted_node.position.latitude and
-                self.highlighted_node.position.longitude):
-            center_lat = self.highlighted_node.position.latitude
-            center_lon = self.highlighted_node.position.longitude
-            zoom_level = 15  # Näher heranzoomen für hervorgehobenen Node
-
+    def load_map(self):
+        """Lädt die Kartenseite einmalig, Marker werden danach per JavaScript gepflegt"""
+        # Standard-Standort (Deutschland Mitte), die Seite zentriert sich auf die ersten Nodes
         map = folium.Map(
-            location=[center_lat, center_lon],
-            zoom_start=zoom_level,
+            location=[51.1657, 10.4515],
+            zoom_start=10,
             tiles="OpenStreetMap"
         )
 
-        data = []
-
-        marker_cluster = MarkerCluster().add_to(map, "Clusterer")
-        #HeatMap(data).add_to(map, "Heatmap")
+        marker_cluster = MarkerCluster(name="Nodes").add_to(map, "Clusterer")
+        heat_map = None
+        if self.heatmap is not None:
+            # Die Punkte kommen später per JavaScript, je Zelle ein Mittelwert 0..1
+            heat_map = HeatMap([], name=f"Signal ({self.heatmap.metric.upper()})",
+                               min_opacity=0.3, radius=20, blur=15, max=1.0).add_to(map, "Heatmap")
         #folium.TileLayer("OpenStreetMap", overlay=True).add_to(map)
-        #folium.LayerControl().add_to(map)
+        folium.LayerControl().add_to(map)
 
-        for node in self.nodes.values():
-            if (node.position and
-                    node.position.latitude and node.position.longitude and
-                    node.position.latitude != 0 and node.position.longitude != 0):
-
-                # Prüfen ob dies der hervorgehobene Node ist
-                is_highlighted = (self.highlighted_node and node.user.id == self.highlighted_node.user.id)
-
-                hue, saturation, value = Interface().get_node_color(node.user.shortName)
-                color = QColor()
-                color.setHsv(hue, saturation, value)
-
-                radius = 20 if is_highlighted else 15  # Größerer Radius für hervorgehobenen Node
-                weight = 5 if is_highlighted else 3  # Dickerer Rand für hervorgehobenen Node
-
-                popup_html = f"""
-                <div>
-                    <h4>{node.user.longName}{'<br><span style="color: red;">📍 HIGHLIGHTED</span>' if is_highlighted else ''}</h4>
-                    <p>
-                        <b>ID:</b> {node.user.id}<br>
-                        <b>Short Name:</b> {node.user.shortName}<br>
-                        <b>Hardware:</b> {node.user.hwModel or 'Unknown'}<br>
-                        <b>SNR:</b> {node.snr if node.snr else 'N/A'} dB<br>
-                        <b>Hops Away:</b> {node.hopsAway if node.hopsAway else 'N/A'}<br>
-                        <b>Battery:</b> {node.deviceMetrics.batteryLevel if node.deviceMetrics and node.deviceMetrics.batteryLevel else 'N/A'}%<br>
-                        <b>Last Heard:</b> {node.lastHeard.strftime('%Y-%m-%d %H:%M:%S') if node.lastHeard else 'Never'}
-                    </p>
-                </div>
-                """
-
-                folium.CircleMarker(
-                    location=[node.position.latitude, node.position.longitude],
-                    radius=radius,
-                    popup=folium.Popup(popup_html),
-                    color=color.name(),
-                    fill=True,
-                    fillColor=color.name(),
-                    fillOpacity=0.9 if is_highlighted else 0.7,  # Stärkere Deckkraft
-                    weight=weight,
-                    tooltip=f"{'🎯 ' if is_highlighted else ''}{node.user.longName} ({node.user.shortName})"
-                ).add_to(marker_cluster)
-
-                # Für hervorgehobenen Node zusätzlich einen Pulsing-Effekt hinzufügen
-                if is_highlighted:
-                    # Äußerer Kreis für Pulsing-Effekt
-                    folium.CircleMarker(
-                        location=[node.position.latitude, node.position.longitude],
-                        radius=20,
-                        color='red',
-                        fill=False,
-                        weight=1,
-                        opacity=0.5
-                    ).add_to(marker_cluster)
+        map.get_root().header.add_child(folium.JavascriptLink("qrc:///qtwebchannel/qwebchannel.js"))
+        MapBridge(marker_cluster, heat_map).add_to(map)
 
         data = io.BytesIO()
         map.save(data, close_file=False)
         self.webView.setHtml(data.getvalue().decode())
 
+    def on_load_finished(self, ok: bool) -> None:
+        if not ok:
+            return
+
+        self.page_ready = True
+
+        # Marker kommen mit der ersten Meldung des Ausschnitts, bis dahin nur zentrieren
+        self.shown.clear()
+        self.view_sent = None
+        self.clustered = False
+        self.fitted = False
+        self.fit()
+        if self.highlighted_node:
+            self.run_script(self.highlight_script(self.highlighted_node))
+
+        # Die neue Seite kennt keine Verbindungen, beim nächsten Takt alle übertragen
+        self.links.clear()
+        self.topology_version = 0
+        self.heat_sent = None
+
+    def view_changed(self, zoom: int, south: float, west: float, north: float, east: float) -> None:
+        self.zoom = zoom
+        self.bounds = (south, west, north, east)
+        self.update_view()
+        if self.heatmap is not None:
+            self.update_heatmap()
+
+    def update_heatmap(self) -> None:
+        """Überträgt die Heatmap, wenn sich Zoom, Ausschnitt oder Messwerte geändert haben"""
+        if not self.page_ready or self.zoom is None or not self.isVisible():
+            return
+
+        if self.heat_sent is not None:
+            zoom, bounds, size = self.heat_sent
+            if zoom == self.zoom and self.contains(bounds, self.bounds) and size == self.heatmap.size:
+                return
+
+        bounds = self.padded(self.bounds)
+        points = self.heatmap.points(self.zoom, bounds)
+        self.heat_sent = (self.zoom, bounds, self.heatmap.size)
+        self.run_script(f"meshMap.setHeat({json.dumps(points.round(6).tolist())});")
+
+    def update_links(self) -> None:
+        """Überträgt die seit dem letzten Aufruf geänderten Kanten der Topologie"""
+        if not self.page_ready or not self.isVisible():
+            return
+
+        changes = self.topology.changes_since(self.topology_version)
+        if changes is None:
+            # Historie reicht nicht zurück, alle Verbindungen neu aufbauen
+            if self.links:
+                self.run_script(f"meshMap.removeLinks({json.dumps(list(self.links))});")
+                self.links.clear()
+            changes = list(self.topology.edges.values()), []
+        updated, removed = changes
+        self.topology_version = self.topology.version
+
+        items = []
+        removed_ids = [self.link_id(*key) for key in removed]
+        for edge in updated:
+            link = self.link_data(edge)
+            if link:
+                items.append(link)
+            else:
+                # Ohne Position eines Endpunkts lässt sich die Kante nicht zeichnen
+                removed_ids.append(self.link_id(edge.source, edge.target))
+
+        removed_ids = [link_id for link_id in removed_ids if link_id in self.links]
+        self.links.difference_update(removed_ids)
+        self.links.update(item["id"] for item in items)
+        if items:
+            self.run_script(f"meshMap.updateLinks({json.dumps(items)});")
+        if removed_ids:
+            self.run_script(f"meshMap.removeLinks({json.dumps(removed_ids)});")
+
+    def update_node_links(self, nums: list) -> None:
+        """Zeichnet die Kanten von Nodes neu, deren Position sich geändert hat"""
+        if not self.page_ready or not self.topology_version:
+            return
+        edges = self.topology.edges
+        items = []
+        removed_ids = []
+        for num in nums:
+            for neighbor in self.topology.neighbors(num):
+                for key in ((num, neighbor), (neighbor, num)):
+                    edge = edges.get(key)
+                    if edge is None:
+                        continue
+                    link = self.link_data(edge)
+                    if link:
+                        items.append(link)
+                        self.links.add(link["id"])
+                    elif self.link_id(*key) in self.links:
+                        removed_ids.append(self.link_id(*key))
+                        self.links.discard(self.link_id(*key))
+        if items:
+            self.run_script(f"meshMap.updateLinks({json.dumps(items)});")
+        if removed_ids:
+            self.run_script(f"meshMap.removeLinks({json.dumps(removed_ids)});")
+
+    @staticmethod
+    def link_id(source: int, target: int) -> str:
+        return f"{source}-{target}"
+
+    def link_data(self, edge: TopologyEdge):
+        source = self.positions.get(edge.source)
+        target = self.positions.get(edge.target)
+        if source is None or target is None:
+            return None
+
+        snr = f"{edge.snr:.1f} dB" if edge.snr is not None else "N/A"
+        return {
+            "id": self.link_id(edge.source, edge.target),
+            "from": source,
+            "to": target,
+            "color": edge_color(edge),
+            "weight": edge_width(edge),
+            "tooltip": f"{edge.packets} packets, SNR {snr}",
+        }
+
+    def run_script(self, script: str) -> None:
+        # Vor dem Laden der Seite werden Änderungen nur in self.nodes gesammelt
+        if self.page_ready:
+            self.webView.page().runJavaScript(script)
+
+    def highlight_script(self, node: NodeInfo) -> str:
+        # Der Marker ist eventuell noch nicht auf der Seite, daher die Position mitgeben
+        position = [node.position.latitude, node.position.longitude] \
+            if self.has_position(node) else None
+        return f"meshMap.highlight({json.dumps(node.num)}, {json.dumps(position)});"
+
+    @staticmethod
+    def has_position(node: NodeInfo) -> bool:
+        return bool(node.position and
+                    node.position.latitude and node.position.longitude and
+                    node.position.latitude != 0 and node.position.longitude != 0)
+
+    @staticmethod
+    def marker_data(node: NodeInfo) -> dict:
+        hue, saturation, value = Interface.get_node_color(node.user.shortName)
+        color = QColor()
+        color.setHsv(hue, saturation, value)
+
+        popup_html = f"""
+        <div>
+            <h4>{node.user.longName}</h4>
+            <p>
+                <b>ID:</b> {node.user.id}<br>
+                <b>Short Name:</b> {node.user.shortName}<br>
+                <b>Hardware:</b> {node.user.hwModel or 'Unknown'}<br>
+                <b>SNR:</b> {node.snr if node.snr else 'N/A'} dB<br>
+                <b>Hops Away:</b> {node.hopsAway if node.hopsAway else 'N/A'}<br>
+                <b>Battery:</b> {node.deviceMetrics.batteryLevel if node.deviceMetrics and node.deviceMetrics.batteryLevel else 'N/A'}%<br>
+                <b>Last Heard:</b> {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(node.lastHeard)) if node.lastHeard else 'Never'}
+            </p>
+        </div>
+        """
+
+        return {
+            "id": node.num,
+            "lat": node.position.latitude,
+            "lon": node.position.longitude,
+            "color": color.name(),
+            "popup": popup_html,
+            "tooltip": f"{node.user.longName} ({node.user.shortName})",
+        }
+
     def get_node_color(self, node: NodeInfo) -> str:
-        from datetime import datetime, timedelta
         if node.lastHeard:
-            time_diff = datetime.now() - node.lastHeard
-            if time_diff < timedelta(minutes=30):
+            time_diff = time.time() - node.lastHeard
+            if time_diff < 30 * 60:
                 return 'green'
-            elif time_diff < timedelta(hours=2):
+            elif time_diff < 2 * 60 * 60:
                 return 'orange'
             else:
                 return 'red'
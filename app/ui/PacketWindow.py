@@ -1,13 +1,20 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLineEdit, QCheckBox
 
+from app.ui.views.CaptureTableView import CaptureTableView
 from app.ui.views.PacketTableView import PacketTableView
+from app.utilities.DisplayFilter import FilterError
 from app.utilities.SettingsManager import SettingsManager
 
 
 class PacketWindow(QWidget):
-    def __init__(self, interface) -> None:
+    def __init__(self, interface, capture_store=None, packet_model=None) -> None:
         super().__init__()
         self.interface = interface
+        self.captureStore = capture_store
+        self.packetModel = packet_model
+        self.filterLine = None
+        self.collapseCheck = None
+        self.packetTable = None
         self.readSettings()
         self.initUi()
 
@@ -17,9 +24,49 @@ class PacketWindow(QWidget):
 
         layout = QVBoxLayout()
 
-        layout.addWidget(PacketTableView(self))
+        self.filterLine = QLineEdit()
+        self.filterLine.setPlaceholderText("Filter, e.g. portnum == TELEMETRY_APP && rxSnr < -10")
+        self.filterLine.setClearButtonEnabled(True)
+        self.filterLine.returnPressed.connect(self.apply_filter)
+        self.filterLine.textChanged.connect(lambda text: self.apply_filter() if not text else None)
+
+        self.packetTable = PacketTableView(self)
+
+        # Rebroadcasts desselben Pakets als eine Zeile oder jede Kopie einzeln
+        self.collapseCheck = QCheckBox("Collapse repeats")
+        self.collapseCheck.setToolTip("Count rebroadcasts of a packet in one row instead of "
+                                      "showing every copy (applies to new packets)")
+        self.collapseCheck.setChecked(self.packetTable.model().sourceModel().collapse)
+        self.collapseCheck.toggled.connect(self.packetTable.model().sourceModel().set_collapse)
+
+        filterLayout = QHBoxLayout()
+        filterLayout.addWidget(self.filterLine)
+        filterLayout.addWidget(self.collapseCheck)
+        layout.addLayout(filterLayout)
+
+        if self.captureStore:
+            # Live-Ansicht aus dem Speicher, Verlauf seitenweise aus der Datenbank
+            tabs = QTabWidget()
+            tabs.addTab(self.packetTable, "Live")
+            history = CaptureTableView(self)
+            tabs.addTab(history, "History")
+            tabs.currentChanged.connect(
+                lambda index: history.model().refresh() if tabs.widget(index) is history else None
+            )
+            layout.addWidget(tabs)
+        else:
+            layout.addWidget(self.packetTable)
         self.setLayout(layout)
 
+    def apply_filter(self) -> None:
+        try:
+            self.packetTable.model().set_filter(self.filterLine.text())
+            self.filterLine.setStyleSheet("")
+            self.filterLine.setToolTip("")
+        except FilterError as e:
+            self.filterLine.setStyleSheet("QLineEdit { background-color: #ffd6d6; }")
+            self.filterLine.setToolTip(str(e))
+
     def writeSettings(self):
         SettingsManager().save_window_state("Packet", self.saveGeometry())
 
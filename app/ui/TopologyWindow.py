@@ -0,0 +1,37 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from app.ui.views import TopologyGraphView
+from app.utilities.SettingsManager import SettingsManager
+
+
+class TopologyWindow(QWidget):
+    def __init__(self, topology, updates) -> None:
+        super().__init__()
+        self.topology = topology
+        self.updates = updates
+
+        self.readSettings()
+        self.initUi()
+
+    def initUi(self) -> None:
+        self.setWindowTitle("Topology")
+        self.setMinimumSize(600, 400)
+
+        layout = QVBoxLayout()
+
+        self.graphView = TopologyGraphView(self)
+        layout.addWidget(self.graphView)
+
+        self.setLayout(layout)
+
+    def writeSettings(self):
+        SettingsManager().save_window_state("Topology", self.saveGeometry())
+
+    def readSettings(self):
+        geometry, windowState = SettingsManager().read_window_state("Topology")
+        self.restoreGeometry(geometry)
+
+    def closeEvent(self, event):
+        self.writeSettings()
+        super().closeEvent(event)
+        event.accept()
@@ -0,0 +1,53 @@
+import logging
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.utilities.NodeInfo import NodeInfo
+
+
+class UpdateCoordinator(QObject):
+    """Sammelt geänderte Nodes und gibt sie höchstens max_fps mal pro Sekunde weiter
+
+    Nodes werden wie in NodeListModel über ihre Nummer zusammengefasst, die
+    user.id fehlt bei unvollständigen NodeDB-Einträgen ('Unknown').
+    """
+    nodes_updated = pyqtSignal(list)
+
+    def __init__(self, interface, max_fps: int = 10, parent=None) -> None:
+        super().__init__(parent)
+        self.dirty = {}
+        # Letzter Stand aller Nodes, für später geöffnete Fenster
+        self.nodes = {}
+        self.received = 0
+        self.flushed = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(max(1, 1000 // max(1, max_fps)))
+        self.timer.timeout.connect(self.flush)
+
+        interface.node_discovered.connect(self.mark_dirty)
+
+    @property
+    def merged(self) -> int:
+        """Anzahl der Updates, die durch Zusammenfassen eingespart wurden"""
+        return self.received - self.flushed - len(self.dirty)
+
+    def mark_dirty(self, node_info: NodeInfo) -> None:
+        self.received += 1
+        # Neuester Stand gewinnt, die Reihenfolge des ersten Auftretens bleibt erhalten
+        self.dirty[node_info.num] = node_info
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+
+        nodes = list(self.dirty.values())
+        self.nodes.update(self.dirty)
+        self.dirty = {}
+        self.flushed += len(nodes)
+
+        logging.debug(f"Flushing {len(nodes)} node updates ({self.merged} merged so far)")
+        self.nodes_updated.emit(nodes)
@@ -1,5 +1,14 @@
 from app.ui.LogWindow import LogWindow
 from app.ui.MainWindow import MainWindow
-from app.ui.MapWindow import MapWindow
 from app.ui.PacketWindow import PacketWindow
 from app.ui.ThemeManager import ThemeManager
+from app.ui.TopologyWindow import TopologyWindow
+from app.ui.UpdateCoordinator import UpdateCoordinator
+
+
+def __getattr__(name: str):
+    # MapWindow zieht QtWebEngine und folium nach sich, erst bei Bedarf importieren
+    if name == 'MapWindow':
+        from app.ui.MapWindow import MapWindow
+        return MapWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
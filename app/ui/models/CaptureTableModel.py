@@ -0,0 +1,88 @@
+import time
+import typing
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from app.utilities.CaptureStore import CaptureStore
+from app.utilities.Packet import Packet
+
+
+class CaptureTableModel(QAbstractTableModel):
+    """Blättert seitenweise durch die Pakete im CaptureStore
+
+    Im Speicher liegen nur die zuletzt angezeigten max_pages Seiten.
+    """
+
+    def __init__(self, store: CaptureStore, page_size: int = 500, max_pages: int = 20):
+        super().__init__()
+        self.headers = ['Timestamp', 'From', 'To', 'Relay', 'Port Number', 'SNR', 'RSSI', 'Hop Limit', 'Hop Start', 'Receivers']
+        self.store = store
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.count = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.beginResetModel()
+        self.pages.clear()
+        self.count = self.store.count_packets()
+        self.endResetModel()
+
+    def packet(self, row: int) -> Packet:
+        page_index, offset = divmod(row, self.page_size)
+        page = self.pages.get(page_index)
+        if page is None:
+            page = self.store.fetch_packets(page_index * self.page_size, self.page_size)
+            self.pages[page_index] = page
+            if len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_index)
+        return page[offset]
+
+    def data(self, index: QModelIndex, role: int = ...) -> typing.Any:
+        if not index.isValid() or index.row() >= self.count:
+            return None
+
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        packet = self.packet(index.row())
+        column = index.column()
+
+        if column == 0:  # Timestamp
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(packet.rxTime))
+        elif column == 1:  # From
+            return packet.nodeFrom
+        elif column == 2:  # To
+            return packet.nodeTo
+        elif column == 3:  # Relay
+            return packet.relayNode if packet.relayNode is not None else ""
+        elif column == 4:  # Port Number
+            return packet.decoded.portnum
+        elif column == 5:  # SNR
+            return packet.rxSnr
+        elif column == 6:  # RSSI
+            return packet.rxRssi
+        elif column == 7:  # Hop Limit
+            return packet.hopLimit if packet.hopLimit is not None else ""
+        elif column == 8:  # Hop Start
+            return packet.hopStart if packet.hopStart is not None else ""
+        elif column == 9:  # Receivers
+            return packet.receptions or packet.receiver or ""
+
+        return None
+
+    def rowCount(self, parent: QModelIndex = ...) -> int:
+        return self.count
+
+    def columnCount(self, parent: QModelIndex = ...) -> int:
+        return len(self.headers)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...) -> typing.Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.headers[section]
+        return None
@@ -1,27 +1,66 @@
+import time
 import typing
-from datetime import datetime
 
-from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtCore import Qt, QModelIndex
 
+from app.ui.models.RingBufferTableModel import RingBufferTableModel
 
-class LogTableModel(QAbstractTableModel):
-    def __init__(self, items=None):
-        super().__init__()
-        self.headers = ['Timestamp', 'Level', 'Message']
-        self.items = items or []
+
+class LogTableModel(RingBufferTableModel):
+    # Level wird nach Schweregrad sortiert, nicht alphabetisch. Die Anzahl der
+    # Wiederholungen ändert sich nachträglich und ist deshalb nicht sortierbar
+    SORT_KEYS = ('created', 'levelno', None, 'message')
+    NUMERIC_KEYS = frozenset({'created', 'levelno'})
+
+    def __init__(self, capacity: int = 10000):
+        super().__init__(('created', 'levelno', 'level', 'message', 'repeats'), capacity)
+        self.headers = ['Timestamp', 'Level', 'Repeats', 'Message']
+
+    def add_records(self, records: typing.Iterable[tuple]) -> None:
+        """Übernimmt (created, levelno, level, message) aus LogCollector.drain()
+
+        Direkt aufeinanderfolgende gleiche Meldungen werden zu einer Zeile mit
+        Wiederholungszähler zusammengefasst.
+        """
+        rows = []
+        for created, levelno, level, message in records:
+            if rows:
+                last = rows[-1]
+                if last[1] == levelno and last[3] == message:
+                    last[4] += 1
+                    continue
+            elif self.repeat_last(levelno, message):
+                continue
+            rows.append([created, levelno, level, message, 1])
+        self.add_rows(rows)
+
+    def repeat_last(self, levelno: int, message: str) -> bool:
+        last = len(self.store) - 1
+        if last < 0 or self.store.value(last, 'levelno') != levelno \
+                or self.store.value(last, 'message') != message:
+            return False
+
+        self.store.set_value(last, 'repeats', self.store.value(last, 'repeats') + 1)
+        index = self.index(self.row_of_seq(self.store.seq(last)), 2)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        return True
 
     def data(self, index: QModelIndex, role: int = ...) -> typing.Any:
         if role == Qt.ItemDataRole.DisplayRole:
-            value = self.items[index.row()][index.column()]
-            if isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d %H:%M:%S")
-            return value
+            row = self.store_row(index.row())
+            column = index.column()
+            if column == 0:
+                return time.strftime("%Y-%m-%d %H:%M:%S",
+                                     time.localtime(self.store.value(row, 'created')))
+            if column == 1:
+                return self.store.value(row, 'level')
+            if column == 2:
+                repeats = self.store.value(row, 'repeats')
+                return repeats if repeats > 1 else ""
+            return self.store.value(row, 'message')
 
         return None
 
-    def rowCount(self, parent: QModelIndex = ...) -> int:
-        return len(self.items)
-
     def columnCount(self, parent: QModelIndex = ...) -> int:
         return len(self.headers)
 
@@ -30,6 +69,3 @@ class LogTableModel(QAbstractTableModel):
             if orientation == Qt.Orientation.Horizontal:
                 return self.headers[section]
         return None
-
-    def sort(self, column: int, order: Qt.SortOrder = ...) -> None:
-        pass
@@ -1,3 +1,4 @@
+import time
 import typing
 
 from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
@@ -5,9 +6,39 @@ from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
 from app.utilities.NodeInfo import NodeInfo
 
 class NodeListModel(QAbstractListModel):
-    def __init__(self, *args, items=None, **kwargs):
+    # Zählt jede Änderung einer Zeile hoch, Schlüssel für den Render-Cache des Delegates
+    VersionRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, *args, items=None, link_statistics=None, airtime=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.items = items or []
+        self.link_statistics = link_statistics
+        self.airtime = airtime
+        # Node-Nummer -> Zeile, Zeilen werden nie entfernt und bleiben daher stabil
+        self.rows = {node.num: row for row, node in enumerate(self.items)}
+        self.versions = [0] * len(self.items)
+
+    def upsert_nodes(self, nodes: typing.Iterable[NodeInfo]) -> None:
+        """Ersetzt bekannte Nodes an ihrer Zeile und hängt nur neue Nodes an"""
+        new_nodes = {}
+        for node in nodes:
+            row = self.rows.get(node.num)
+            if row is not None:
+                self.items[row] = node
+                self.versions[row] += 1
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+            else:
+                new_nodes[node.num] = node
+
+        if new_nodes:
+            first = len(self.items)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_nodes) - 1)
+            for row, node in enumerate(new_nodes.values(), first):
+                self.rows[node.num] = row
+                self.items.append(node)
+                self.versions.append(0)
+            self.endInsertRows()
 
     def data(self, index: QModelIndex, role: int = ...) -> typing.Any:
         if not index.isValid() or index.row() >= len(self.items):
@@ -21,10 +52,14 @@ class NodeListModel(QAbstractListModel):
         elif role == Qt.ItemDataRole.UserRole:
             return node
 
+        elif role == self.VersionRole:
+            return self.versions[index.row()]
+
         elif role == Qt.ItemDataRole.ToolTipRole:
             tooltip = f"ID: {node.num}\n"
             tooltip += f"Hardware: {node.user.hwModel}\n"
-            tooltip += f"Last seen: {node.lastHeard.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            if node.lastHeard:
+                tooltip += f"Last seen: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(node.lastHeard))}\n"
 
             if node.position.latitude and node.position.longitude and node.position.altitude:
                 tooltip += f"Position: {node.position.latitude:.4f}, {node.position.longitude:.4f}, {node.position.altitude}m\n"
@@ -35,6 +70,29 @@ class NodeListModel(QAbstractListModel):
             if node.deviceMetrics.batteryLevel is not None:
                 tooltip += f"Battery: {node.deviceMetrics.batteryLevel}%\n"
 
+            link = self.link_statistics.summary(node.num) if self.link_statistics else None
+            if link:
+                tooltip += f"\nLink ({self.link_statistics.window / 60:.0f} min): "
+                tooltip += f"{link.packets} packets, {link.rate:.1f}/min\n"
+                if link.snr_mean is not None:
+                    tooltip += (f"SNR: avg {link.snr_mean:.1f}, min {link.snr_min:.1f}, "
+                                f"max {link.snr_max:.1f}, p10/p50/p90 {link.snr_p10:.1f}/"
+                                f"{link.snr_p50:.1f}/{link.snr_p90:.1f} dB\n")
+                    tooltip += (f"RSSI: avg {link.rssi_mean:.0f}, min {link.rssi_min:.0f}, "
+                                f"max {link.rssi_max:.0f}, p10/p50/p90 {link.rssi_p10:.0f}/"
+                                f"{link.rssi_p50:.0f}/{link.rssi_p90:.0f} dBm\n")
+                if link.hops:
+                    hops = ", ".join(f"{hops}: {count}" for hops, count in link.hops.items())
+                    tooltip += f"Hops: {hops}\n"
+
+            if self.airtime and self.airtime.node_airtime(node.num):
+                tooltip += (f"Airtime ({self.airtime.window / 60:.0f} min, {self.airtime.preset}): "
+                            f"{self.airtime.node_airtime(node.num):.1f}s, "
+                            f"est. {self.airtime.node_utilization(node.num):.2f}%")
+                if node.deviceMetrics.airUtilTx is not None:
+                    tooltip += f", reported {node.deviceMetrics.airUtilTx:.2f}%"
+                tooltip += "\n"
+
             return tooltip
 
         return None
@@ -0,0 +1,50 @@
+from functools import partial
+from typing import Optional, Set
+
+from PyQt6.QtCore import Qt, QSortFilterProxyModel, QModelIndex
+
+from app.utilities.DisplayFilter import DisplayFilter
+
+
+class PacketFilterProxyModel(QSortFilterProxyModel):
+    """Filtert PacketTableModel mit einem vorab übersetzten DisplayFilter
+
+    Neue Zeilen prüft QSortFilterProxyModel beim Einfügen einzeln, der Filter wird
+    also inkrementell angewendet. Trifft der Filter indizierte Spalten, werden alle
+    übrigen Zeilen ohne Auswertung des Prädikats verworfen, mit einem Zugriff auf
+    eine Menge statt dem Auslesen der Spaltenwerte.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.display_filter: Optional[DisplayFilter] = None
+        self.candidates: Optional[Set[int]] = None
+        self.candidates_until = 0
+
+    def set_filter(self, expression: str) -> None:
+        """Setzt den Filter, ein ungültiger Ausdruck löst FilterError aus und ändert nichts"""
+        display_filter = DisplayFilter(expression) if expression.strip() else None
+
+        model = self.sourceModel()
+        self.display_filter = display_filter
+        self.candidates = display_filter.candidates(model.lookup) if display_filter else None
+        # Nur bereits vorhandene Zeilen sind in candidates erfasst
+        self.candidates_until = model.store.seq(len(model.store))
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self.display_filter is None:
+            return True
+
+        model = self.sourceModel()
+        row = model.store_row(source_row)
+        if self.candidates is not None:
+            seq = model.store.seq(row)
+            if seq < self.candidates_until and seq not in self.candidates:
+                return False
+
+        return self.display_filter(partial(model.store.value, row))
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        # Das Quellmodell sortiert typisiert und inkrementell, der Proxy behält dessen Reihenfolge
+        self.sourceModel().sort(column, order)
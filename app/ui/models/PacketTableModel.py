@@ -1,52 +1,186 @@
+import time
 import typing
-from datetime import datetime
+from collections import deque
 
-from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtCore import Qt, QModelIndex
 
+from app.ui.models.RingBufferTableModel import RingBufferTableModel
+from app.utilities.DisplayFilter import INDEXED_FIELDS
+from app.utilities.DuplicateTracker import DuplicateTracker
 from app.utilities.Packet import Packet
 
+# Zusätzliche Spalten für zusammengefasste Wiederholungen eines Pakets
+REPEAT_FIELDS = ('heard', 'relays', 'snrBest', 'snrWorst')
 
-class PacketTableModel(QAbstractTableModel):
-    def __init__(self, items=None):
-        super().__init__()
-        self.headers = ['Timestamp', 'From', 'To', 'Relay', 'Port Number', 'SNR', 'RSSI', 'Hop Limit', 'Hop Start']
-        self.items = items or []
+
+class PacketTableModel(RingBufferTableModel):
+    # Anzahl, Relays und SNR-Spanne ändern sich nachträglich und sind deshalb nicht sortierbar
+    SORT_KEYS = ('rxTime', 'nodeFrom', 'nodeTo', 'relayNode', 'portnum', 'rxSnr', 'rxRssi',
+                 'hopLimit', 'hopStart', None, None, 'receptions')
+    NUMERIC_KEYS = frozenset(SORT_KEYS) - {None, 'portnum', 'receptions'}
+
+    def __init__(self, capacity: int = 100000, collapse: bool = True,
+                 repeat_window: float = 600.0):
+        super().__init__(Packet.FIELDS + REPEAT_FIELDS, capacity)
+        self.headers = ['Timestamp', 'From', 'To', 'Relay', 'Port Number', 'SNR', 'RSSI',
+                        'Hop Limit', 'Hop Start', 'Heard', 'SNR Range', 'Receivers']
+        # Spaltenwert -> laufende Nummern in Einfügereihenfolge, für DisplayFilter.candidates()
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        # Wiederholungen (Rebroadcasts) desselben Pakets in eine Zeile falten
+        self.collapse = collapse
+        # (fromId, id) -> laufende Nummer der Zeile des Pakets
+        self.duplicates = DuplicateTracker(repeat_window, min(capacity, 10000))
+
+    def set_collapse(self, collapse: bool) -> None:
+        """Schaltet zwischen zusammengefasster und roher Ansicht um, gilt für neue Pakete"""
+        self.collapse = collapse
+        self.duplicates.clear()
+
+    def add_packets(self, packets: typing.Sequence[Packet]) -> None:
+        """Hängt Pakete an und verdrängt bei voller Kapazität die ältesten Zeilen
+
+        Bei collapse werden Wiederholungen eines bereits angezeigten Pakets nicht
+        angehängt, sondern in dessen Zeile gezählt.
+        """
+        if not self.collapse:
+            self.add_rows([self.new_row(packet) for packet in packets[-self.store.capacity:]])
+            return
+
+        rows = []
+        keys = []
+        batch = {}
+        for packet in packets:
+            key = (packet.fromId, packet.id) if packet.id else None
+            if key is not None:
+                row = batch.get(key)
+                if row is not None:
+                    self.fold(row, packet)
+                    continue
+                seq = self.duplicates.get(key, packet.rxTime)
+                if seq is not None and self.repeat(seq, packet):
+                    continue
+                row = batch[key] = self.new_row(packet)
+            else:
+                row = self.new_row(packet)
+            rows.append(row)
+            keys.append(key)
+
+        self.add_rows(rows)
+        end = self.store.seq(len(self.store))
+        for seq, key, row in zip(range(end - len(rows), end), keys, rows):
+            if key is not None:
+                self.duplicates.put(key, seq, row[Packet.FIELDS.index('rxTime')])
+
+    @staticmethod
+    def new_row(packet: Packet) -> list:
+        relays = (packet.relayNode,) if packet.relayNode is not None else ()
+        return [*packet.to_row(), 1, relays, packet.rxSnr, packet.rxSnr]
+
+    @staticmethod
+    def fold(row: list, packet: Packet) -> None:
+        """Zählt eine Wiederholung in eine noch nicht angehängte Zeile"""
+        heard, relays, best, worst = row[len(Packet.FIELDS):]
+        if packet.relayNode is not None and packet.relayNode not in relays:
+            relays += (packet.relayNode,)
+        # Kopien ohne Empfangswerte ändern die SNR-Spanne nicht
+        snrs = [snr for snr in (best, worst, packet.rxSnr) if snr is not None]
+        row[len(Packet.FIELDS):] = [heard + 1, relays, max(snrs, default=None),
+                                    min(snrs, default=None)]
+
+    def repeat(self, seq: int, packet: Packet) -> bool:
+        """Zählt eine Wiederholung in die Zeile seq, False falls diese bereits verdrängt ist"""
+        row = self.store.row_of_seq(seq)
+        if row < 0:
+            return False
+
+        values = [self.store.value(row, field) for field in Packet.FIELDS + REPEAT_FIELDS]
+        self.fold(values, packet)
+        for field, value in zip(REPEAT_FIELDS, values[len(Packet.FIELDS):]):
+            self.store.set_value(row, field, value)
+
+        model_row = self.row_of_seq(seq)
+        self.dataChanged.emit(self.index(model_row, 3), self.index(model_row, 10),
+                              [Qt.ItemDataRole.DisplayRole])
+        return True
+
+    def rows_added(self, first: int) -> None:
+        self.index_rows(first)
+
+    def rows_evicted(self, count: int) -> None:
+        self.unindex_rows(count)
+
+    def index_rows(self, first: int) -> None:
+        for field, index in self.indexes.items():
+            for row in range(first, len(self.store)):
+                value = self.store.value(row, field)
+                seqs = index.get(value)
+                if seqs is None:
+                    seqs = index[value] = deque()
+                seqs.append(self.store.seq(row))
+
+    def unindex_rows(self, count: int) -> None:
+        # Verdrängt werden immer die ältesten Zeilen, sie stehen in jedem deque ganz links
+        for field, index in self.indexes.items():
+            for row in range(count):
+                value = self.store.value(row, field)
+                seqs = index[value]
+                seqs.popleft()
+                if not seqs:
+                    del index[value]
+
+    def lookup(self, field: str, value: typing.Any) -> typing.Iterable[int]:
+        """Laufende Nummern aller Zeilen, deren Spalte field den Wert value hat"""
+        return self.indexes[field].get(value, ())
+
+    def packet(self, row: int) -> Packet:
+        """Setzt das Paket einer Zeile aus den Spalten wieder zusammen"""
+        values = self.store.row(self.store_row(row))
+        return Packet.from_row([values[field] for field in Packet.FIELDS])
 
     def data(self, index: QModelIndex, role: int = ...) -> typing.Any:
-        if not index.isValid() or index.row() >= len(self.items):
+        if not index.isValid() or index.row() >= len(self.store):
             return None
 
         if role != Qt.ItemDataRole.DisplayRole:
             return None
 
-        packet: Packet = self.items[index.row()]
+        row = self.store_row(index.row())
         column = index.column()
+        value = self.store.value
 
         # Mapping der Spalten zu den entsprechenden Packet-Attributen
         if column == 0:  # Timestamp
-            return packet.rxTime.strftime("%Y-%m-%d %H:%M:%S")
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(value(row, 'rxTime')))
         elif column == 1:  # From
-            return packet.nodeFrom
+            return value(row, 'nodeFrom')
         elif column == 2:  # To
-            return packet.nodeTo
+            return value(row, 'nodeTo')
         elif column == 3:  # Payload (hier nehme ich relayNode wie gewünscht)
-            return packet.relayNode if packet.relayNode is not None else ""
+            relays = value(row, 'relays')
+            return ", ".join(str(relay) for relay in relays) if relays else ""
         elif column == 4:  # Port Number
-            return packet.decoded.portnum
+            return value(row, 'portnum')
         elif column == 5:  # SNR
-            return packet.rxSnr
+            return value(row, 'rxSnr')
         elif column == 6:  # RSSI
-            return packet.rxRssi
+            return value(row, 'rxRssi')
         elif column == 7:  # Hop Limit
-            return packet.hopLimit if packet.hopLimit is not None else ""
+            hop_limit = value(row, 'hopLimit')
+            return hop_limit if hop_limit is not None else ""
         elif column == 8:  # Hop Start
-            return packet.hopStart if packet.hopStart is not None else ""
+            hop_start = value(row, 'hopStart')
+            return hop_start if hop_start is not None else ""
+        elif column == 9:  # Heard
+            heard = value(row, 'heard')
+            return heard if heard > 1 else ""
+        elif column == 10:  # SNR Range
+            best, worst = value(row, 'snrBest'), value(row, 'snrWorst')
+            return f"{worst:g} .. {best:g}" if best != worst else ""
+        elif column == 11:  # Receivers
+            return value(row, 'receptions') or value(row, 'receiver') or ""
 
         return None
 
-    def rowCount(self, parent: QModelIndex = ...) -> int:
-        return len(self.items)
-
     def columnCount(self, parent: QModelIndex = ...) -> int:
         return len(self.headers)
 
@@ -56,5 +190,3 @@ class PacketTableModel(QAbstractTableModel):
                 return self.headers[section]
         return None
 
-    def sort(self, column: int, order: Qt.SortOrder = ...) -> None:
-        pass
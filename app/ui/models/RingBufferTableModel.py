@@ -0,0 +1,111 @@
+import typing
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from app.utilities.RingBuffer import RingBuffer
+from app.utilities.SortIndex import SortIndex
+
+
+class RingBufferTableModel(QAbstractTableModel):
+    """Tabellenmodell über einem RingBuffer mit typisierter Sortierung
+
+    Sortiert wird nach den gespeicherten Werten (Epoch-Zeit, Float, Int), nicht
+    nach Anzeigetexten. Bei aktiver Sortierung wird jede neue Zeile per binärer
+    Suche an ihre Position eingefügt, ohne die Tabelle neu zu sortieren.
+    """
+
+    # Spalte der Ansicht -> Spalte im RingBuffer, nach der sortiert wird
+    SORT_KEYS: typing.Sequence[typing.Optional[str]] = ()
+    # Sortierschlüssel, die sich als Zahl mit NumPy sortieren lassen
+    NUMERIC_KEYS: typing.Collection[str] = ()
+
+    def __init__(self, columns: typing.Sequence[str], capacity: int) -> None:
+        super().__init__()
+        self.store = RingBuffer(columns, capacity)
+        self.sort_key: typing.Optional[str] = None
+        self.sort_position = 0
+        self.sort_index: typing.Optional[SortIndex] = None
+
+    def rows_added(self, first: int) -> None:
+        """Wird nach dem Anhängen mit der ersten neuen Zeile des RingBuffer aufgerufen"""
+
+    def rows_evicted(self, count: int) -> None:
+        """Wird vor dem Verdrängen der ältesten count Zeilen aufgerufen"""
+
+    def add_rows(self, rows: typing.Sequence[typing.Sequence[typing.Any]]) -> None:
+        """Hängt Zeilen an und verdrängt bei voller Kapazität die ältesten"""
+        rows = rows[-self.store.capacity:]
+        if not rows:
+            return
+
+        overflow = len(self.store) + len(rows) - self.store.capacity
+        if self.sort_index is None:
+            if overflow > 0:
+                self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+                self.rows_evicted(overflow)
+                self.store.evict(overflow)
+                self.endRemoveRows()
+
+            first = len(self.store)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.store.extend(rows)
+            self.rows_added(first)
+            self.endInsertRows()
+            return
+
+        # Sortiert liegen verdrängte und neue Zeilen verstreut, jede einzeln melden
+        for _ in range(max(overflow, 0)):
+            value = self.store.value(0, self.sort_key)
+            seq = self.store.seq(0)
+            row = self.sort_index.row_of(value, seq)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.rows_evicted(1)
+            self.store.evict(1)
+            self.sort_index.remove(value, seq)
+            self.endRemoveRows()
+
+        for values in rows:
+            value = values[self.sort_position]
+            row = self.sort_index.insert_row(value)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.store.append(values)
+            last = len(self.store) - 1
+            self.sort_index.insert(value, self.store.seq(last))
+            self.rows_added(last)
+            self.endInsertRows()
+
+    def store_row(self, row: int) -> int:
+        """Zeile im RingBuffer zu einer Zeile des Modells"""
+        if self.sort_index is None:
+            return row
+        return self.store.row_of_seq(self.sort_index.seq_at(row))
+
+    def row_of_seq(self, seq: int) -> int:
+        """Zeile des Modells zu einer laufenden Nummer oder -1 falls bereits verdrängt"""
+        row = self.store.row_of_seq(seq)
+        if row < 0 or self.sort_index is None:
+            return row
+        return self.sort_index.row_of(self.store.value(row, self.sort_key), seq)
+
+    def rowCount(self, parent: QModelIndex = ...) -> int:
+        return len(self.store)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        key = self.SORT_KEYS[column] if 0 <= column < len(self.SORT_KEYS) else None
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        seqs = [self.store.seq(self.store_row(index.row())) for index in persistent]
+
+        self.sort_key = key
+        if key is None:
+            self.sort_index = None
+        else:
+            self.sort_position = list(self.store.columns).index(key)
+            self.sort_index = SortIndex(self.store.column_values(key), self.store.first_seq,
+                                        order == Qt.SortOrder.DescendingOrder,
+                                        key in self.NUMERIC_KEYS)
+
+        for index, seq in zip(persistent, seqs):
+            self.changePersistentIndex(index, self.index(self.row_of_seq(seq), index.column()))
+        self.layoutChanged.emit()
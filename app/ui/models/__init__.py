@@ -1,3 +1,6 @@
+from app.ui.models.CaptureTableModel import CaptureTableModel
 from app.ui.models.LogTableModel import LogTableModel
 from app.ui.models.NodeListModel import NodeListModel
-from app.ui.models.PacketTableModel import PacketTableModel
\ No newline at end of file
+from app.ui.models.PacketFilterProxyModel import PacketFilterProxyModel
+from app.ui.models.PacketTableModel import PacketTableModel
+from app.ui.models.RingBufferTableModel import RingBufferTableModel
\ No newline at end of file
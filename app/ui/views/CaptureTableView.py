@@ -0,0 +1,27 @@
+from PyQt6.QtWidgets import QTableView, QAbstractItemView, QHeaderView
+
+from app.ui.models.CaptureTableModel import CaptureTableModel
+
+
+class CaptureTableView(QTableView):
+    def __new__(cls, parent):
+        # Kein Proxy: Sortieren oder Filtern würde alle Seiten aus der Datenbank laden
+        model = CaptureTableModel(parent.captureStore)
+
+        table_view = QTableView()
+        table_view.setModel(model)
+        table_view.setWordWrap(False)
+        table_view.verticalHeader().setVisible(False)
+        table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table_view.setAlternatingRowColors(True)
+        table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        table_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+
+        header = table_view.horizontalHeader()
+        header.setStretchLastSection(True)
+
+        # ResizeToContents würde jede Zeile laden, daher feste Breiten
+        for i in range(header.count() - 1):
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
+
+        return table_view
@@ -1,28 +1,25 @@
-from datetime import datetime
-
-from PyQt6.QtCore import QSortFilterProxyModel
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QTableView, QAbstractItemView, QHeaderView
 
 from app.ui.models.LogTableModel import LogTableModel
+from app.utilities.AppConfig import AppConfig
 
 
 class LogTableView(QTableView):
     def __new__(cls, parent):
-        model = LogTableModel()
-
-        proxy = QSortFilterProxyModel()
-        proxy.setSourceModel(model)
+        config = AppConfig().load()
+        model = LogTableModel(config.getint('logging', 'buffer', fallback=10000))
 
-        def on_log_message(level: str, message: str):
-            model.items.append((
-                datetime.now(), level, message
-            ))
-            model.layoutChanged.emit()
+        # Ohne Proxy, LogTableModel sortiert selbst nach typisierten Werten
+        table_view = QTableView()
+        table_view.setModel(model)
 
-        parent.interface.log_message.connect(on_log_message)
+        # Meldungen im Takt der Oberfläche abholen statt einzeln pro Zeile
+        timer = QTimer(table_view)
+        timer.setInterval(1000 // max(config.getint('ui', 'max_fps', fallback=10), 1))
+        timer.timeout.connect(lambda: model.add_records(parent.logCollector.drain()))
+        timer.start()
 
-        table_view = QTableView()
-        table_view.setModel(proxy)
         table_view.setSortingEnabled(True)
         table_view.setWordWrap(True)
         table_view.verticalHeader().setVisible(False)
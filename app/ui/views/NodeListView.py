@@ -1,3 +1,5 @@
+import time
+
 from PyQt6.QtCore import Qt, QSortFilterProxyModel
 from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import QListView, QMenu
@@ -9,16 +11,15 @@ from app.utilities.NodeInfo import NodeInfo
 
 class NodeListView(QListView):
     def __new__(cls, parent):
-        model = NodeListModel()
+        model = NodeListModel(link_statistics=parent.linkStatistics, airtime=parent.airtime)
 
         proxy = QSortFilterProxyModel()
         proxy.setSourceModel(model)
 
-        def on_node_discovered(node: NodeInfo):
-            model.items.append(node)
-            model.layoutChanged.emit()
+        def on_nodes_updated(nodes: list):
+            model.upsert_nodes(nodes)
 
-        parent.interface.node_discovered.connect(on_node_discovered)
+        parent.nodeUpdates.nodes_updated.connect(on_nodes_updated)
 
         list_view = QListView()
         list_view.setModel(proxy)
@@ -94,7 +95,7 @@ Status:
   SNR: {node.snr if node.snr else 'N/A'} dB
   Hops Away: {node.hopsAway if node.hopsAway else 'N/A'}
   Battery: {node.deviceMetrics.batteryLevel if node.deviceMetrics and node.deviceMetrics.batteryLevel else 'N/A'}%
-  Last Heard: {node.lastHeard.strftime('%Y-%m-%d %H:%M:%S') if node.lastHeard else 'Never'}
+  Last Heard: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(node.lastHeard)) if node.lastHeard else 'Never'}
 """
 
     msg_box = QMessageBox()
@@ -1,14 +1,58 @@
+import time
+from collections import OrderedDict
+
 from PyQt6.QtCore import Qt, QRect, QModelIndex, QSize
-from PyQt6.QtGui import QPainter, QFont, QColor
+from PyQt6.QtGui import QPainter, QFont, QColor, QPalette, QPixmap
 from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
 
+from app.ui.ThemeManager import ThemeManager
+from app.ui.models.NodeListModel import NodeListModel
 from app.utilities.Interface import Interface
 from app.utilities.NodeInfo import NodeInfo
 
 
 class NodeStyledItemDelegate(QStyledItemDelegate):
+    """Zeichnet Node-Zeilen einmal in ein Pixmap und blittet danach nur noch
+
+    Ein Pixmap gilt für eine Node-Version, Größe, Palette, Schrift und
+    Pixeldichte. Ändert sich die Node oder das Theme, wird neu gezeichnet.
+    """
+
+    # Obergrenze für gecachte Zeilen, sichtbar sind meist nur wenige Dutzend
+    CACHE_SIZE = 256
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Node-Nummer -> (Schlüssel, Pixmap)
+        self.cache: OrderedDict = OrderedDict()
+        self.font_cache = {}
+
+        self.theme_manager = ThemeManager(self)
+        self.theme_manager.theme_changed.connect(self.clear_cache)
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
+        self.font_cache.clear()
+
+    def fonts(self, font: QFont) -> tuple:
+        fonts = self.font_cache.get(font.key())
+        if fonts is None:
+            circle_font = QFont(font)
+            circle_font.setBold(True)
+            circle_font.setPointSize(font.pointSize())
+
+            title_font = QFont(font)
+            title_font.setPointSize(font.pointSize() + 2)
+            title_font.setBold(True)
+
+            detail_font = QFont(font)
+            detail_font.setPointSize(font.pointSize() - 1)
+
+            small_font = QFont(font)
+            small_font.setPointSize(font.pointSize() - 2)
+
+            fonts = self.font_cache[font.key()] = (circle_font, title_font, detail_font, small_font)
+        return fonts
 
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
         node: NodeInfo = index.data(Qt.ItemDataRole.UserRole)
@@ -16,9 +60,7 @@ class NodeStyledItemDelegate(QStyledItemDelegate):
             super().paint(painter, option, index)
             return
 
-        painter.save()
-
-        # Hintergrund zeichnen (für Selektion/Hover)
+        # Hintergrund zeichnen (für Selektion/Hover), hängt vom Zustand ab und wird nicht gecacht
         self.parent().style().drawPrimitive(
             self.parent().style().PrimitiveElement.PE_PanelItemViewItem,
             option,
@@ -26,15 +68,41 @@ class NodeStyledItemDelegate(QStyledItemDelegate):
             self.parent()
         )
 
+        ratio = painter.device().devicePixelRatioF()
+        key = (index.data(NodeListModel.VersionRole), option.rect.width(), option.rect.height(),
+               option.palette.cacheKey(), option.font.key(), ratio)
+        entry = self.cache.get(node.num)
+        if entry is not None and entry[0] == key:
+            self.cache.move_to_end(node.num)
+            pixmap = entry[1]
+        else:
+            pixmap = QPixmap(option.rect.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            pixmap_painter = QPainter(pixmap)
+            pixmap_painter.setRenderHints(painter.renderHints())
+            self.render_node(pixmap_painter, QRect(0, 0, option.rect.width(), option.rect.height()),
+                             option.font, option.palette, node)
+            pixmap_painter.end()
+
+            self.cache[node.num] = (key, pixmap)
+            self.cache.move_to_end(node.num)
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+
+        painter.drawPixmap(option.rect.topLeft(), pixmap)
+
+    def render_node(self, painter: QPainter, rect: QRect, font: QFont, palette: QPalette,
+                    node: NodeInfo) -> None:
         # Kreis für Icon zeichnen (links vom Text)
         circle_size = 45  # Durchmesser des Kreises
         circle_margin = 10  # Abstand vom Rand
-        circle_x = option.rect.left() + circle_margin
-        circle_y = option.rect.top() + (option.rect.height() - circle_size) // 2  # Vertikal zentriert
+        circle_x = rect.left() + circle_margin
+        circle_y = rect.top() + (rect.height() - circle_size) // 2  # Vertikal zentriert
         circle_rect = QRect(circle_x, circle_y, circle_size, circle_size)
 
         # Farbe basierend auf node_id generieren (konsistent für gleiche Node)
-        hue, saturation, value = Interface().get_node_color(node.user.shortName)
+        hue, saturation, value = Interface.get_node_color(node.user.shortName)
         color = QColor()
         color.setHsv(hue, saturation, value)
 
@@ -45,28 +113,15 @@ class NodeStyledItemDelegate(QStyledItemDelegate):
 
         # Shortname im Kreis zentrieren
         painter.setPen(QColor(255, 255, 255))  # Weiße Schrift
-        circle_font = QFont(option.font)
-        circle_font.setBold(True)
-        circle_font.setPointSize(option.font.pointSize())
+        circle_font, title_font, detail_font, small_font = self.fonts(font)
         painter.setFont(circle_font)
         painter.drawText(circle_rect, Qt.AlignmentFlag.AlignCenter, node.user.shortName)
 
         # Textbereich definieren
-        text_rect = option.rect.adjusted(65, 5, -5, -5)
-
-        # Schriftarten definieren
-        title_font = QFont(option.font)
-        title_font.setPointSize(option.font.pointSize() + 2)
-        title_font.setBold(True)
-
-        detail_font = QFont(option.font)
-        detail_font.setPointSize(option.font.pointSize() - 1)
-
-        small_font = QFont(option.font)
-        small_font.setPointSize(option.font.pointSize() - 2)
+        text_rect = rect.adjusted(65, 5, -5, -5)
 
         # Farben definieren
-        text_color = option.palette.color(option.palette.ColorGroup.Normal, option.palette.ColorRole.Text)
+        text_color = palette.color(palette.ColorGroup.Normal, palette.ColorRole.Text)
         detail_color = QColor(text_color)
         detail_color.setAlpha(180)
 
@@ -119,13 +174,11 @@ class NodeStyledItemDelegate(QStyledItemDelegate):
                 painter.drawText(right_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop,
                                  status_parts[2])
 
-        time_text = node.lastHeard.strftime('%H:%M:%S')
+        time_text = time.strftime('%H:%M:%S', time.localtime(node.lastHeard)) if node.lastHeard else ''
         time_rect = QRect(text_rect.right() - 80, text_rect.top(), 80, 16)
 
         painter.setFont(small_font)
         painter.drawText(time_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, time_text)
 
-        painter.restore()
-
     def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex):
         return QSize(-1, 65)
@@ -1,23 +1,18 @@
-from PyQt6.QtCore import QSortFilterProxyModel
 from PyQt6.QtWidgets import QTableView, QAbstractItemView, QHeaderView
 
+from app.ui.models.PacketFilterProxyModel import PacketFilterProxyModel
 from app.ui.models.PacketTableModel import PacketTableModel
-from app.utilities.Packet import Packet
+from app.utilities.AppConfig import AppConfig
 
 
 class PacketTableView(QTableView):
     def __new__(cls, parent):
-        model = PacketTableModel()
+        # Ein vorab angelegtes Modell hat die Pakete seit Programmstart gesammelt
+        model = parent.packetModel or cls.create_model(parent.interface)
 
-        proxy = QSortFilterProxyModel()
+        proxy = PacketFilterProxyModel()
         proxy.setSourceModel(model)
 
-        def on_packet_received(packet: Packet):
-            model.items.append(packet)
-            model.layoutChanged.emit()
-
-        parent.interface.packet_received.connect(on_packet_received)
-
         table_view = QTableView()
         table_view.setModel(proxy)
         table_view.setSortingEnabled(True)
@@ -35,3 +30,18 @@ class PacketTableView(QTableView):
             header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
 
         return table_view
+
+    @staticmethod
+    def create_model(interface) -> PacketTableModel:
+        config = AppConfig().load()
+        model = PacketTableModel(
+            config.getint('packets', 'retention', fallback=100000),
+            collapse=config.getboolean('packets', 'collapse_repeats', fallback=True),
+            repeat_window=config.getfloat('packets', 'repeat_window_s', fallback=600),
+        )
+
+        def on_packets_received(packets: list):
+            model.add_packets(packets)
+
+        interface.packets_received.connect(on_packets_received)
+        return model
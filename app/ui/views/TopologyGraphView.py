@@ -0,0 +1,171 @@
+import math
+import time
+
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer, QLineF
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsEllipseItem, QGraphicsSimpleTextItem
+
+from app.utilities.Interface import Interface
+from app.utilities.TopologyGraph import RECEIVER, TopologyEdge, edge_color, edge_width
+
+
+class TopologyGraphView(QGraphicsView):
+    """Zeichnet den TopologyGraph als Ringe um den eigenen Empfänger
+
+    Der Abstand zur Mitte entspricht hopsAway, der Winkel ergibt sich fest aus
+    der Node-Nummer. Nodes springen daher nicht, wenn Kanten hinzukommen, und
+    jede Änderung betrifft nur die Items der geänderten Kanten.
+    """
+
+    RING = 120
+    NODE_SIZE = 24
+    # Ring für Nodes ohne bekannte Hop-Anzahl
+    UNKNOWN_HOPS = 7
+
+    def __init__(self, parent) -> None:
+        super().__init__()
+        self.topology = parent.topology
+
+        self.graphScene = QGraphicsScene(self)
+        self.setScene(self.graphScene)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+
+        self.nodes = {}
+        self.node_items = {}
+        self.edge_items = {}
+        self.version = 0
+        self.fitted = False
+
+        parent.updates.nodes_updated.connect(self.update_nodes)
+        self.update_nodes(list(parent.updates.nodes.values()))
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def wheelEvent(self, event) -> None:
+        factor = 1.15 ** (event.angleDelta().y() / 120)
+        self.scale(factor, factor)
+
+    def node_position(self, num: int) -> QPointF:
+        if self.topology.is_receiver(num):
+            receivers = sorted(set(self.topology.receivers.values()))
+            if num not in receivers or len(receivers) == 1:
+                return QPointF(0, 0)
+            # Mehrere Funkgeräte teilen sich einen kleinen Ring in der Mitte
+            angle = receivers.index(num) / len(receivers) * 2 * math.pi
+            return QPointF(self.RING / 2 * math.cos(angle), self.RING / 2 * math.sin(angle))
+        node = self.nodes.get(num)
+        hops = node.hopsAway if node and node.hopsAway is not None else self.UNKNOWN_HOPS
+        radius = (min(hops, self.UNKNOWN_HOPS) + 1) * self.RING
+        # Goldener Schnitt verteilt aufeinanderfolgende Nummern gleichmäßig auf den Ring
+        angle = (num * 0.6180339887 % 1.0) * 2 * math.pi
+        return QPointF(radius * math.cos(angle), radius * math.sin(angle))
+
+    def node_label(self, num: int) -> str:
+        if self.topology.is_receiver(num) and num not in self.nodes:
+            return "RX"
+        node = self.nodes.get(num)
+        return node.user.shortName if node else f"{num & 0xFFFF:04x}"
+
+    def node_item(self, num: int) -> QGraphicsEllipseItem:
+        item = self.node_items.get(num)
+        if item is not None:
+            return item
+
+        size = self.NODE_SIZE
+        item = QGraphicsEllipseItem(QRectF(-size / 2, -size / 2, size, size))
+        item.setPen(QPen(Qt.PenStyle.NoPen))
+        item.setZValue(1)
+        item.setPos(self.node_position(num))
+        label = QGraphicsSimpleTextItem(item)
+        label.setZValue(2)
+        self.style_node(num, item, label)
+        self.graphScene.addItem(item)
+        self.node_items[num] = item
+        return item
+
+    def style_node(self, num: int, item: QGraphicsEllipseItem, label: QGraphicsSimpleTextItem) -> None:
+        node = self.nodes.get(num)
+        color = QColor(120, 120, 120)
+        if node:
+            hue, saturation, value = Interface.get_node_color(node.user.shortName)
+            color.setHsv(hue, saturation, value)
+            item.setToolTip(f"{node.user.longName} ({node.user.id})")
+        else:
+            item.setToolTip(f"!{num:08x}" if num != RECEIVER else "Receiver")
+        item.setBrush(QBrush(color))
+        label.setText(self.node_label(num))
+        label.setPos(self.NODE_SIZE / 2 + 2, -label.boundingRect().height() / 2)
+
+    def update_nodes(self, nodes: list) -> None:
+        for node in nodes:
+            previous = self.nodes.get(node.num)
+            self.nodes[node.num] = node
+            item = self.node_items.get(node.num)
+            if item is None:
+                continue
+            self.style_node(node.num, item, item.childItems()[0])
+            if previous is None or previous.hopsAway != node.hopsAway:
+                item.setPos(self.node_position(node.num))
+                for neighbor in self.topology.neighbors(node.num):
+                    for key in ((node.num, neighbor), (neighbor, node.num)):
+                        line = self.edge_items.get(key)
+                        if line is not None:
+                            line.setLine(self.edge_line(*key))
+
+    def edge_line(self, source: int, target: int) -> QLineF:
+        return QLineF(self.node_item(source).pos(), self.node_item(target).pos())
+
+    def refresh(self) -> None:
+        if not self.isVisible():
+            return
+
+        changes = self.topology.changes_since(self.version)
+        if changes is None:
+            # Zu viele Änderungen verpasst, alles neu aufbauen
+            self.graphScene.clear()
+            self.node_items.clear()
+            self.edge_items.clear()
+            changes = list(self.topology.edges.values()), []
+        updated, removed = changes
+        self.version = self.topology.version
+
+        for edge in updated:
+            self.update_edge(edge)
+        for key in removed:
+            self.remove_edge(key)
+
+        if updated and not self.fitted:
+            self.fitted = True
+            self.fitInView(self.graphScene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+
+    def update_edge(self, edge: TopologyEdge) -> None:
+        key = (edge.source, edge.target)
+        line = self.edge_items.get(key)
+        if line is None:
+            line = self.graphScene.addLine(self.edge_line(*key))
+            line.setZValue(0)
+            self.edge_items[key] = line
+
+        pen = QPen(QColor(edge_color(edge)))
+        pen.setWidthF(edge_width(edge))
+        pen.setCosmetic(True)
+        line.setPen(pen)
+
+        snr = f"{edge.snr:.1f} dB" if edge.snr is not None else "n/a"
+        line.setToolTip(f"{self.node_label(edge.source)} → {self.node_label(edge.target)}\n"
+                        f"Packets: {edge.packets}\nSNR: {snr}\n"
+                        f"Last seen: {time.strftime('%H:%M:%S', time.localtime(edge.last_seen))}")
+
+    def remove_edge(self, key: tuple) -> None:
+        line = self.edge_items.pop(key, None)
+        if line is not None:
+            self.graphScene.removeItem(line)
+        # Nodes ohne verbleibende Kante ausblenden
+        for num in key:
+            if not self.topology.neighbors(num) and num in self.node_items:
+                self.graphScene.removeItem(self.node_items.pop(num))
@@ -1,4 +1,6 @@
+from app.ui.views.CaptureTableView import CaptureTableView
 from app.ui.views.LogTableView import LogTableView
 from app.ui.views.NodeListView import NodeListView
 from app.ui.views.NodeStyledItemDelegate import NodeStyledItemDelegate
-from app.ui.views.PacketTableView import PacketTableModel
\ No newline at end of file
+from app.ui.views.PacketTableView import PacketTableModel
+from app.ui.views.TopologyGraphView import TopologyGraphView
\ No newline at end of file
@@ -1,7 +1,7 @@
-import serial.tools.list_ports
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QLineEdit, QDialog, QDialogButtonBox, QFormLayout
-from meshtastic.ble_interface import BLEInterface
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QDialog, QDialogButtonBox, QFormLayout, QPushButton, QFileDialog
+
+from app.utilities.DeviceDiscovery import DeviceDiscovery
 
 
 class ConnectDialog(QDialog):
@@ -12,15 +12,41 @@ class ConnectDialog(QDialog):
         self.type_combo = None
         self.port_label = None
         self.port_combo = None
+        self.port_widget = None
         self.host_label = None
         self.host_line = None
         self.addr_label = None
         self.addr_combo = None
+        self.addr_widget = None
+        self.file_label = None
+        self.file_widget = None
+        self.file_line = None
+        self.speed_label = None
+        self.speed_combo = None
+        self.record_label = None
+        self.record_widget = None
+        self.record_line = None
+        self.name_label = None
+        self.name_line = None
+        # Art der Suche -> Auswahlliste und Knopf für eine neue Suche
+        self.device_combos = {}
+        self.scan_buttons = {}
+
+        # Die Suche läuft im Hintergrund, Geräte erscheinen einzeln in der Auswahl
+        self.discovery = DeviceDiscovery.instance()
+        self.discovery.device_found.connect(self.on_device_found)
+        self.discovery.scan_finished.connect(self.on_scan_finished)
 
         self.init_ui()
 
         self.add_type_combo_items()
 
+    def done(self, result: int) -> None:
+        # DeviceDiscovery lebt länger als der Dialog, spätere Suchen sollen ihn nicht mehr erreichen
+        self.discovery.device_found.disconnect(self.on_device_found)
+        self.discovery.scan_finished.disconnect(self.on_scan_finished)
+        super().done(result)
+
     def center(self):
         qr = self.frameGeometry()
         cp = self.screen().availableGeometry().center()
@@ -48,8 +74,9 @@ class ConnectDialog(QDialog):
         form_layout.setWidget(1, QFormLayout.ItemRole.LabelRole, self.port_label)
 
         self.port_combo = QComboBox()
-        self.port_combo.hide()
-        form_layout.setWidget(1, QFormLayout.ItemRole.FieldRole, self.port_combo)
+        self.port_widget = self.create_scan_widget(self.port_combo, 'serial')
+        self.port_widget.hide()
+        form_layout.setWidget(1, QFormLayout.ItemRole.FieldRole, self.port_widget)
 
         self.host_label = QLabel('Hostname', form_widget)
         self.host_label.hide()
@@ -65,8 +92,46 @@ class ConnectDialog(QDialog):
         form_layout.setWidget(3, QFormLayout.ItemRole.LabelRole, self.addr_label)
 
         self.addr_combo = QComboBox()
-        self.addr_combo.hide()
-        form_layout.setWidget(3, QFormLayout.ItemRole.FieldRole, self.addr_combo)
+        self.addr_widget = self.create_scan_widget(self.addr_combo, 'ble')
+        self.addr_widget.hide()
+        form_layout.setWidget(3, QFormLayout.ItemRole.FieldRole, self.addr_widget)
+
+        self.file_label = QLabel('Capture', form_widget)
+        self.file_label.hide()
+        form_layout.setWidget(4, QFormLayout.ItemRole.LabelRole, self.file_label)
+
+        self.file_line = QLineEdit()
+        self.file_widget = self.create_file_widget(self.file_line, self.browse_replay_file)
+        self.file_widget.hide()
+        form_layout.setWidget(4, QFormLayout.ItemRole.FieldRole, self.file_widget)
+
+        self.speed_label = QLabel('Speed', form_widget)
+        self.speed_label.hide()
+        form_layout.setWidget(5, QFormLayout.ItemRole.LabelRole, self.speed_label)
+
+        self.speed_combo = QComboBox()
+        for text, speed in (("1×", 1.0), ("2×", 2.0), ("10×", 10.0), ("100×", 100.0), ("As fast as possible", 0.0)):
+            self.speed_combo.addItem(text, speed)
+        self.speed_combo.hide()
+        form_layout.setWidget(5, QFormLayout.ItemRole.FieldRole, self.speed_combo)
+
+        self.record_label = QLabel('Record to', form_widget)
+        self.record_label.hide()
+        form_layout.setWidget(6, QFormLayout.ItemRole.LabelRole, self.record_label)
+
+        self.record_line = QLineEdit()
+        self.record_line.setPlaceholderText("Optional capture file")
+        self.record_widget = self.create_file_widget(self.record_line, self.browse_record_file)
+        self.record_widget.hide()
+        form_layout.setWidget(6, QFormLayout.ItemRole.FieldRole, self.record_widget)
+
+        # Kennzeichnet die Pakete dieses Funkgeräts, wenn mehrere verbunden sind
+        self.name_label = QLabel('Name', form_widget)
+        form_layout.setWidget(7, QFormLayout.ItemRole.LabelRole, self.name_label)
+
+        self.name_line = QLineEdit()
+        self.name_line.setPlaceholderText("Optional radio name, e.g. gateway-north")
+        form_layout.setWidget(7, QFormLayout.ItemRole.FieldRole, self.name_line)
 
         form_layout.setFormAlignment(Qt.AlignmentFlag.AlignLeft)
         form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -88,31 +153,45 @@ class ConnectDialog(QDialog):
         self.show()
 
     def on_type_combo_changed(self, value):
+        self.file_label.setVisible(value == 4)
+        self.file_widget.setVisible(value == 4)
+        self.speed_label.setVisible(value == 4)
+        self.speed_combo.setVisible(value == 4)
+        self.record_label.setVisible(value in (1, 2, 3))
+        self.record_widget.setVisible(value in (1, 2, 3))
+
         if value == 1:
             self.add_port_combo_items()
 
             self.port_label.show()
-            self.port_combo.show()
+            self.port_widget.show()
             self.host_label.hide()
             self.host_line.hide()
             self.addr_label.hide()
-            self.addr_combo.hide()
+            self.addr_widget.hide()
         elif value == 2:
             self.port_label.hide()
-            self.port_combo.hide()
+            self.port_widget.hide()
             self.host_label.show()
             self.host_line.show()
             self.addr_label.hide()
-            self.addr_combo.hide()
+            self.addr_widget.hide()
         elif value == 3:
             self.add_addr_combo_items()
 
             self.port_label.hide()
-            self.port_combo.hide()
+            self.port_widget.hide()
             self.host_label.hide()
             self.host_line.hide()
             self.addr_label.show()
-            self.addr_combo.show()
+            self.addr_widget.show()
+        elif value == 4:
+            self.port_label.hide()
+            self.port_widget.hide()
+            self.host_label.hide()
+            self.host_line.hide()
+            self.addr_label.hide()
+            self.addr_widget.hide()
 
     def add_type_combo_items(self):
         self.type_combo.clear()
@@ -120,19 +199,77 @@ class ConnectDialog(QDialog):
         self.type_combo.addItem("Serial")
         self.type_combo.addItem("Tcp")
         self.type_combo.addItem("Ble")
+        self.type_combo.addItem("Replay")
+
+    def create_file_widget(self, line: QLineEdit, browse) -> QWidget:
+        widget = QWidget()
+        layout = QHBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        button = QPushButton("…")
+        button.clicked.connect(browse)
+        layout.addWidget(line)
+        layout.addWidget(button)
+        return widget
+
+    def browse_replay_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open capture", "", "Captures (*.mtmcap);;All files (*)")
+        if path:
+            self.file_line.setText(path)
+
+    def browse_record_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Record capture", "", "Captures (*.mtmcap)")
+        if path:
+            self.record_line.setText(path)
+
+    def create_scan_widget(self, combo: QComboBox, kind: str) -> QWidget:
+        widget = QWidget()
+        layout = QHBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        button = QPushButton("Rescan")
+        button.clicked.connect(lambda: self.discover(kind, force=True))
+        layout.addWidget(combo, 1)
+        layout.addWidget(button)
+        self.device_combos[kind] = combo
+        self.scan_buttons[kind] = button
+        return widget
 
     def add_port_combo_items(self):
-        self.port_combo.clear()
-        self.port_combo.addItem("")
-        for port in serial.tools.list_ports.comports():
-            self.port_combo.addItem(f"{port.device}")
-        if self.port_combo.count() == 0:
-            self.port_combo.addItem("No ports found")
+        self.discover('serial')
 
     def add_addr_combo_items(self):
-        self.addr_combo.clear()
-        self.addr_combo.addItem("")
-        for device in BLEInterface.scan():
-            self.addr_combo.addItem(f"{device.address}")
-        if self.addr_combo.count() == 0:
-            self.addr_combo.addItem("No devices found")
+        self.discover('ble')
+
+    def discover(self, kind: str, force: bool = False) -> None:
+        """Zeigt die bekannten Geräte und sucht im Hintergrund, wenn der Cache abgelaufen ist"""
+        self.fill_device_combo(kind)
+        if self.discovery.discover(kind, force):
+            button = self.scan_buttons[kind]
+            button.setEnabled(False)
+            button.setText("Scanning…")
+
+    def fill_device_combo(self, kind: str) -> None:
+        combo = self.device_combos[kind]
+        current = combo.currentText()
+        combo.clear()
+        combo.addItem("")
+        for address, description in self.discovery.cached(kind):
+            self.add_device_item(combo, address, description)
+        combo.setCurrentIndex(max(combo.findText(current), 0))
+
+    @staticmethod
+    def add_device_item(combo: QComboBox, address: str, description: str) -> None:
+        if combo.findText(address) < 0:
+            combo.addItem(address)
+            combo.setItemData(combo.count() - 1, description, Qt.ItemDataRole.ToolTipRole)
+
+    def on_device_found(self, kind: str, address: str, description: str) -> None:
+        self.add_device_item(self.device_combos[kind], address, description)
+
+    def on_scan_finished(self, kind: str, error: str) -> None:
+        # Nicht mehr gefundene Geräte verschwinden erst mit dem Ende der Suche
+        self.fill_device_combo(kind)
+        button = self.scan_buttons[kind]
+        button.setEnabled(True)
+        button.setText("Rescan")
+        count = self.device_combos[kind].count() - 1
+        button.setToolTip(f"Scan failed: {error}" if error else f"{count} device(s) found")
@@ -12,4 +12,5 @@ class MenuBar(QMenuBar):
         view_menu = self.addMenu("&View")
         view_menu.addAction(self.parent().toolbar.actions_call["Log"]) # type: ignore
         view_menu.addAction(self.parent().toolbar.actions_call["Packets"]) # type: ignore
-        view_menu.addAction(self.parent().toolbar.actions_call["Map"]) # type: ignore
\ No newline at end of file
+        view_menu.addAction(self.parent().toolbar.actions_call["Map"]) # type: ignore
+        view_menu.addAction(self.parent().toolbar.actions_call["Topology"]) # type: ignore
\ No newline at end of file
@@ -1,9 +1,71 @@
-from PyQt6.QtWidgets import QStatusBar
+import math
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QStatusBar, QLabel
 
 from app.utilities.AppConfig import AppConfig
 
 
+BARS = " ▁▂▃▄▅▆▇█"
+
+
+def sparkline(values: list) -> str:
+    """Werte als Balken aus Blockzeichen, skaliert auf das Maximum"""
+    peak = max(values, default=0)
+    if peak <= 0:
+        return BARS[0] * len(values)
+    return "".join(BARS[min(len(BARS) - 1, math.ceil(value / peak * (len(BARS) - 1)))]
+                   for value in values)
+
+
 class StatusBar(QStatusBar):
     def __init__(self, parent) -> None:
         super().__init__(parent)
         self.showMessage(f"Version {AppConfig().load()['app']['version']}")
+
+        # Geschätzte Kanalbelegung und die Nodes mit der meisten Sendezeit
+        self.airtime = parent.airtime
+        self.airtimeLabel = QLabel()
+        self.addPermanentWidget(self.airtimeLabel)
+
+        # Empfangene Node-Updates und wie viele davon zusammengefasst wurden
+        self.nodeUpdates = parent.nodeUpdates
+        self.nodeUpdatesLabel = QLabel()
+        self.nodeUpdatesLabel.setToolTip("Node updates received, merged before redrawing")
+        self.addPermanentWidget(self.nodeUpdatesLabel)
+
+        self.airtimeTimer = QTimer(self)
+        self.airtimeTimer.setInterval(2000)
+        self.airtimeTimer.timeout.connect(self.update_airtime)
+        self.airtimeTimer.timeout.connect(self.update_node_updates)
+        self.airtimeTimer.start()
+
+    def update_node_updates(self) -> None:
+        if not self.nodeUpdates.received:
+            return
+        self.nodeUpdatesLabel.setText(f"Node updates {self.nodeUpdates.received} "
+                                      f"({self.nodeUpdates.merged} merged)")
+
+    def update_airtime(self) -> None:
+        if not self.airtime.total.total:
+            self.airtimeLabel.clear()
+            return
+
+        text = f"Channel load {self.airtime.channel_utilization():.1f}%"
+        top = self.airtime.top_nodes(3)
+        if top:
+            text += " · " + ", ".join(f"!{num:08x} {percent:.1f}%" if isinstance(num, int)
+                                      else f"{num} {percent:.1f}%" for num, percent in top)
+        self.airtimeLabel.setText(text)
+
+        # Verlauf je Kanal und für die Top-Nodes, ein Zeichen je Zeitabschnitt
+        lines = [f"Estimated airtime over the last {self.airtime.window / 60:.0f} min "
+                 f"({self.airtime.preset}), one bar per {self.airtime.bucket:g}s"]
+        for channel in sorted(self.airtime.total.channels):
+            if self.airtime.total.channels[channel] > 0:
+                lines.append(f"Channel {channel}: "
+                             f"{sparkline(self.airtime.channel_histogram(channel))}")
+        for num, _ in top:
+            name = f"!{num:08x}" if isinstance(num, int) else str(num)
+            lines.append(f"{name}: {sparkline(self.airtime.node_histogram(num))}")
+        self.airtimeLabel.setToolTip("\n".join(lines))
@@ -0,0 +1,176 @@
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utilities.OutageLog import OutageLog
+from app.utilities.Packet import Packet
+
+# Modem-Presets von meshtastic: Bandbreite (Hz), Spreading Factor, Coding Rate 4/x
+MODEM_PRESETS = {
+    'SHORT_TURBO': (500000, 7, 5),
+    'SHORT_FAST': (250000, 7, 5),
+    'SHORT_SLOW': (250000, 8, 5),
+    'MEDIUM_FAST': (250000, 9, 5),
+    'MEDIUM_SLOW': (250000, 10, 5),
+    'LONG_FAST': (250000, 11, 5),
+    'LONG_MODERATE': (125000, 11, 8),
+    'LONG_SLOW': (125000, 12, 8),
+    'VERY_LONG_SLOW': (62500, 12, 8),
+}
+
+PREAMBLE_SYMBOLS = 16
+
+# Funkpaket = meshtastic-Header + protobuf Data (portnum, payload, bitfield).
+# Verschlüsselung mit AES-CTR ändert die Länge nicht, PKI hängt Tag und Nonce an.
+HEADER_BYTES = 16
+DATA_OVERHEAD_BYTES = 6
+PKI_OVERHEAD_BYTES = 12
+MAX_PAYLOAD_BYTES = 255
+
+
+def time_on_air(length: int, bandwidth: int, spreading_factor: int, coding_rate: int,
+                preamble: int = PREAMBLE_SYMBOLS) -> float:
+    """Sendedauer in Sekunden nach dem Semtech-Datenblatt (expliziter Header, CRC an)"""
+    symbol_time = (2 ** spreading_factor) / bandwidth
+    # Low Data Rate Optimization ist ab 16 ms pro Symbol Pflicht
+    low_data_rate = 1 if symbol_time > 0.016 else 0
+    payload_symbols = 8 + max(math.ceil(
+        (8 * length - 4 * spreading_factor + 28 + 16) / (4 * (spreading_factor - 2 * low_data_rate))
+    ) * coding_rate, 0)
+    return (preamble + 4.25 + payload_symbols) * symbol_time
+
+
+def packet_length(packet: Packet) -> int:
+    """Geschätzte Länge des Funkpakets in Bytes"""
+    payload = packet.decoded.payload
+    length = HEADER_BYTES + DATA_OVERHEAD_BYTES + (len(payload) if payload else 0)
+    if packet.pkiEncrypted:
+        length += PKI_OVERHEAD_BYTES
+    return min(length, MAX_PAYLOAD_BYTES)
+
+
+@dataclass(slots=True)
+class AirtimeBucket:
+    index: int
+    total: float = 0.0
+    nodes: Counter = field(default_factory=Counter)
+    channels: Counter = field(default_factory=Counter)
+
+
+class AirtimeStatistics:
+    """Geschätzte Sendezeit pro Node und Kanal in Zeitabschnitten
+
+    Jedes empfangene Paket wird mit der Sendedauer des eingestellten Presets
+    bewertet und dem Absender zugerechnet. Das Fenster ist wie bei airUtilTx
+    standardmäßig eine Stunde, damit sich Schätzung und Selbstauskunft der
+    Nodes direkt vergleichen lassen. Die Uhr ist der jüngste rxTime-Wert,
+    Zeiten ohne Verbindung aus outages zählen nicht zum Fenster.
+    """
+
+    def __init__(self, preset: str = 'LONG_FAST', window: float = 3600.0,
+                 bucket: float = 60.0, outages: Optional[OutageLog] = None) -> None:
+        if preset not in MODEM_PRESETS:
+            raise ValueError(f"Unknown modem preset '{preset}'")
+        self.preset = preset
+        self.outages = outages
+        self.bandwidth, self.spreading_factor, self.coding_rate = MODEM_PRESETS[preset]
+        self.bucket = bucket
+        self.buckets = max(1, math.ceil(window / bucket))
+        self.window = self.buckets * bucket
+
+        self.history: deque = deque()
+        self.total = AirtimeBucket(-1)
+        self.now = 0.0
+        self.first_seen: Optional[float] = None
+        # Sendedauer je Paketlänge, es gibt höchstens MAX_PAYLOAD_BYTES verschiedene
+        self.durations: Dict[int, float] = {}
+
+    def airtime(self, packet: Packet) -> float:
+        length = packet_length(packet)
+        duration = self.durations.get(length)
+        if duration is None:
+            duration = self.durations[length] = time_on_air(
+                length, self.bandwidth, self.spreading_factor, self.coding_rate)
+        return duration
+
+    def add_packets(self, packets: Iterable[Packet]) -> None:
+        for packet in packets:
+            self.add_packet(packet)
+
+    def add_packet(self, packet: Packet) -> None:
+        self.now = max(self.now, packet.rxTime)
+        if self.first_seen is None:
+            self.first_seen = packet.rxTime
+
+        index = math.floor(packet.rxTime / self.bucket)
+        if not self.history or self.history[-1].index < index:
+            self.history.append(AirtimeBucket(index))
+
+        duration = self.airtime(packet)
+        channel = packet.channel or 0
+        for bucket in (self.history[-1], self.total):
+            bucket.total += duration
+            bucket.nodes[packet.nodeFrom] += duration
+            bucket.channels[channel] += duration
+        self.expire()
+
+    def expire(self) -> None:
+        oldest = math.floor(self.now / self.bucket) - self.buckets + 1
+        while self.history and self.history[0].index < oldest:
+            bucket = self.history.popleft()
+            self.total.total -= bucket.total
+            self.total.nodes.subtract(bucket.nodes)
+            self.total.channels.subtract(bucket.channels)
+            # Nodes ohne Sendezeit im Fenster nicht weiter mitführen
+            for num in bucket.nodes:
+                if self.total.nodes[num] <= 1e-9:
+                    del self.total.nodes[num]
+
+    def span(self) -> float:
+        if self.first_seen is None:
+            return self.window
+        span = min(self.window, max(self.now - self.first_seen, self.bucket))
+        if self.outages:
+            # Während eines Ausfalls wurde nichts gehört, das ist keine freie Sendezeit
+            span = max(span - self.outages.downtime(self.now - span, self.now), self.bucket)
+        return span
+
+    def node_airtime(self, num: int) -> float:
+        """Geschätzte Sendezeit eines Nodes im Fenster in Sekunden"""
+        self.expire()
+        return self.total.nodes.get(num, 0.0)
+
+    def node_utilization(self, num: int) -> float:
+        """Anteil der Sendezeit eines Nodes am Fenster in Prozent, vergleichbar mit airUtilTx"""
+        return self.node_airtime(num) / self.span() * 100
+
+    def channel_utilization(self, channel: Optional[int] = None) -> float:
+        """Belegung eines Kanals (None = alle) durch alle empfangenen Pakete in Prozent"""
+        self.expire()
+        airtime = self.total.total if channel is None else self.total.channels.get(channel, 0.0)
+        return airtime / self.span() * 100
+
+    def top_nodes(self, count: int = 5) -> List[Tuple[int, float]]:
+        """Nodes mit der meisten Sendezeit als (Node-Nummer, Prozent)"""
+        self.expire()
+        span = self.span()
+        return [(num, airtime / span * 100) for num, airtime in self.total.nodes.most_common(count)]
+
+    def node_histogram(self, num: int) -> List[float]:
+        """Sendezeit eines Nodes je Zeitabschnitt, ältester zuerst, leere Abschnitte als 0"""
+        self.expire()
+        first = math.floor(self.now / self.bucket) - self.buckets + 1
+        histogram = [0.0] * self.buckets
+        for bucket in self.history:
+            histogram[bucket.index - first] = bucket.nodes.get(num, 0.0)
+        return histogram
+
+    def channel_histogram(self, channel: int = 0) -> List[float]:
+        """Sendezeit eines Kanals je Zeitabschnitt, ältester zuerst, leere Abschnitte als 0"""
+        self.expire()
+        first = math.floor(self.now / self.bucket) - self.buckets + 1
+        histogram = [0.0] * self.buckets
+        for bucket in self.history:
+            histogram[bucket.index - first] = bucket.channels.get(channel, 0.0)
+        return histogram
@@ -0,0 +1,80 @@
+import base64
+import json
+import struct
+import threading
+import time
+import zlib
+from typing import Any, BinaryIO, Iterator, Tuple
+
+MAGIC = b"MTMCAP\x01\n"
+
+# Datensatzkopf: Typ, Zeitpunkt der Aufnahme (Epoch-Sekunden), Länge der Nutzdaten
+RECORD_HEADER = struct.Struct("<BdI")
+
+RECORD_PACKET = 1
+RECORD_NODES = 2
+
+
+def encode_value(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    # Protobuf-Objekte wie 'raw' lassen sich nicht sinnvoll speichern
+    return None
+
+
+def decode_value(value: dict) -> Any:
+    if "__bytes__" in value and len(value) == 1:
+        return base64.b64decode(value["__bytes__"])
+    return value
+
+
+class CaptureWriter:
+    """Schreibt Pakete und NodeDB-Stände mit Zeitstempel in eine Capture-Datei
+
+    Die Datei wird nur angehängt. Jeder Datensatz ist einzeln zlib-komprimiertes
+    JSON, ein abgebrochener Mitschnitt bleibt bis zum letzten Datensatz lesbar.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file: BinaryIO = open(path, "ab")
+        self.lock = threading.Lock()
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+
+    def write_packet(self, packet: dict) -> None:
+        self.write(RECORD_PACKET, packet)
+
+    def write_nodes(self, nodes: dict) -> None:
+        self.write(RECORD_NODES, nodes)
+
+    def write(self, record_type: int, data: dict) -> None:
+        payload = zlib.compress(json.dumps(data, default=encode_value, separators=(",", ":")).encode())
+        with self.lock:
+            self.file.write(RECORD_HEADER.pack(record_type, time.time(), len(payload)))
+            self.file.write(payload)
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+
+class CaptureReader:
+    def __init__(self, path: str) -> None:
+        self.file: BinaryIO = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a capture file")
+
+    def __iter__(self) -> Iterator[Tuple[int, float, dict]]:
+        while True:
+            header = self.file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            record_type, timestamp, length = RECORD_HEADER.unpack(header)
+            payload = self.file.read(length)
+            if len(payload) < length:
+                return  # Unvollständiger letzter Datensatz
+            yield record_type, timestamp, json.loads(zlib.decompress(payload), object_hook=decode_value)
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,176 @@
+import logging
+import queue
+import sqlite3
+import threading
+from typing import List
+
+from app.utilities.NodeInfo import NodeInfo
+from app.utilities.Packet import Packet
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS packets (
+    rowid INTEGER PRIMARY KEY,
+    {', '.join(Packet.FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS packets_rxTime ON packets (rxTime);
+CREATE INDEX IF NOT EXISTS packets_fromId ON packets (fromId);
+CREATE INDEX IF NOT EXISTS packets_toId ON packets (toId);
+CREATE INDEX IF NOT EXISTS packets_portnum ON packets (portnum);
+
+CREATE TABLE IF NOT EXISTS nodes (
+    num INTEGER PRIMARY KEY,
+    id TEXT,
+    longName TEXT,
+    shortName TEXT,
+    hwModel TEXT,
+    latitude REAL,
+    longitude REAL,
+    altitude INTEGER,
+    snr REAL,
+    lastHeard REAL,
+    hopsAway INTEGER,
+    batteryLevel INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS outages (
+    receiver TEXT,
+    start REAL,
+    end REAL
+);
+"""
+
+
+class CaptureStore:
+    """Speichert Pakete und Nodes dauerhaft in einer SQLite-Datenbank
+
+    Schreiben passiert in einem eigenen Thread, der die Warteschlange in
+    Transaktionen von bis zu batch_size Einträgen abarbeitet. Lesende Zugriffe
+    öffnen eine eigene Verbindung, im WAL-Modus blockieren sie den Writer nicht.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.reader = None
+
+        # Schema im aufrufenden Thread anlegen, damit Fehler sofort auffallen
+        connection = self.open_connection()
+        connection.executescript(SCHEMA)
+        self.migrate(connection)
+        connection.close()
+
+        self.writer = threading.Thread(target=self.write_loop, name="CaptureStore", daemon=True)
+        self.writer.start()
+
+    @staticmethod
+    def migrate(connection: sqlite3.Connection) -> None:
+        """Ergänzt Spalten, die in Datenbanken älterer Versionen fehlen"""
+        existing = {row[1] for row in connection.execute("PRAGMA table_info(packets)")}
+        with connection:
+            for column in Packet.FIELDS:
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE packets ADD COLUMN {column}")
+
+    def open_connection(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def add_packets(self, packets: List[Packet]) -> None:
+        self.queue.put(('packets', [packet.to_row() for packet in packets]))
+
+    def add_node(self, node_info: NodeInfo) -> None:
+        self.add_nodes([node_info])
+
+    def add_nodes(self, nodes: List[NodeInfo]) -> None:
+        self.queue.put(('nodes', [self.node_row(node_info) for node_info in nodes]))
+
+    def add_outage(self, receiver: str, start: float, end: float) -> None:
+        """Zeitraum, in dem ein Funkgerät nicht verbunden war"""
+        self.queue.put(('outages', [(receiver, start, end)]))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.writer.join()
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+    def write_loop(self) -> None:
+        connection = self.open_connection()
+        running = True
+        while running:
+            items = [self.queue.get()]
+            # Alles einsammeln was bereits wartet, höchstens batch_size Einträge
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            packets = []
+            nodes = []
+            outages = []
+            for item in items:
+                if item is None:
+                    running = False
+                elif item[0] == 'packets':
+                    packets.extend(item[1])
+                elif item[0] == 'outages':
+                    outages.extend(item[1])
+                else:
+                    nodes.extend(item[1])
+
+            try:
+                with connection:
+                    if packets:
+                        connection.executemany(
+                            f"INSERT INTO packets ({', '.join(Packet.FIELDS)}) "
+                            f"VALUES ({', '.join('?' * len(Packet.FIELDS))})",
+                            packets
+                        )
+                    if nodes:
+                        connection.executemany(
+                            "INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            nodes
+                        )
+                    if outages:
+                        connection.executemany("INSERT INTO outages VALUES (?, ?, ?)", outages)
+            except sqlite3.Error as e:
+                logging.error(f"Error writing capture store: {str(e)}")
+
+        connection.close()
+
+    @staticmethod
+    def node_row(node_info: NodeInfo) -> tuple:
+        return (
+            node_info.num, node_info.user.id, node_info.user.longName, node_info.user.shortName,
+            node_info.user.hwModel, node_info.position.latitude, node_info.position.longitude,
+            node_info.position.altitude, node_info.snr, node_info.lastHeard, node_info.hopsAway,
+            node_info.deviceMetrics.batteryLevel,
+        )
+
+    def read_connection(self) -> sqlite3.Connection:
+        if self.reader is None:
+            self.reader = self.open_connection()
+        return self.reader
+
+    def count_packets(self, where: str = "", params: tuple = ()) -> int:
+        sql = "SELECT COUNT(*) FROM packets" + (f" WHERE {where}" if where else "")
+        return self.read_connection().execute(sql, params).fetchone()[0]
+
+    def fetch_packets(self, offset: int, limit: int, where: str = "", params: tuple = ()) -> List[Packet]:
+        """Liefert eine Seite von Paketen in Empfangsreihenfolge"""
+        columns = ', '.join(Packet.FIELDS)
+        if where:
+            sql = f"SELECT {columns} FROM packets WHERE {where} ORDER BY rowid LIMIT ? OFFSET ?"
+            params = params + (limit, offset)
+        else:
+            # Die Tabelle wird nur angehängt, rowid ist daher lückenlos und
+            # der Primärschlüssel ersetzt das teure OFFSET
+            sql = f"SELECT {columns} FROM packets WHERE rowid > ? ORDER BY rowid LIMIT ?"
+            params = (offset, limit)
+        rows = self.read_connection().execute(sql, params).fetchall()
+        return [Packet.from_row(row) for row in rows]
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.utilities.AppConfig import AppConfig
+
+KINDS = ('serial', 'ble')
+
+
+class DeviceDiscovery(QObject):
+    """Sucht serielle Ports und BLE-Funkgeräte im Hintergrund
+
+    Jede Suche läuft in einem eigenen Thread und meldet Geräte einzeln über
+    device_found, sobald sie gefunden werden. Das Ergebnis einer Suche gilt
+    ttl Sekunden, bis dahin liefert cached() es ohne neue Suche. Es gibt eine
+    Instanz für die ganze Anwendung, damit der Cache den Dialog überlebt.
+    """
+    # Art ('serial' oder 'ble'), Adresse, Beschreibung
+    device_found = pyqtSignal(str, str, str)
+    # Art, Fehlermeldung oder leer
+    scan_finished = pyqtSignal(str, str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'DeviceDiscovery':
+        if cls._instance is None:
+            config = AppConfig().load()
+            cls._instance = cls(ttl=config.getfloat('discovery', 'ttl_s', fallback=60),
+                                ble_timeout=config.getfloat('discovery', 'ble_timeout_s', fallback=10))
+        return cls._instance
+
+    def __init__(self, ttl: float = 60.0, ble_timeout: float = 10.0, parent=None) -> None:
+        super().__init__(parent)
+        self.ttl = ttl
+        self.ble_timeout = ble_timeout
+        self.lock = threading.Lock()
+        # Art -> Adresse -> Beschreibung, Stand der letzten abgeschlossenen Suche
+        self.devices: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        # Art -> Zeitpunkt (monotonic) der letzten erfolgreichen Suche
+        self.scanned: Dict[str, float] = {}
+        # Art -> während der laufenden Suche gefundene Geräte
+        self.scanning: Dict[str, Dict[str, str]] = {}
+
+    def cached(self, kind: str) -> List[Tuple[str, str]]:
+        """Bekannte Geräte als (Adresse, Beschreibung), während einer Suche ergänzt um die neuen"""
+        with self.lock:
+            devices = dict(self.devices[kind])
+            devices.update(self.scanning.get(kind, {}))
+        return sorted(devices.items())
+
+    def is_fresh(self, kind: str) -> bool:
+        scanned = self.scanned.get(kind)
+        return scanned is not None and time.monotonic() - scanned < self.ttl
+
+    def is_scanning(self, kind: str) -> bool:
+        return kind in self.scanning
+
+    def discover(self, kind: str, force: bool = False) -> bool:
+        """Startet eine Suche, außer der Cache ist noch gültig, True wenn eine Suche läuft"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown device kind '{kind}'")
+        with self.lock:
+            if kind in self.scanning:
+                return True
+            if not force and self.is_fresh(kind):
+                return False
+            self.scanning[kind] = {}
+
+        threading.Thread(target=self.scan, args=(kind,), name=f"DeviceDiscovery {kind}",
+                         daemon=True).start()
+        return True
+
+    def scan(self, kind: str) -> None:
+        error = ""
+        try:
+            if kind == 'serial':
+                self.scan_serial()
+            else:
+                asyncio.run(self.scan_ble())
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logging.error(f"Error scanning for {kind} devices: {error}")
+
+        with self.lock:
+            found = self.scanning.pop(kind)
+            if not error:
+                self.devices[kind] = found
+                self.scanned[kind] = time.monotonic()
+        self.scan_finished.emit(kind, error)
+
+    def found(self, kind: str, address: str, description: str) -> None:
+        with self.lock:
+            devices = self.scanning[kind]
+            if address in devices:
+                return
+            devices[address] = description
+        self.device_found.emit(kind, address, description)
+
+    def scan_serial(self) -> None:
+        import serial.tools.list_ports
+
+        for port in serial.tools.list_ports.comports():
+            self.found('serial', port.device, port.description or "")
+
+    async def scan_ble(self) -> None:
+        # Wie BLEInterface.scan(), aber jedes Gerät wird gemeldet, sobald es sich zeigt
+        from bleak import BleakScanner
+        from meshtastic.ble_interface import SERVICE_UUID
+
+        def detected(device, advertisement) -> None:
+            # bleak meldet gelegentlich auch Geräte ohne den angefragten Dienst
+            if SERVICE_UUID in advertisement.service_uuids:
+                self.found('ble', device.address, device.name or "")
+
+        async with BleakScanner(detected, service_uuids=[SERVICE_UUID]):
+            await asyncio.sleep(self.ble_timeout)
@@ -0,0 +1,283 @@
+import re
+from typing import Any, Callable, Iterable, List, Optional, Set
+
+# Filterausdrücke im Stil von Wireshark, zum Beispiel:
+#   portnum == TELEMETRY_APP && rxSnr < -10
+#   fromId in {!a1b2c3d4, !0badc0de} || text contains "hello"
+#   !(hops > 2) and channel == 0
+
+# Name im Filter -> Spalte im Ringpuffer des PacketTableModel
+FIELDS = {
+    'id': 'id',
+    'from': 'nodeFrom',
+    'nodeFrom': 'nodeFrom',
+    'fromId': 'fromId',
+    'to': 'nodeTo',
+    'nodeTo': 'nodeTo',
+    'toId': 'toId',
+    'portnum': 'portnum',
+    'text': 'text',
+    'rxTime': 'rxTime',
+    'rxSnr': 'rxSnr',
+    'snr': 'rxSnr',
+    'rxRssi': 'rxRssi',
+    'rssi': 'rxRssi',
+    'channel': 'channel',
+    'wantAck': 'wantAck',
+    'hopLimit': 'hopLimit',
+    'hopStart': 'hopStart',
+    'pkiEncrypted': 'pkiEncrypted',
+    'nextHop': 'nextHop',
+    'relayNode': 'relayNode',
+    'relay': 'relayNode',
+    'receiver': 'receiver',
+    'receptions': 'receptions',
+    'heard': 'heard',
+}
+
+NUMERIC_FIELDS = {'id', 'nodeFrom', 'nodeTo', 'rxTime', 'rxSnr', 'rxRssi', 'channel',
+                  'hopLimit', 'hopStart', 'nextHop', 'relayNode', 'hops', 'heard'}
+
+# Spalten, für die PacketTableModel einen Index Wert -> laufende Nummern führt
+INDEXED_FIELDS = ('fromId', 'toId', 'portnum')
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<nodeid>![0-9a-fA-F]{8}(?![^\s=!<>&|(){},"]))
+      | (?P<op>==|!=|<=|>=|<|>|&&|\|\||!|\(|\)|\{|\}|,)
+      | "(?P<string>(?:[^"\\]|\\.)*)"
+      | (?P<word>[^\s=!<>&|(){},"]+)
+    )""", re.VERBOSE)
+
+KEYWORDS = {'and': '&&', 'or': '||', 'not': '!', 'in': 'in', 'contains': 'contains'}
+
+COMPARISONS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a is not None and a < b,
+    '<=': lambda a, b: a is not None and a <= b,
+    '>': lambda a, b: a is not None and a > b,
+    '>=': lambda a, b: a is not None and a >= b,
+}
+
+# Ein Prädikat bekommt eine Funktion, die zu einem Spaltennamen den Wert der Zeile liefert
+Getter = Callable[[str], Any]
+Predicate = Callable[[Getter], bool]
+
+
+class FilterError(ValueError):
+    pass
+
+
+class DisplayFilter:
+    """Übersetzt einen Filterausdruck einmalig in ein Python-Prädikat
+
+    Vergleiche werden mit den typisierten Spaltenwerten ausgeführt, nicht mit
+    Anzeigetexten. candidates() nutzt die Indizes des Modells für Vergleiche
+    auf INDEXED_FIELDS, damit das Prädikat nur für Zeilen ausgewertet wird, die
+    überhaupt passen können. Besucht wird trotzdem jede Zeile.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = self.tokenize(expression)
+        self.position = 0
+        if not self.tokens:
+            raise FilterError("Empty filter")
+        self.tree = self.parse_or()
+        if self.position < len(self.tokens):
+            raise FilterError(f"Unexpected '{self.tokens[self.position][1]}'")
+        self.predicate = self.compile(self.tree)
+
+    def __call__(self, get: Getter) -> bool:
+        return self.predicate(get)
+
+    @staticmethod
+    def tokenize(expression: str) -> List[tuple]:
+        tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                raise FilterError(f"Invalid character at position {position}")
+            position = match.end()
+            if match.group('nodeid'):
+                tokens.append(('word', match.group('nodeid')))
+            elif match.group('op'):
+                tokens.append(('op', match.group('op')))
+            elif match.group('string') is not None:
+                tokens.append(('value', re.sub(r'\\(.)', r'\1', match.group('string'))))
+            else:
+                word = match.group('word')
+                keyword = KEYWORDS.get(word.lower())
+                tokens.append(('op', keyword) if keyword else ('word', word))
+        return tokens
+
+    # Parser (rekursiver Abstieg), erzeugt Tupel als Syntaxbaum
+
+    def peek(self) -> Optional[tuple]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def accept(self, op: str) -> bool:
+        if self.peek() == ('op', op):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, op: str) -> None:
+        if not self.accept(op):
+            raise FilterError(f"Expected '{op}'")
+
+    def parse_or(self) -> tuple:
+        nodes = [self.parse_and()]
+        while self.accept('||'):
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and(self) -> tuple:
+        nodes = [self.parse_not()]
+        while self.accept('&&'):
+            nodes.append(self.parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_not(self) -> tuple:
+        if self.accept('!'):
+            return 'not', self.parse_not()
+        if self.accept('('):
+            node = self.parse_or()
+            self.expect(')')
+            return node
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> tuple:
+        token = self.peek()
+        if token is None or token[0] != 'word':
+            raise FilterError("Expected a field name")
+        self.position += 1
+
+        name = token[1]
+        if name != 'hops' and name not in FIELDS:
+            raise FilterError(f"Unknown field '{name}'")
+        field = FIELDS.get(name, name)
+
+        token = self.peek()
+        if token is None or token[0] != 'op' or token[1] in ('&&', '||', ')'):
+            return 'exists', field
+        self.position += 1
+        op = token[1]
+
+        if op == 'in':
+            self.expect('{')
+            values = [self.parse_value(field)]
+            while self.accept(','):
+                values.append(self.parse_value(field))
+            self.expect('}')
+            return 'in', field, frozenset(values)
+        if op == 'contains':
+            return 'contains', field, str(self.parse_value(None))
+        if op in COMPARISONS:
+            value = self.parse_value(field)
+            if value is None and op not in ('==', '!='):
+                # Mit None lässt sich nur auf Gleichheit vergleichen
+                raise FilterError(f"'{op}' needs a value, not none")
+            return 'compare', field, op, value
+        raise FilterError(f"Unexpected '{op}'")
+
+    def parse_value(self, field: Optional[str]) -> Any:
+        token = self.peek()
+        if token is None or token[0] == 'op':
+            raise FilterError("Expected a value")
+        self.position += 1
+        kind, text = token
+
+        if kind == 'word' and text.lower() in ('none', 'null'):
+            return None
+        if kind == 'word' and text.lower() in ('true', 'false'):
+            return text.lower() == 'true'
+        if field in NUMERIC_FIELDS:
+            try:
+                return float(int(text, 0)) if re.fullmatch(r"0[xX][0-9a-fA-F]+", text) else float(text)
+            except ValueError as e:
+                raise FilterError(f"'{text}' is not a number") from e
+        return text
+
+    # Übersetzung des Syntaxbaums in verschachtelte Closures
+
+    def compile(self, node: tuple) -> Predicate:
+        kind = node[0]
+        if kind == 'or':
+            parts = [self.compile(child) for child in node[1]]
+            return lambda get: any(part(get) for part in parts)
+        if kind == 'and':
+            parts = [self.compile(child) for child in node[1]]
+            return lambda get: all(part(get) for part in parts)
+        if kind == 'not':
+            part = self.compile(node[1])
+            return lambda get: not part(get)
+
+        value_of = self.value_getter(node[1])
+        if kind == 'exists':
+            return lambda get: bool(value_of(get))
+        if kind == 'in':
+            values = node[2]
+            return lambda get: value_of(get) in values
+        if kind == 'contains':
+            needle = node[2].lower()
+            return lambda get: needle in str(value_of(get) or '').lower()
+
+        compare = COMPARISONS[node[2]]
+        value = node[3]
+        if value is None or node[1] not in NUMERIC_FIELDS:
+            return lambda get: compare(value_of(get), value)
+        # Zahlen typgleich vergleichen, None (fehlender Wert) erfüllt keinen Vergleich außer !=
+        return lambda get: compare(as_float(value_of(get)), value)
+
+    @staticmethod
+    def value_getter(field: str) -> Callable[[Getter], Any]:
+        if field == 'hops':
+            def hops(get: Getter) -> Optional[int]:
+                hop_start, hop_limit = get('hopStart'), get('hopLimit')
+                if hop_start is None or hop_limit is None:
+                    return None
+                return hop_start - hop_limit
+            return hops
+        return lambda get: get(field)
+
+    def candidates(self, lookup: Callable[[str, Any], Iterable[int]]) -> Optional[Set[int]]:
+        """Laufende Nummern, die der Filter höchstens treffen kann, oder None ohne Index
+
+        lookup(field, value) liefert die laufenden Nummern aller Zeilen mit diesem Wert.
+        """
+        return self.node_candidates(self.tree, lookup)
+
+    def node_candidates(self, node: tuple, lookup) -> Optional[Set[int]]:
+        kind = node[0]
+        if kind == 'and':
+            sets = [s for s in (self.node_candidates(child, lookup) for child in node[1]) if s is not None]
+            if not sets:
+                return None
+            sets.sort(key=len)
+            return sets[0].intersection(*sets[1:])
+        if kind == 'or':
+            sets = [self.node_candidates(child, lookup) for child in node[1]]
+            if any(s is None for s in sets):
+                return None
+            return set().union(*sets)
+        if kind == 'compare' and node[2] == '==' and node[1] in INDEXED_FIELDS:
+            return set(lookup(node[1], node[3]))
+        if kind == 'in' and node[1] in INDEXED_FIELDS:
+            result = set()
+            for value in node[2]:
+                result.update(lookup(node[1], value))
+            return result
+        return None
+
+
+def as_float(value: Any) -> Optional[float]:
+    """Zahl oder None, auch für Werte wie 'Unknown' in Node-Nummern"""
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class DuplicateTracker:
+    """Zeitlich begrenzter LRU-Speicher für bereits gesehene Pakete
+
+    Hält zu jedem Schlüssel, zum Beispiel (fromId, id), einen Wert und den
+    Zeitpunkt des letzten Empfangs. Einträge, die länger als window Sekunden
+    nicht mehr gehört wurden, fallen heraus, ebenso die am längsten nicht
+    gehörten, sobald capacity erreicht ist. Der Speicherbedarf bleibt damit
+    unabhängig vom Verkehr konstant.
+    """
+
+    def __init__(self, window: float = 600.0, capacity: int = 10000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.window = window
+        self.capacity = capacity
+        # Schlüssel -> (letzter Empfang, Wert), ältester Empfang vorne
+        self.entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, now: float) -> Optional[Any]:
+        """Wert eines noch nicht abgelaufenen Schlüssels, ein Treffer frischt ihn auf"""
+        self.expire(now)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries[key] = (max(now, entry[0]), entry[1])
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, now: float) -> None:
+        self.entries[key] = (now, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def expire(self, now: float) -> None:
+        oldest = now - self.window
+        while self.entries:
+            seen, _ = next(iter(self.entries.values()))
+            if seen >= oldest:
+                break
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
@@ -0,0 +1,97 @@
+import dataclasses
+import json
+import logging
+import threading
+from typing import List, Optional, TextIO
+
+from app.utilities.CaptureFile import encode_value
+from app.utilities.CaptureStore import CaptureStore
+from app.utilities.NodeInfo import NodeInfo
+from app.utilities.Packet import Packet
+from app.utilities.ReplayInterface import ReplayInterface
+from app.utilities.Session import Session
+
+
+class HeadlessCollector:
+    """Sammelt Pakete und Nodes eines Funkgeräts ohne Qt
+
+    Schreibt in einen CaptureStore und/oder als JSON Lines, eine Zeile je Paket
+    ({"type": "packet", ...} mit den Spalten aus Packet.FIELDS) oder Node
+    ({"type": "node", ...}). Verbindung und Parsen übernimmt dieselbe Session
+    wie in der Oberfläche, einschließlich Wiederverbinden. Ausfälle werden als
+    {"type": "outage", "receiver", "start", "end"} bzw. in der Tabelle outages
+    festgehalten.
+    """
+
+    def __init__(self, capture: Optional[str] = None, output: Optional[TextIO] = None,
+                 batch_interval: float = 0.25, batch_size: int = 500,
+                 reconnect: Optional[dict] = None) -> None:
+        self.store = CaptureStore(capture) if capture else None
+        self.output = output
+        # Pakete kommen aus dem Session-Thread, Nodes aus dem Thread des Geräts
+        self.lock = threading.Lock()
+        self.packets = 0
+        self.finished = threading.Event()
+        self.session = Session(batch_interval=batch_interval, batch_size=batch_size,
+                               on_packets=self.add_packets, on_node=self.add_node,
+                               on_status=self.connection_status,
+                               on_outage=self.add_outage, **(reconnect or {}))
+
+    def add_packets(self, packets: List[Packet]) -> None:
+        if self.store:
+            self.store.add_packets(packets)
+        if self.output:
+            lines = [json.dumps({'type': 'packet', **dict(zip(Packet.FIELDS, packet.to_row()))},
+                                default=encode_value) for packet in packets]
+            self.write(lines)
+        self.packets += len(packets)
+
+    def add_node(self, node_info: NodeInfo) -> None:
+        if self.store:
+            self.store.add_node(node_info)
+        if self.output:
+            self.write([json.dumps({'type': 'node', **dataclasses.asdict(node_info)},
+                                   default=encode_value)])
+
+    def add_outage(self, receiver: str, start: float, end: float) -> None:
+        if self.store:
+            self.store.add_outage(receiver, start, end)
+        if self.output:
+            self.write([json.dumps({'type': 'outage', 'receiver': receiver,
+                                    'start': start, 'end': end})])
+
+    def write(self, lines: List[str]) -> None:
+        with self.lock:
+            self.output.write("\n".join(lines) + "\n")
+            self.output.flush()
+
+    def connection_status(self, connected: bool, message: str) -> None:
+        # Während des Wiederverbindens läuft die Session weiter
+        if not connected and not self.session.running:
+            self.finished.set()
+
+    def run(self, connection_type: str, port: str = '', host: str = '', addr: str = '',
+            file: Optional[str] = None, speed: float = 1.0, record: Optional[str] = None,
+            options: Optional[dict] = None, name: Optional[str] = None) -> int:
+        """Sammelt bis stop(), Verbindungsfehler oder Ende einer Aufnahme, 0 bei Erfolg"""
+        self.session.connect(connection_type=connection_type, port=port, host=host, addr=addr,
+                             file=file, speed=speed, record=record, options=options, name=name)
+        try:
+            while not self.finished.wait(0.5):
+                interface = self.session.interface
+                if isinstance(interface, ReplayInterface) and interface.finished:
+                    break
+                if not self.session.isRunning():
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            failed = not self.session.running
+            self.session.disconnect()
+            if self.store:
+                self.store.close()
+        logging.info(f"Collected {self.packets} packets from {self.session.name}")
+        return 1 if failed else 0
+
+    def stop(self) -> None:
+        self.finished.set()
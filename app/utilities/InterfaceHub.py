@@ -0,0 +1,219 @@
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from app.utilities.Interface import Interface
+from app.utilities.NodeInfo import NodeInfo
+from app.utilities.OutageLog import OutageLog
+from app.utilities.Packet import Packet
+
+
+@dataclass(slots=True)
+class MergedPacket:
+    """Ein Paket und sein Empfang durch die einzelnen Funkgeräte"""
+    packet: Packet
+    arrived: float
+    receptions: Dict[str, Tuple[float, int]] = field(default_factory=dict)
+    emitted: bool = False
+
+
+def format_receptions(receptions: Dict[str, Tuple[float, int]]) -> str:
+    return ", ".join(f"{name} {snr:g}/{rssi}" for name, (snr, rssi) in receptions.items())
+
+
+class InterfaceHub(QObject):
+    """Mehrere gleichzeitig verbundene Funkgeräte als ein Paketstrom
+
+    Bietet dieselben Signale wie Interface. Dasselbe Paket (Absender und id)
+    von mehreren Funkgeräten wird innerhalb von dedupe_window Sekunden nur einmal
+    weitergegeben, mit dem besten Empfang in rxSnr/rxRssi und allen Empfängen in
+    receptions. Sind mehrere Funkgeräte verbunden, wartet ein neues Paket dafür
+    merge_delay Sekunden auf die Kopien der anderen. Wiederholungen beim selben
+    Funkgerät (Rebroadcasts) bleiben eigene Pakete.
+
+    Verlorene Verbindungen baut jede Sitzung selbst wieder auf (reconnect).
+    outages enthält die Zeiträume, in denen kein einziges Funkgerät verbunden
+    war, die Statistiken rechnen diese Lücken aus ihren Raten heraus.
+    """
+    node_discovered = pyqtSignal(NodeInfo)
+    packets_received = pyqtSignal(list)
+    connection_status = pyqtSignal(bool, str)
+    outage_recorded = pyqtSignal(str, float, float)
+
+    def __init__(self, batch_interval: float = 0.25, batch_size: int = 500,
+                 merge_delay: float = 1.0, dedupe_window: float = 60.0,
+                 reconnect: Optional[dict] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        # Schlüsselwortargumente für Interface, z.B. reconnect_delay
+        self.reconnect = reconnect or {}
+        self.outages = OutageLog()
+        self.merge_delay = merge_delay
+        self.dedupe_window = dedupe_window
+        self.sessions: List[Interface] = []
+
+        # (nodeFrom, id) -> MergedPacket in Reihenfolge des ersten Empfangs
+        self.seen: OrderedDict = OrderedDict()
+        self.pending: deque = deque()
+        self.duplicates = 0
+        # Node-Nummer -> Name des Funkgeräts -> NodeInfo aus dessen NodeDB
+        self.nodes: Dict[int, Dict[str, NodeInfo]] = {}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(merge_delay * 500)))
+        self.timer.timeout.connect(self.flush)
+
+    @property
+    def running(self) -> bool:
+        return any(session.running for session in self.sessions)
+
+    @property
+    def local_num(self) -> Optional[int]:
+        """Node-Nummer des ersten Funkgeräts, das sie kennt"""
+        return next((session.local_num for session in self.sessions if session.local_num), None)
+
+    def connect(self, connection_type: str, port: str, host: str, addr: str,
+                file: Optional[str] = None, speed: float = 1.0, record: Optional[str] = None,
+                options: Optional[dict] = None, name: Optional[str] = None) -> Interface:
+        """Verbindet ein weiteres Funkgerät, bestehende Verbindungen bleiben bestehen"""
+        target = (connection_type, port, host, addr)
+        # Mitschnitte und synthetischer Verkehr dürfen mehrfach laufen
+        for session in self.sessions if connection_type in ('serial', 'tcp', 'ble') else []:
+            if session.running and (session.type, session.port, session.host,
+                                    session.addr) == target:
+                # Läuft schon, während eines Ausfalls gleich neu versuchen statt zu warten
+                if not session.connected:
+                    logging.info(f"Reconnecting {session.name} now")
+                    session.reconnect_now()
+                return session
+
+        session = Interface(batch_interval=self.batch_interval, batch_size=self.batch_size,
+                            **self.reconnect)
+        session.packets_received.connect(self.merge_packets)
+        session.node_discovered.connect(self.merge_node)
+        session.connection_status.connect(self.connection_status)
+        session.connection_status.connect(self.update_outages)
+        session.outage_recorded.connect(self.outage_recorded)
+        self.sessions = [s for s in self.sessions if s.running or s.isRunning()] + [session]
+
+        name = name or Interface.describe(connection_type, port, host, addr, file)
+        if any(s.name == name for s in self.sessions):
+            # Gleiche Namen würden Empfänge verschiedener Funkgeräte vermischen
+            name = f"{name}#{len(self.sessions)}"
+        session.connect(connection_type=connection_type, port=port, host=host, addr=addr,
+                        file=file, speed=speed, record=record, options=options, name=name)
+        names = ', '.join(s.name for s in self.sessions)
+        logging.info(f"Monitoring {len(self.sessions)} radio(s): {names}")
+        return session
+
+    def disconnect(self) -> None:
+        for session in self.sessions:
+            if session.running:
+                session.disconnect()
+        self.flush(force=True)
+        self.outages.end(time.time())
+
+    @pyqtSlot(bool, str)
+    def update_outages(self, connected: bool, message: str) -> None:
+        """Führt outages, solange keine Sitzung verbunden ist, aber noch eine läuft"""
+        if any(session.connected for session in self.sessions):
+            self.outages.end(time.time())
+        elif self.running:
+            self.outages.begin(time.time())
+        else:
+            self.outages.end(time.time())
+
+    def merge_packets(self, packets: List[Packet]) -> None:
+        now = time.monotonic()
+        self.expire(now)
+        hold = sum(1 for session in self.sessions if session.running) > 1
+
+        packets_out = []
+        for packet in packets:
+            if not packet.id:
+                packets_out.append(packet)
+                continue
+
+            key = (packet.nodeFrom, packet.id)
+            entry = self.seen.get(key)
+            if entry is None or packet.receiver in entry.receptions:
+                entry = MergedPacket(packet, now)
+                entry.receptions[packet.receiver] = (packet.rxSnr, packet.rxRssi)
+                self.seen[key] = entry
+                self.seen.move_to_end(key)
+                if hold:
+                    self.pending.append(entry)
+                else:
+                    packets_out.append(self.finish(entry))
+                continue
+
+            # Kopie eines anderen Funkgeräts
+            self.duplicates += 1
+            entry.receptions[packet.receiver] = (packet.rxSnr, packet.rxRssi)
+            if not entry.emitted and packet.rxSnr > entry.packet.rxSnr:
+                # Der beste Empfang liefert die Werte des zusammengefassten Pakets
+                entry.packet = replace(packet, receptions=None)
+
+        self.emit_packets(packets_out)
+        if self.pending and not self.timer.isActive():
+            self.timer.start()
+
+    def finish(self, entry: MergedPacket) -> Packet:
+        entry.emitted = True
+        entry.packet.receptions = format_receptions(entry.receptions)
+        return entry.packet
+
+    def flush(self, force: bool = False) -> None:
+        """Gibt wartende Pakete weiter, deren Wartezeit abgelaufen ist"""
+        deadline = time.monotonic() - self.merge_delay
+        packets = []
+        while self.pending and (force or self.pending[0].arrived <= deadline):
+            packets.append(self.finish(self.pending.popleft()))
+        self.emit_packets(packets)
+        if not self.pending:
+            self.timer.stop()
+
+    def emit_packets(self, packets: List[Packet]) -> None:
+        if packets:
+            self.packets_received.emit(packets)
+
+    def expire(self, now: float) -> None:
+        oldest = now - self.dedupe_window
+        while self.seen:
+            entry = next(iter(self.seen.values()))
+            if entry.arrived >= oldest or not entry.emitted:
+                break
+            self.seen.popitem(last=False)
+
+    @pyqtSlot(NodeInfo)
+    def merge_node(self, node_info: NodeInfo) -> None:
+        session = self.sender()
+        name = session.name if isinstance(session, Interface) else None
+        views = self.nodes.setdefault(node_info.num, {})
+        views[name] = node_info
+        self.node_discovered.emit(self.merge_node_infos(views.values()))
+
+    @staticmethod
+    def merge_node_infos(infos: Iterable[NodeInfo]) -> NodeInfo:
+        """Fasst die NodeDB-Einträge mehrerer Funkgeräte zu einem Node zusammen
+
+        Stammdaten vom zuletzt gehörten Eintrag, die jüngste bekannte Position,
+        Hops und SNR vom nächstgelegenen Funkgerät.
+        """
+        infos = list(infos)
+        if len(infos) == 1:
+            return infos[0]
+
+        newest = max(infos, key=lambda node: node.lastHeard or 0)
+        nearest = min(infos, key=lambda node: (node.hopsAway is None, node.hopsAway or 0,
+                                               -(node.lastHeard or 0)))
+        positioned = [node for node in infos
+                      if node.position and node.position.latitude and node.position.longitude]
+        position = max(positioned, key=lambda node: node.position.time or 0).position \
+            if positioned else newest.position
+        return replace(newest, position=position, snr=nearest.snr, hopsAway=nearest.hopsAway)
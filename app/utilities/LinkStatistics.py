@@ -0,0 +1,193 @@
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from app.utilities.OutageLog import OutageLog
+from app.utilities.Packet import Packet
+
+# Auflösung der Histogramme, aus denen Perzentile geschätzt werden
+SNR_RESOLUTION = 0.5
+RSSI_RESOLUTION = 1.0
+
+
+@dataclass(slots=True)
+class LinkBucket:
+    """Empfangswerte eines Zeitabschnitts, Histogramme nur mit belegten Klassen"""
+    index: int
+    count: int = 0
+    signals: int = 0
+    snr_sum: float = 0.0
+    rssi_sum: float = 0.0
+    snr_min: float = math.inf
+    snr_max: float = -math.inf
+    rssi_min: float = math.inf
+    rssi_max: float = -math.inf
+    snr_bins: Counter = field(default_factory=Counter)
+    rssi_bins: Counter = field(default_factory=Counter)
+    hops: Counter = field(default_factory=Counter)
+
+
+@dataclass(slots=True)
+class LinkSummary:
+    packets: int
+    rate: float  # Pakete pro Minute
+    snr_mean: Optional[float] = None
+    snr_min: Optional[float] = None
+    snr_max: Optional[float] = None
+    snr_p10: Optional[float] = None
+    snr_p50: Optional[float] = None
+    snr_p90: Optional[float] = None
+    rssi_mean: Optional[float] = None
+    rssi_min: Optional[float] = None
+    rssi_max: Optional[float] = None
+    rssi_p10: Optional[float] = None
+    rssi_p50: Optional[float] = None
+    rssi_p90: Optional[float] = None
+    hops: Dict[int, int] = field(default_factory=dict)
+
+
+class NodeLinkStatistics:
+    """Gleitendes Fenster über die Pakete eines Nodes
+
+    Das Fenster besteht aus Zeitabschnitten. Summen und Histogramme des ganzen
+    Fensters werden beim Hinzufügen erhöht und beim Herausfallen eines
+    Abschnitts um dessen Werte verringert, ein Paket kostet also O(1).
+    """
+
+    def __init__(self, first_seen: float) -> None:
+        self.first_seen = first_seen
+        self.buckets: deque = deque()
+        self.total = LinkBucket(-1)
+
+    def add(self, index: int, snr: Optional[float], rssi: Optional[float],
+            hops: Optional[int]) -> None:
+        if not self.buckets or self.buckets[-1].index < index:
+            self.buckets.append(LinkBucket(index))
+        if snr is not None:
+            snr_bin = math.floor(snr / SNR_RESOLUTION)
+            rssi_bin = math.floor(rssi / RSSI_RESOLUTION)
+        # Verspätete Pakete zählen zum jüngsten Abschnitt
+        for bucket in (self.buckets[-1], self.total):
+            bucket.count += 1
+            if hops is not None:
+                bucket.hops[hops] += 1
+            if snr is None:
+                continue
+            bucket.signals += 1
+            bucket.snr_sum += snr
+            bucket.rssi_sum += rssi
+            bucket.snr_min = min(bucket.snr_min, snr)
+            bucket.snr_max = max(bucket.snr_max, snr)
+            bucket.rssi_min = min(bucket.rssi_min, rssi)
+            bucket.rssi_max = max(bucket.rssi_max, rssi)
+            bucket.snr_bins[snr_bin] += 1
+            bucket.rssi_bins[rssi_bin] += 1
+
+    def expire(self, oldest: int) -> None:
+        """Entfernt alle Abschnitte vor dem Index oldest aus dem Fenster"""
+        total = self.total
+        while self.buckets and self.buckets[0].index < oldest:
+            bucket = self.buckets.popleft()
+            total.count -= bucket.count
+            total.signals -= bucket.signals
+            total.snr_sum -= bucket.snr_sum
+            total.rssi_sum -= bucket.rssi_sum
+            total.snr_bins.subtract(bucket.snr_bins)
+            total.rssi_bins.subtract(bucket.rssi_bins)
+            total.hops.subtract(bucket.hops)
+            # Minimum und Maximum lassen sich nicht abziehen, aus den Abschnitten neu bilden
+            total.snr_min = min((b.snr_min for b in self.buckets), default=math.inf)
+            total.snr_max = max((b.snr_max for b in self.buckets), default=-math.inf)
+            total.rssi_min = min((b.rssi_min for b in self.buckets), default=math.inf)
+            total.rssi_max = max((b.rssi_max for b in self.buckets), default=-math.inf)
+        if not self.buckets:
+            self.total = LinkBucket(-1)
+
+
+class LinkStatistics:
+    """Verbindungsqualität pro Node über ein gleitendes Zeitfenster
+
+    Gefüttert mit Paketen, abgefragt per Node-Nummer ohne die Pakethistorie
+    zu durchsuchen. Die Uhr ist der jüngste rxTime-Wert, damit auch
+    abgespielte Mitschnitte mit ihrer ursprünglichen Zeit ausgewertet werden.
+    Zeiten ohne Verbindung aus outages zählen nicht zur Dauer der Rate.
+    """
+
+    def __init__(self, window: float = 600.0, bucket: float = 10.0,
+                 outages: Optional[OutageLog] = None) -> None:
+        self.outages = outages
+        self.bucket = bucket
+        self.buckets = max(1, math.ceil(window / bucket))
+        self.window = self.buckets * bucket
+        self.nodes: Dict[int, NodeLinkStatistics] = {}
+        self.now = 0.0
+
+    def add_packets(self, packets: Iterable[Packet]) -> None:
+        for packet in packets:
+            self.add_packet(packet)
+
+    def add_packet(self, packet: Packet) -> None:
+        rx_time = packet.rxTime
+        self.now = max(self.now, rx_time)
+
+        node = self.nodes.get(packet.nodeFrom)
+        if node is None:
+            node = self.nodes[packet.nodeFrom] = NodeLinkStatistics(rx_time)
+
+        hops = None
+        if packet.hopStart is not None and packet.hopLimit is not None:
+            hops = packet.hopStart - packet.hopLimit
+
+        # Ohne Empfangswerte (z.B. vom lokalen Node) nur für Rate und Hops zählen
+        snr = rssi = None
+        if packet.rxRssi:
+            snr, rssi = packet.rxSnr, packet.rxRssi
+
+        index = math.floor(rx_time / self.bucket)
+        node.add(index, snr, rssi, hops)
+        node.expire(index - self.buckets + 1)
+
+    def summary(self, num: int) -> Optional[LinkSummary]:
+        """Kennzahlen eines Nodes im aktuellen Fenster oder None ohne Pakete"""
+        node = self.nodes.get(num)
+        if node is None:
+            return None
+        node.expire(math.floor(self.now / self.bucket) - self.buckets + 1)
+        total = node.total
+        if not total.count:
+            return None
+
+        span = min(self.window, max(self.now - node.first_seen, self.bucket))
+        if self.outages:
+            span = max(span - self.outages.downtime(self.now - span, self.now), self.bucket)
+        summary = LinkSummary(packets=total.count, rate=total.count * 60.0 / span,
+                              hops={hops: count for hops, count in sorted(total.hops.items())
+                                    if count > 0})
+        if total.signals:
+            summary.snr_mean = total.snr_sum / total.signals
+            summary.snr_min, summary.snr_max = total.snr_min, total.snr_max
+            summary.snr_p10, summary.snr_p50, summary.snr_p90 = percentiles(
+                total.snr_bins, SNR_RESOLUTION, total.signals)
+            summary.rssi_mean = total.rssi_sum / total.signals
+            summary.rssi_min, summary.rssi_max = total.rssi_min, total.rssi_max
+            summary.rssi_p10, summary.rssi_p50, summary.rssi_p90 = percentiles(
+                total.rssi_bins, RSSI_RESOLUTION, total.signals)
+        return summary
+
+
+def percentiles(bins: Counter, resolution: float, count: int,
+                quantiles=(0.1, 0.5, 0.9)) -> List[float]:
+    """Schätzt Perzentile aus einem Histogramm als Mitte der jeweiligen Klasse"""
+    result = []
+    seen = 0
+    targets = iter(quantiles)
+    target = next(targets)
+    for index in sorted(bins):
+        seen += bins[index]
+        while target is not None and seen >= target * count:
+            result.append((index + 0.5) * resolution)
+            target = next(targets, None)
+        if target is None:
+            break
+    return result
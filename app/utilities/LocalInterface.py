@@ -0,0 +1,45 @@
+import threading
+
+from pubsub import pub
+
+
+class LocalInterface:
+    """Gemeinsame Basis für Interfaces ohne Funkgerät (Replay, synthetischer Verkehr)
+
+    Unterklassen erzeugen in play() Pakete und NodeDB-Änderungen und melden sie
+    über dieselben pubsub-Topics wie die meshtastic-Interfaces. Der Thread
+    startet erst mit start(), nachdem die Session das Interface übernommen hat,
+    sonst gingen die ersten Meldungen an owns() vorbei verloren.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.nodes = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    @property
+    def finished(self) -> bool:
+        """Ob play() gelaufen und fertig ist"""
+        return self.thread.ident is not None and not self.thread.is_alive()
+
+    def run(self) -> None:
+        pub.sendMessage("meshtastic.connection.established", interface=self)
+        self.play()
+
+    def play(self) -> None:
+        raise NotImplementedError
+
+    def publish_packet(self, packet: dict) -> None:
+        pub.sendMessage("meshtastic.receive", packet=packet, interface=self)
+
+    def publish_node(self, node_id: str, node: dict) -> None:
+        self.nodes[node_id] = node
+        pub.sendMessage("meshtastic.node.updated", node=node, interface=self)
+
+    def close(self) -> None:
+        self.stopped.set()
+        if threading.current_thread() is not self.thread and self.thread.is_alive():
+            self.thread.join()
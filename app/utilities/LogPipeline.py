@@ -0,0 +1,159 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import List, Optional
+
+FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class RepeatFilter(logging.Filter):
+    """Lässt dieselbe Meldung höchstens einmal je interval Sekunden durch
+
+    Unterdrückte Wiederholungen werden gezählt. Sobald wieder eine Meldung
+    durchgeht (eine andere oder dieselbe nach Ablauf von interval) und spätestens
+    bei flush(), meldet ein eigener Eintrag die Anzahl, ein Fehlerschwall wird so
+    zu wenigen Zeilen. Die durchgelassenen Einträge bleiben unverändert, andere
+    Handler sehen den ursprünglichen Text.
+    """
+
+    def __init__(self, handler: logging.Handler, interval: float = 10.0,
+                 size: int = 1000) -> None:
+        super().__init__()
+        self.handler = handler
+        self.interval = interval
+        self.size = size
+        # (Logger, Level, Text) -> [Zeitpunkt der letzten Ausgabe, unterdrückte Wiederholungen]
+        self.recent: OrderedDict = OrderedDict()
+        # Schlüssel mit unterdrückten Wiederholungen, die noch nicht gemeldet wurden
+        self.pending: set = set()
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'repeat_summary', False):
+            return True
+
+        key = (record.name, record.levelno, record.getMessage())
+        summaries = []
+        with self.lock:
+            entry = self.recent.get(key)
+            if entry is not None:
+                self.recent.move_to_end(key)
+                if record.created - entry[0] < self.interval:
+                    entry[1] += 1
+                    self.pending.add(key)
+                    return False
+                entry[0] = record.created
+            else:
+                self.recent[key] = [record.created, 0]
+                if len(self.recent) > self.size:
+                    old_key, (_, suppressed) = self.recent.popitem(last=False)
+                    if suppressed:
+                        summaries.append(self.summary(old_key, suppressed))
+            summaries.extend(self.take_pending())
+
+        for summary in summaries:
+            self.handler.handle(summary)
+        return True
+
+    def take_pending(self) -> List[logging.LogRecord]:
+        """Einträge für alle noch nicht gemeldeten Wiederholungen, setzt die Zähler zurück"""
+        summaries = []
+        for key in self.pending:
+            entry = self.recent.get(key)
+            if entry and entry[1]:
+                summaries.append(self.summary(key, entry[1]))
+                entry[1] = 0
+        self.pending.clear()
+        return summaries
+
+    @staticmethod
+    def summary(key: tuple, suppressed: int) -> logging.LogRecord:
+        name, levelno, message = key
+        record = logging.LogRecord(name, levelno, "", 0, "%s (repeated %d more times)",
+                                   (message, suppressed), None)
+        record.repeat_summary = True
+        return record
+
+    def flush(self) -> None:
+        """Meldet noch offene Zählerstände, z.B. beim Beenden"""
+        with self.lock:
+            summaries = self.take_pending()
+        for summary in summaries:
+            self.handler.handle(summary)
+
+
+def add_repeat_filter(handler: logging.Handler, interval: float = 10.0) -> RepeatFilter:
+    """Drosselt Wiederholungen für einen Handler, offene Zählerstände gehen beim Beenden raus"""
+    repeat_filter = RepeatFilter(handler, interval)
+    handler.addFilter(repeat_filter)
+    atexit.register(repeat_filter.flush)
+    return repeat_filter
+
+
+class LogCollector(logging.Handler):
+    """Sammelt Meldungen für die GUI in einem begrenzten Puffer
+
+    emit() hängt nur an, die GUI holt die Meldungen mit drain() im eigenen Takt
+    ab. Bei vollem Puffer fallen die ältesten heraus, counts zählt trotzdem alle.
+    """
+
+    def __init__(self, capacity: int = 10000, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.records: deque = deque(maxlen=capacity)
+        self.counts: Counter = Counter()
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append((record.created, record.levelno, record.levelname, message))
+        self.counts[record.levelname] += 1
+
+    def drain(self) -> List[tuple]:
+        """Gibt alle gesammelten Meldungen als (created, levelno, level, message) zurück"""
+        self.acquire()
+        try:
+            records = list(self.records)
+            self.records.clear()
+        finally:
+            self.release()
+        return records
+
+
+def setup_logging(level: str = 'INFO', path: Optional[str] = None, max_bytes: int = 1048576,
+                  backups: int = 3,
+                  repeat_interval: float = 10.0) -> logging.handlers.QueueListener:
+    """Richtet das Root-Logging ein, Konsole und Datei schreibt ein eigener Thread
+
+    Aufrufer loggen nur in eine Queue und blockieren nie auf Platte oder Konsole.
+    """
+    formatter = logging.Formatter(FORMAT, DATE_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if path:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    # atexit läuft rückwärts, die letzten Zählerstände landen noch vor stop() in der Queue
+    add_repeat_filter(queue_handler, repeat_interval)
+    return listener
@@ -1,8 +1,7 @@
 from dataclasses import dataclass
-from datetime import datetime
 from typing import Optional
 
-@dataclass()
+@dataclass(slots=True)
 class NodeInfoUser:
     id: str
     longName: str
@@ -14,18 +13,18 @@ class NodeInfoUser:
     isUnmessagable: Optional[bool] = None
 
 
-@dataclass()
+@dataclass(slots=True)
 class NodeInfoPosition:
     latitudeI: Optional[int] = None
     longitudeI: Optional[int] = None
     altitude: Optional[int] = None
-    time: Optional[datetime] = None
+    time: Optional[float] = None
     locationSource: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
 
-@dataclass()
+@dataclass(slots=True)
 class NodeInfoDeviceMetrics:
     batteryLevel: Optional[int] = None
     voltage: Optional[float] = None
@@ -34,12 +33,12 @@ class NodeInfoDeviceMetrics:
     uptimeSeconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeInfo:
     num: int
     user: NodeInfoUser
     position: NodeInfoPosition
     deviceMetrics: NodeInfoDeviceMetrics
     snr: Optional[float] = None
-    lastHeard: Optional[datetime] = datetime.now()
+    lastHeard: Optional[float] = None
     hopsAway: Optional[int] = None
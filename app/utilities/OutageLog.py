@@ -0,0 +1,52 @@
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+
+class OutageLog:
+    """Zeiträume ohne Verbindung als (Beginn, Ende) in Epoch-Sekunden
+
+    Ein noch andauernder Ausfall hat das Ende None. Statistiken ziehen die
+    Ausfallzeit in ihrem Fenster mit downtime() von der beobachteten Zeit ab,
+    damit Lücken nicht als fehlender Verkehr zählen. Es werden höchstens
+    capacity Ausfälle aufbewahrt.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        self.outages: deque = deque(maxlen=capacity)
+        # Beginn wird im Verbindungs-Thread geschrieben, gelesen von der Oberfläche
+        self.lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        with self.lock:
+            return bool(self.outages) and self.outages[-1][1] is None
+
+    def begin(self, start: float) -> None:
+        with self.lock:
+            if not self.outages or self.outages[-1][1] is not None:
+                self.outages.append((start, None))
+
+    def end(self, end: float) -> Optional[Tuple[float, float]]:
+        """Beendet den laufenden Ausfall und gibt ihn zurück, None wenn keiner läuft"""
+        with self.lock:
+            if not self.outages or self.outages[-1][1] is not None:
+                return None
+            start = self.outages[-1][0]
+            self.outages[-1] = (start, max(start, end))
+            return self.outages[-1]
+
+    def downtime(self, since: float, until: float) -> float:
+        """Sekunden ohne Verbindung zwischen since und until"""
+        total = 0.0
+        with self.lock:
+            for start, end in reversed(self.outages):
+                end = until if end is None else end
+                if end <= since:
+                    break
+                total += max(0.0, min(end, until) - max(start, since))
+        return total
+
+    def windows(self) -> List[Tuple[float, Optional[float]]]:
+        with self.lock:
+            return list(self.outages)
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Sequence
 
+# Speicherbedarf (benchmarks/packet_memory.py, CPython 3.11, 64 bit):
+# ca. 410 Bytes pro Packet inklusive PacketDecoded und 16 Byte Payload, Obergrenze 450.
+# Zeitstempel sind Epoch-Sekunden, portnum/fromId/toId werden interniert.
 
-@dataclass
+
+@dataclass(slots=True)
 class PacketDecoded:
     portnum: str
     payload: str
@@ -11,7 +14,7 @@ class PacketDecoded:
     bitfield: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet:
     id: int
     nodeFrom: str
@@ -19,7 +22,7 @@ class Packet:
     nodeTo: str
     toId: str
     decoded: PacketDecoded
-    rxTime: datetime
+    rxTime: float
     rxSnr: float
     rxRssi: int
     channel: Optional[str] = None
@@ -29,4 +32,35 @@ class Packet:
     publicKey: Optional[str] = None
     pkiEncrypted: Optional[bool] = None
     nextHop: Optional[str] = None
-    relayNode: Optional[str] = None
\ No newline at end of file
+    relayNode: Optional[str] = None
+    # Empfangendes Funkgerät, bei mehreren Funkgeräten alle Empfänge als "Name SNR/RSSI, ..."
+    receiver: Optional[str] = None
+    receptions: Optional[str] = None
+
+    # Flache Spaltenreihenfolge für Ringpuffer und Capture-Store
+    FIELDS = (
+        'id', 'nodeFrom', 'fromId', 'nodeTo', 'toId',
+        'portnum', 'payload', 'text', 'bitfield',
+        'rxTime', 'rxSnr', 'rxRssi', 'channel', 'wantAck', 'hopLimit', 'hopStart',
+        'publicKey', 'pkiEncrypted', 'nextHop', 'relayNode', 'receiver', 'receptions',
+    )
+
+    def to_row(self) -> tuple:
+        return (
+            self.id, self.nodeFrom, self.fromId, self.nodeTo, self.toId,
+            self.decoded.portnum, self.decoded.payload, self.decoded.text, self.decoded.bitfield,
+            self.rxTime, self.rxSnr, self.rxRssi, self.channel, self.wantAck,
+            self.hopLimit, self.hopStart, self.publicKey, self.pkiEncrypted,
+            self.nextHop, self.relayNode, self.receiver, self.receptions,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Packet':
+        values = dict(zip(cls.FIELDS, row))
+        decoded = PacketDecoded(
+            portnum=values.pop('portnum'),
+            payload=values.pop('payload'),
+            text=values.pop('text'),
+            bitfield=values.pop('bitfield'),
+        )
+        return cls(decoded=decoded, **values)
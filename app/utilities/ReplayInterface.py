@@ -0,0 +1,61 @@
+import logging
+import time
+
+from app.utilities.CaptureFile import CaptureReader, RECORD_NODES, RECORD_PACKET
+from app.utilities.LocalInterface import LocalInterface
+
+
+class ReplayInterface(LocalInterface):
+    """Spielt eine Capture-Datei wie ein meshtastic-Interface ab
+
+    speed 1.0 entspricht Echtzeit, 10.0 zehnfacher Geschwindigkeit und 0
+    spielt ohne Pausen so schnell wie möglich ab.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        super().__init__("ReplayInterface")
+        self.path = path
+        self.speed = speed
+
+        self.reader = CaptureReader(path)
+        self.records = iter(self.reader)
+
+        # Den NodeDB-Stand vor dem ersten Paket sofort übernehmen, wie beim echten Verbindungsaufbau
+        self.pending = None
+        for record in self.records:
+            if record[0] != RECORD_NODES:
+                self.pending = record
+                break
+            self.nodes.update(record[2])
+
+    def play(self) -> None:
+        start = time.monotonic()
+        first = None
+        count = 0
+
+        record = self.pending
+        while record is not None and not self.stopped.is_set():
+            record_type, timestamp, data = record
+            if first is None:
+                first = timestamp
+
+            if self.speed > 0:
+                delay = (timestamp - first) / self.speed - (time.monotonic() - start)
+                if delay > 0 and self.stopped.wait(delay):
+                    break
+
+            if record_type == RECORD_PACKET:
+                count += 1
+                self.publish_packet(data)
+            elif record_type == RECORD_NODES:
+                for node_id, node in data.items():
+                    if self.nodes.get(node_id) != node:
+                        self.publish_node(node_id, node)
+
+            record = next(self.records, None)
+
+        logging.info(f"Replay of {self.path} finished after {count} packets")
+
+    def close(self) -> None:
+        super().close()
+        self.reader.close()
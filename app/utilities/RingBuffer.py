@@ -0,0 +1,78 @@
+from typing import Any, Iterable, Sequence
+
+
+class RingBuffer:
+    """Spaltenorientierter Ringpuffer mit fester Kapazität
+
+    Jede Spalte ist eine vorab angelegte Liste, Zeile 0 ist immer der älteste Eintrag.
+    Anhängen und Verdrängen kosten unabhängig vom Füllstand konstante Zeit.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.columns = {name: [None] * capacity for name in columns}
+        self.start = 0
+        self.size = 0
+        # Laufende Nummer des ältesten Eintrags, bleibt über Verdrängungen hinweg stabil
+        self.first_seq = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Hängt eine Zeile in Spaltenreihenfolge an, ein voller Puffer verdrängt vorher"""
+        if self.size == self.capacity:
+            self.evict(1)
+
+        index = (self.start + self.size) % self.capacity
+        for column, value in zip(self.columns.values(), row):
+            column[index] = value
+        self.size += 1
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def evict(self, count: int) -> None:
+        """Entfernt die ältesten count Zeilen"""
+        count = min(count, self.size)
+        for column in self.columns.values():
+            for i in range(count):
+                column[(self.start + i) % self.capacity] = None
+        self.start = (self.start + count) % self.capacity
+        self.size -= count
+        self.first_seq += count
+
+    def clear(self) -> None:
+        self.evict(self.size)
+
+    def value(self, row: int, column: str) -> Any:
+        return self.columns[column][(self.start + row) % self.capacity]
+
+    def set_value(self, row: int, column: str, value: Any) -> None:
+        self.columns[column][(self.start + row) % self.capacity] = value
+
+    def column_values(self, column: str) -> list:
+        """Alle Werte einer Spalte vom ältesten zum neuesten Eintrag"""
+        values = self.columns[column]
+        end = self.start + self.size
+        if end <= self.capacity:
+            return values[self.start:end]
+        return values[self.start:] + values[:end - self.capacity]
+
+    def row(self, row: int) -> dict:
+        index = (self.start + row) % self.capacity
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def seq(self, row: int) -> int:
+        return self.first_seq + row
+
+    def row_of_seq(self, seq: int) -> int:
+        """Zeile zu einer laufenden Nummer oder -1 falls bereits verdrängt"""
+        row = seq - self.first_seq
+        if 0 <= row < self.size:
+            return row
+        return -1
@@ -0,0 +1,530 @@
+import hashlib
+import logging
+import random
+import sys
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pubsub import pub
+
+from app.utilities.CaptureFile import CaptureWriter
+from app.utilities.LocalInterface import LocalInterface
+from app.utilities.NodeInfo import NodeInfo, NodeInfoUser, NodeInfoPosition, NodeInfoDeviceMetrics
+from app.utilities.OutageLog import OutageLog
+from app.utilities.Packet import Packet, PacketDecoded
+from app.utilities.ReplayInterface import ReplayInterface
+from app.utilities.SyntheticInterface import SyntheticInterface
+
+
+def ignore(*args) -> None:
+    pass
+
+
+class Session:
+    """Verbindung zu einem Funkgerät ohne Abhängigkeit von Qt
+
+    Verbindungsaufbau, pubsub-Filter, Parsen und Bündeln der Pakete. Ergebnisse
+    gehen an die Callbacks on_packets, on_node, on_status und on_outage, die
+    Interface auf seine Qt-Signale legt. Der Headless-Collector nutzt Session
+    direkt mit einem eigenen Thread.
+
+    Geht eine bestehende Verbindung verloren, baut die Session sie mit
+    exponentiell wachsender Wartezeit (reconnect_delay bis reconnect_max_delay,
+    mit Jitter) wieder auf. Erst wenn die Verbindung reconnect_stable Sekunden
+    gehalten hat, beginnt die Wartezeit wieder von vorn. Nodes und Pakete
+    bleiben dabei erhalten, jeder Ausfall landet in outages.
+    reconnect_attempts 0 versucht es unbegrenzt.
+    """
+    # meshtastic meldet alle Geräte über denselben globalen pubsub, jede Sitzung
+    # filtert daher nach ihrem Geräteobjekt. Verbindungsaufbau immer nur einzeln,
+    # solange das Objekt noch nicht zugewiesen ist (siehe owns()).
+    sessions = weakref.WeakSet()
+    connect_lock = threading.Lock()
+
+    def __init__(self, batch_interval: float = 0.25, batch_size: int = 500,
+                 on_packets: Callable[[List[Packet]], None] = ignore,
+                 on_node: Callable[[NodeInfo], None] = ignore,
+                 on_status: Callable[[bool, str], None] = ignore,
+                 on_outage: Callable[[str, float, float], None] = ignore,
+                 reconnect: bool = True, reconnect_delay: float = 1.0,
+                 reconnect_max_delay: float = 300.0, reconnect_attempts: int = 0,
+                 reconnect_stable: float = 60.0) -> None:
+        self.on_packets = on_packets
+        self.on_node = on_node
+        self.on_status = on_status
+        self.on_outage = on_outage
+        self.worker: Optional[threading.Thread] = None
+        self.interface = None
+        self.running = False
+        self.type = None
+        self.port = None
+        self.host = None
+        self.addr = None
+        self.file = None
+        self.speed = 1.0
+        self.options = {}
+        self.recorder = None
+        # Name des Funkgeräts, mit dem jedes Paket markiert wird
+        self.name = None
+        self.connecting = False
+        # Node-Nummer des angeschlossenen Funkgeräts, bei Replay und Synthetic unbekannt
+        self.local_num = None
+
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_stable = reconnect_stable
+        self.random = random.Random()
+        self.connected = False
+        # Vom pubsub-Thread gesetzt, wenn das Gerät die Verbindung verliert
+        self.lost = False
+        # Wartezeit bis zum nächsten Versuch überspringen, siehe reconnect_now()
+        self.retry = False
+        self.outages = OutageLog()
+        # Zuletzt gemeldeter Stand je Node, nach einem Wiederverbinden gehen nur Änderungen raus
+        self.known_nodes: Dict[int, NodeInfo] = {}
+
+        # Pakete werden gesammelt und pro Zeitfenster als eine Liste ausgeliefert
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.pending_packets = []
+        self.wakeup = threading.Condition()
+
+    def connect(self, connection_type: str, port: str, host: str, addr: str,
+                file: Optional[str] = None, speed: float = 1.0, record: Optional[str] = None,
+                options: Optional[dict] = None, name: Optional[str] = None):
+        self.type = connection_type
+        self.port = port
+        self.host = host
+        self.addr = addr
+        self.file = file
+        self.speed = speed
+        self.options = options or {}
+        self.name = name or self.describe(connection_type, port, host, addr, file)
+        self.recorder = CaptureWriter(record) if record else None
+        Session.sessions.add(self)
+        self.start()
+
+    def start(self) -> None:
+        self.worker = threading.Thread(target=self.run, name=f"Session {self.name}", daemon=True)
+        self.worker.start()
+
+    def wait(self) -> None:
+        if self.worker is not None and self.worker is not threading.current_thread():
+            self.worker.join()
+
+    def isRunning(self) -> bool:
+        return self.worker is not None and self.worker.is_alive()
+
+    @staticmethod
+    def reconnect_options(config) -> dict:
+        """Schlüsselwortargumente für das Wiederverbinden aus [reconnect] in config.ini"""
+        return {
+            'reconnect': config.getboolean('reconnect', 'enabled', fallback=True),
+            'reconnect_delay': config.getfloat('reconnect', 'initial_delay_s', fallback=1),
+            'reconnect_max_delay': config.getfloat('reconnect', 'max_delay_s', fallback=300),
+            'reconnect_attempts': config.getint('reconnect', 'max_attempts', fallback=0),
+            'reconnect_stable': config.getfloat('reconnect', 'stable_s', fallback=60),
+        }
+
+    @staticmethod
+    def describe(connection_type: str, port: Optional[str] = None, host: Optional[str] = None,
+                 addr: Optional[str] = None, file: Optional[str] = None) -> str:
+        """Standardname eines Funkgeräts, z.B. serial:/dev/ttyUSB0"""
+        target = {'serial': port, 'tcp': host, 'ble': addr, 'replay': file}.get(connection_type)
+        return f"{connection_type}:{target}" if target else str(connection_type)
+
+    def owns(self, interface) -> bool:
+        """Ob ein pubsub-Ereignis vom eigenen Gerät stammt"""
+        if self.interface is not None:
+            return interface is self.interface
+        # Während des Aufbaus gehört der Sitzung jedes Gerät, das keiner anderen zugeordnet ist
+        return self.connecting and not any(interface is session.interface
+                                           for session in list(Session.sessions))
+
+    def disconnect(self):
+        with self.wakeup:
+            self.running = False
+            self.wakeup.notify_all()
+
+        self.unsubscribe()
+        if self.interface:
+            try:
+                self.interface.close()
+                logging.info(f"Connection closed: {self.name}")
+            except:
+                pass
+        self.wait()
+        self.flush_packets()
+
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def subscriptions(self) -> list:
+        return [
+            (self.on_connection_established, "meshtastic.connection.established"),
+            (self.on_connection_lost, "meshtastic.connection.lost"),
+            (self.on_node_updated, "meshtastic.node.updated"),
+            (self.on_receive, "meshtastic.receive"),
+        ]
+
+    def subscribe(self) -> None:
+        # Gebundene Methoden statt Closures: pub.subscribe ignoriert bereits
+        # registrierte Listener, jedes Topic behält also genau einen Handler
+        for listener, topic in self.subscriptions():
+            pub.subscribe(listener, topic)
+
+    def unsubscribe(self) -> None:
+        for listener, topic in self.subscriptions():
+            topic_obj = pub.getDefaultTopicMgr().getTopic(topic, okIfNone=True)
+            if topic_obj is not None and topic_obj.hasListener(listener):
+                pub.unsubscribe(listener, topic)
+
+    def run(self):
+        self.running = True
+        # Vor dem Verbindungsaufbau abonnieren, sonst geht "established" verloren
+        self.subscribe()
+
+        # Versuche seit der letzten stabilen Verbindung, bestimmt die Wartezeit
+        attempt = 0
+        while self.running:
+            try:
+                self.open_interface()
+            except Exception as e:
+                # Nur eine bereits bestehende Verbindung wird wieder aufgebaut
+                if not self.outages.active or self.gave_up(attempt):
+                    self.fail(str(e))
+                    return
+                attempt += 1
+                delay = self.backoff(attempt)
+                logging.warning(f"Reconnect {attempt} of {self.name} failed: {str(e)}, "
+                                f"next attempt in {delay:.1f}s")
+                self.pause(delay)
+                continue
+
+            if not self.running:
+                break
+            connected_at = time.monotonic()
+            self.connected = True
+            outage = self.outages.end(time.time())
+            if outage is not None:
+                logging.info(f"Reconnected {self.name} after {outage[1] - outage[0]:.1f}s")
+                self.on_outage(self.name, *outage)
+            self.on_status(True, f"Connected {self.name}")
+
+            try:
+                self.discover_nodes()
+                self.pump()
+            except Exception as e:
+                self.fail(str(e))
+                return
+
+            if self.running and self.lost:
+                self.close_interface()
+                self.connected = False
+                self.outages.begin(time.time())
+                # Ein Gerät, das die Verbindung sofort wieder verliert, wartet immer länger
+                if time.monotonic() - connected_at >= self.reconnect_stable:
+                    attempt = 0
+                if self.gave_up(attempt):
+                    self.fail("Connection lost")
+                    return
+                attempt += 1
+                delay = self.backoff(attempt)
+                self.on_status(False, f"Connection lost, reconnecting {self.name} in {delay:.1f}s")
+                self.pause(delay)
+
+        # disconnect() während eines Ausfalls beendet ihn
+        outage = self.outages.end(time.time())
+        if outage is not None:
+            self.on_outage(self.name, *outage)
+        self.connected = False
+
+    def open_interface(self) -> None:
+        self.lost = False
+        with Session.connect_lock:
+            self.connecting = True
+            try:
+                interface = self.create_interface()
+            finally:
+                self.connecting = False
+        self.interface = interface
+        if not self.running:
+            # disconnect() kam während des Verbindungsaufbaus
+            self.close_interface()
+        elif isinstance(interface, LocalInterface):
+            interface.start()
+
+    def close_interface(self) -> None:
+        interface = self.interface
+        self.interface = None
+        if interface:
+            try:
+                interface.close()
+            except Exception:
+                pass
+
+    def pump(self) -> None:
+        """Liefert gesammelte Pakete aus, bis disconnect() oder ein Verbindungsverlust kommt"""
+        while True:
+            with self.wakeup:
+                if not self.running or self.lost:
+                    break
+                if not self.pending_packets:
+                    # Ohne Pakete schläft der Thread bis zum nächsten Paket oder disconnect()
+                    self.wakeup.wait()
+                    continue
+                # Zeitfenster zum Sammeln, ein voller Batch oder disconnect() weckt früher
+                self.wakeup.wait(self.batch_interval)
+            self.flush_packets()
+        self.flush_packets()
+
+    def fail(self, message: str) -> None:
+        self.running = False
+        self.connected = False
+        self.unsubscribe()
+        self.close_interface()
+        logging.error(f"Connection error: {message}")
+        self.on_status(False, message)
+
+    def gave_up(self, attempt: int) -> bool:
+        return not self.reconnect or \
+            bool(self.reconnect_attempts and attempt >= self.reconnect_attempts)
+
+    def backoff(self, attempt: int) -> float:
+        """Wartezeit vor dem attempt-ten Versuch, verdoppelt sich bis reconnect_max_delay
+
+        Der Jitter von bis zu 50 % verhindert, dass mehrere Funkgeräte nach einem
+        gemeinsamen Ausfall (z.B. Netzwerk) immer gleichzeitig wiederverbinden.
+        """
+        delay = min(self.reconnect_max_delay, self.reconnect_delay * 2 ** (attempt - 1))
+        return delay * self.random.uniform(0.5, 1.0)
+
+    def pause(self, seconds: float) -> None:
+        """Wartet, bis die Zeit abgelaufen ist oder disconnect()/reconnect_now() kommt"""
+        deadline = time.monotonic() + seconds
+        with self.wakeup:
+            while self.running and not self.retry:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.wakeup.wait(remaining)
+            self.retry = False
+
+    def reconnect_now(self) -> None:
+        """Versucht es während eines Ausfalls sofort statt nach Ablauf der Wartezeit"""
+        with self.wakeup:
+            self.retry = True
+            self.wakeup.notify_all()
+
+    def create_interface(self):
+        # meshtastic und bleak erst bei Bedarf importieren, sie kosten beim Start spürbar Zeit
+        if self.type == 'serial':
+            import meshtastic.serial_interface
+            logging.info(f"Connecting via {self.type} on {self.port}")
+            return meshtastic.serial_interface.SerialInterface(self.port)
+        elif self.type == 'tcp':
+            import meshtastic.tcp_interface
+            logging.info(f"Connecting via {self.type} on {self.host}")
+            return meshtastic.tcp_interface.TCPInterface(self.host)
+        elif self.type == 'ble':
+            import meshtastic.ble_interface
+            logging.info(f"Connecting via {self.type} on {self.addr}")
+            return meshtastic.ble_interface.BLEInterface(self.addr)
+        elif self.type == 'replay':
+            logging.info(f"Replaying {self.file} at speed {self.speed or 'max'}")
+            return ReplayInterface(self.file, self.speed)
+        elif self.type == 'synthetic':
+            logging.info(f"Generating synthetic traffic {self.options}")
+            return SyntheticInterface(**self.options)
+        return None
+
+    def on_connection_established(self, interface, topic=pub.AUTO_TOPIC):
+        if self.owns(interface):
+            self.connection_established()
+
+    def on_connection_lost(self, interface, topic=pub.AUTO_TOPIC):
+        if self.owns(interface):
+            self.connection_lost()
+
+    def on_node_updated(self, node, interface, topic=pub.AUTO_TOPIC):
+        if self.owns(interface):
+            self.node_updated(node)
+
+    def on_receive(self, packet, interface):
+        if self.owns(interface):
+            self.process_packet(packet)
+
+    def discover_nodes(self):
+        try:
+            self.local_num = getattr(getattr(self.interface, 'myInfo', None), 'my_node_num', None)
+            if self.interface and hasattr(self.interface, 'nodes'):
+                # Nach einem Wiederverbinden liefert das Gerät die ganze Liste erneut,
+                # weiter gehen nur Nodes, die sich seit dem letzten Stand geändert haben
+                changed = {}
+                for node_id, node in self.interface.nodes.items():
+                    node_info = self.parse_node_info(node_id, node)
+                    if node_info and self.known_nodes.get(node_info.num) != node_info:
+                        self.known_nodes[node_info.num] = node_info
+                        changed[node_id] = node
+                        self.on_node(node_info)
+                if self.recorder and changed:
+                    self.recorder.write_nodes(changed)
+                logging.info(f"Node database of {self.name}: changed {len(changed)} "
+                             f"of {len(self.interface.nodes)}")
+        except Exception as e:
+            logging.error(f"Error discovering nodes: {str(e)}")
+
+    def parse_node_info(self, node_id: str, node_data: dict) -> Optional[NodeInfo]:
+        try:
+            # Sichere Zeitstempel-Konvertierung mit Fallback
+            def safe_timestamp(timestamp):
+                if timestamp and timestamp != 0:
+                    return float(timestamp)
+                return None
+
+            nodeInfo = NodeInfo(
+                num=int(node_data.get('num', 0)),
+                user=NodeInfoUser(
+                    id=node_data.get('user', {}).get('id', 'Unknown'),
+                    longName=node_data.get('user', {}).get('longName', 'Unknown'),
+                    shortName=node_data.get('user', {}).get('shortName', 'Unknown'),
+                    macaddr=node_data.get('user', {}).get('macaddr'),
+                    hwModel=node_data.get('user', {}).get('hwModel'),
+                    role=node_data.get('user', {}).get('role'),
+                    publicKey=node_data.get('user', {}).get('publicKey'),
+                    isUnmessagable=node_data.get('user', {}).get('isUnmessagable'),
+                ),
+                position=NodeInfoPosition(
+                    latitudeI=node_data.get('position', {}).get('latitudeI'),
+                    longitudeI=node_data.get('position', {}).get('longitudeI'),
+                    altitude=node_data.get('position', {}).get('altitude'),
+                    time=safe_timestamp(node_data.get('position', {}).get('time')),
+                    locationSource=node_data.get('position', {}).get('locationSource'),
+                    latitude=node_data.get('position', {}).get('latitude'),
+                    longitude=node_data.get('position', {}).get('longitude'),
+                ),
+                deviceMetrics=NodeInfoDeviceMetrics(
+                    batteryLevel=node_data.get('deviceMetrics', {}).get('batteryLevel'),
+                    voltage=node_data.get('deviceMetrics', {}).get('voltage'),
+                    channelUtilization=node_data.get('deviceMetrics', {}).get('channelUtilization'),
+                    airUtilTx=node_data.get('deviceMetrics', {}).get('airUtilTx'),
+                    uptimeSeconds=node_data.get('deviceMetrics', {}).get('uptimeSeconds'),
+                ),
+                snr=node_data.get('snr'),
+                lastHeard=safe_timestamp(node_data.get('lastHeard')),
+                hopsAway=node_data.get('hopsAway'),
+            )
+
+            return nodeInfo
+
+        except Exception as e:
+            logging.error(f"Error parsing node info: {str(e)}")
+            return None
+
+    def connection_established(self):
+        logging.info(f"Connection established: {self.name}")
+
+    def connection_lost(self):
+        logging.info(f"Connection lost: {self.name}")
+        # Aufräumen und Wiederverbinden übernimmt run()
+        with self.wakeup:
+            self.lost = True
+            self.wakeup.notify_all()
+
+    def node_updated(self, node: dict):
+        if self.recorder:
+            self.recorder.write_nodes({node.get('user', {}).get('id'): node})
+        node_info = self.parse_node_info(node.get('user', {}).get('id'), node)
+        if node_info:
+            self.known_nodes[node_info.num] = node_info
+            self.on_node(node_info)
+
+    def process_packet(self, packet: dict):
+        try:
+            if self.recorder:
+                self.recorder.write_packet(packet)
+
+            # Sichere Konvertierung für optionale Integer-Werte
+            def safe_int(value):
+                if value is not None:
+                    return int(value)
+                return None
+
+            # Wiederkehrende Strings nur einmal im Speicher halten
+            def safe_intern(value):
+                if isinstance(value, str):
+                    return sys.intern(value)
+                return value
+
+            # Sichere Zeitstempel-Konvertierung, gespeichert als Epoch-Sekunden
+            rx_time = packet.get('rxTime')
+            if not rx_time:
+                rx_time = time.time()
+
+            packetData = Packet(
+                id=int(packet.get('id', 0)),
+                nodeFrom=packet.get('from', 'Unknown'),
+                fromId=safe_intern(packet.get('fromId', 'Unknown')),
+                nodeTo=packet.get('to', 'Unknown'),
+                toId=safe_intern(packet.get('toId', 'Unknown')),
+                decoded=PacketDecoded(
+                    portnum=safe_intern(packet.get('decoded', {}).get('portnum', 'Unknown')),
+                    payload=packet.get('decoded', {}).get('payload', ''),
+                    text=packet.get('decoded', {}).get('text', ''),
+                    bitfield=safe_int(packet.get('decoded', {}).get('bitfield')),
+                ),
+                rxTime=float(rx_time),
+                rxSnr=float(packet.get('rxSnr', 0.0)),
+                rxRssi=int(packet.get('rxRssi', 0)),
+                channel=packet.get('channel'),
+                wantAck=packet.get('wantAck'),
+                hopLimit=safe_int(packet.get('hopLimit')),
+                hopStart=safe_int(packet.get('hopStart')),
+                publicKey=packet.get('publicKey'),
+                pkiEncrypted=packet.get('pkiEncrypted'),
+                nextHop=packet.get('nextHop'),
+                relayNode=packet.get('relayNode'),
+                receiver=self.name,
+            )
+
+            self.queue_packet(packetData)
+
+        except Exception as e:
+            logging.error(f"Error processing packet: {str(e)}")
+
+    def queue_packet(self, packet: Packet) -> None:
+        if not self.batch_interval:
+            self.on_packets([packet])
+            return
+
+        with self.wakeup:
+            self.pending_packets.append(packet)
+            # Nur das erste Paket eines Fensters und ein voller Batch wecken run()
+            if len(self.pending_packets) == 1 or len(self.pending_packets) >= self.batch_size:
+                self.wakeup.notify_all()
+
+    def flush_packets(self) -> None:
+        with self.wakeup:
+            packets = self.pending_packets
+            self.pending_packets = []
+
+        if packets:
+            self.on_packets(packets)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_node_color(node_id: str) -> Tuple[int, int, int]:
+        color_hash = hashlib.md5(node_id.encode()).hexdigest()
+
+        # HSV-Farbmodell für gleichmäßigere Farben verwenden
+        hue = int(color_hash[0:2], 16) * 360 // 256  # Farbton 0-360
+        saturation = 180 + (int(color_hash[2:4], 16) % 75)  # Sättigung 180-255
+        value = 180 + (int(color_hash[4:6], 16) % 75)  # Helligkeit 180-255
+
+        return hue, saturation, value
@@ -0,0 +1,141 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.utilities.NodeInfo import NodeInfo
+from app.utilities.Packet import Packet
+
+# Wertebereich, der auf die Intensität 0..1 abgebildet wird
+METRIC_RANGES = {
+    'rssi': (-125.0, -60.0),
+    'snr': (-20.0, 10.0),
+}
+
+TILE_SIZE = 256
+MAX_ZOOM = 18
+
+
+@dataclass(slots=True)
+class HeatmapGrid:
+    """Summen pro Rasterzelle einer Zoomstufe, Zellen aufsteigend sortiert"""
+    zoom: int
+    samples: int = 0
+    cells: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    sums: np.ndarray = field(default_factory=lambda: np.empty(0))
+    counts: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+
+class SignalHeatmap:
+    """Empfangsstärke direkt gehörter Nodes an deren Position
+
+    Messwerte liegen in wachsenden NumPy-Arrays. Pro Zoomstufe wird ein Raster
+    aus Zellen von cell_size Pixeln zwischengespeichert und bei neuen Werten
+    nur um diese ergänzt, die Karte bekommt den Mittelwert je Zelle statt
+    jedes einzelnen Messpunkts.
+    """
+
+    def __init__(self, metric: str = 'rssi', cell_size: int = 16, capacity: int = 4096) -> None:
+        if metric not in METRIC_RANGES:
+            raise ValueError(f"Unknown heatmap metric '{metric}'")
+        self.metric = metric
+        self.cell_size = cell_size
+        self.positions: Dict[int, Tuple[float, float]] = {}
+
+        self.size = 0
+        self.samples = np.empty((capacity, 3))
+        self.grids: Dict[int, HeatmapGrid] = {}
+
+    def add_nodes(self, nodes: Iterable[NodeInfo]) -> None:
+        for node in nodes:
+            position = node.position
+            if position and position.latitude and position.longitude:
+                self.positions[node.num] = (position.latitude, position.longitude)
+            else:
+                self.positions.pop(node.num, None)
+
+    def add_packets(self, packets: Iterable[Packet]) -> None:
+        samples = []
+        for packet in packets:
+            # Nur direkt gehörte Pakete sagen etwas über die Abdeckung am Ort des Absenders
+            if not packet.rxRssi or packet.hopStart is None or packet.hopStart != packet.hopLimit:
+                continue
+            position = self.positions.get(packet.nodeFrom)
+            if position is None:
+                continue
+            value = packet.rxRssi if self.metric == 'rssi' else packet.rxSnr
+            samples.append((position[0], position[1], value))
+        if samples:
+            self.add_samples(np.asarray(samples, dtype=float))
+
+    def add_samples(self, samples: np.ndarray) -> None:
+        """Hängt Messwerte als Array (lat, lon, Wert) an"""
+        end = self.size + len(samples)
+        if end > len(self.samples):
+            grown = np.empty((max(end, 2 * len(self.samples)), 3))
+            grown[:self.size] = self.samples[:self.size]
+            self.samples = grown
+        self.samples[self.size:end] = samples
+        self.size = end
+
+    def project(self, lat: np.ndarray, lon: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Web-Mercator-Pixelkoordinaten der Zoomstufe"""
+        scale = TILE_SIZE * 2 ** zoom
+        lat = np.radians(np.clip(lat, -85.0511, 85.0511))
+        x = (lon + 180.0) / 360.0 * scale
+        y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * scale
+        return x, y
+
+    def unproject(self, x: np.ndarray, y: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        scale = TILE_SIZE * 2 ** zoom
+        lon = x / scale * 360.0 - 180.0
+        lat = np.degrees(np.arctan(np.sinh(math.pi * (1.0 - 2.0 * y / scale))))
+        return lat, lon
+
+    def columns(self, zoom: int) -> int:
+        return math.ceil(TILE_SIZE * 2 ** zoom / self.cell_size)
+
+    def grid(self, zoom: int) -> HeatmapGrid:
+        """Raster der Zoomstufe, ergänzt um alle seit dem letzten Aufruf hinzugekommenen Werte"""
+        zoom = min(max(int(zoom), 0), MAX_ZOOM)
+        grid = self.grids.get(zoom)
+        if grid is None:
+            grid = self.grids[zoom] = HeatmapGrid(zoom)
+        if grid.samples == self.size:
+            return grid
+
+        new = self.samples[grid.samples:self.size]
+        x, y = self.project(new[:, 0], new[:, 1], zoom)
+        columns = self.columns(zoom)
+        cells = (x // self.cell_size).astype(np.int64) * columns + (y // self.cell_size).astype(np.int64)
+
+        cells = np.concatenate((grid.cells, cells))
+        values = np.concatenate((grid.sums, new[:, 2]))
+        counts = np.concatenate((grid.counts, np.ones(len(new))))
+        grid.cells, inverse = np.unique(cells, return_inverse=True)
+        grid.sums = np.bincount(inverse, weights=values)
+        grid.counts = np.bincount(inverse, weights=counts)
+        grid.samples = self.size
+        return grid
+
+    def points(self, zoom: int,
+               bounds: Optional[Tuple[float, float, float, float]] = None) -> np.ndarray:
+        """Zellmittelpunkte als Array (lat, lon, Intensität 0..1)
+
+        bounds (Süd, West, Nord, Ost) beschränkt das Ergebnis auf den sichtbaren Ausschnitt.
+        """
+        grid = self.grid(zoom)
+        columns = self.columns(grid.zoom)
+        x = (grid.cells // columns + 0.5) * self.cell_size
+        y = (grid.cells % columns + 0.5) * self.cell_size
+        lat, lon = self.unproject(x, y, grid.zoom)
+
+        low, high = METRIC_RANGES[self.metric]
+        intensity = np.clip((grid.sums / grid.counts - low) / (high - low), 0.0, 1.0)
+        points = np.column_stack((lat, lon, intensity))
+
+        if bounds is not None:
+            south, west, north, east = bounds
+            points = points[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+        return points
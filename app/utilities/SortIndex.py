@@ -0,0 +1,150 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, List, Optional, Sequence
+
+import numpy
+
+# Einträge je Block, Einfügen und Entfernen verschieben höchstens einen Block
+BLOCK_SIZE = 1000
+
+
+class SortIndex:
+    """Sortierreihenfolge über laufende Nummern eines RingBuffer
+
+    Einträge mit Wert liegen sortiert in Blöcken (keys/seqs), gleiche Werte in
+    Einfügereihenfolge. Fehlende Werte (None) stehen unabhängig von der Richtung
+    immer am Ende, ebenfalls in Einfügereihenfolge. Bei numeric zählen auch
+    Werte, die keine Zahl sind (z.B. 'Unknown' als Node-Nummer), als fehlend.
+    """
+
+    def __init__(self, values: Sequence[Any], first_seq: int, descending: bool = False,
+                 numeric: bool = False) -> None:
+        self.descending = descending
+        self.numeric = numeric
+        if numeric:
+            # Fehlende Werte werden zu NaN, stabile Sortierung in NumPy im Millisekundenbereich
+            try:
+                array = numpy.array(values, dtype=float)
+            except (TypeError, ValueError):
+                array = numpy.array([self.key(value) for value in values], dtype=float)
+            missing = numpy.isnan(array)
+            present = numpy.flatnonzero(~missing)
+            order = present[numpy.argsort(array[present], kind='stable')]
+            keys = array[order].tolist()
+            seqs = (order + first_seq).tolist()
+            self.missing: List[int] = (numpy.flatnonzero(missing) + first_seq).tolist()
+        else:
+            present = [i for i, value in enumerate(values) if value is not None]
+            present.sort(key=values.__getitem__)
+            keys = [values[i] for i in present]
+            seqs = [first_seq + i for i in present]
+            self.missing = [first_seq + i for i, value in enumerate(values) if value is None]
+
+        self.keys = [keys[i:i + BLOCK_SIZE] for i in range(0, len(keys), BLOCK_SIZE)]
+        self.seqs = [seqs[i:i + BLOCK_SIZE] for i in range(0, len(seqs), BLOCK_SIZE)]
+        self.maxes = [block[-1] for block in self.keys]
+        self.count = len(keys)
+        self.offsets: Optional[List[int]] = None
+
+    def key(self, value: Any) -> Any:
+        """Sortierschlüssel eines Werts, None für fehlende"""
+        if self.numeric and not isinstance(value, (int, float)):
+            return None
+        return value
+
+    def __len__(self) -> int:
+        return self.count + len(self.missing)
+
+    def block_offsets(self) -> List[int]:
+        if self.offsets is None:
+            self.offsets = [0, *accumulate(map(len, self.seqs))]
+        return self.offsets
+
+    def to_row(self, position: int) -> int:
+        return self.count - 1 - position if self.descending else position
+
+    def seq_at(self, row: int) -> int:
+        if row >= self.count:
+            return self.missing[row - self.count]
+        position = self.to_row(row)
+        offsets = self.block_offsets()
+        block = bisect_right(offsets, position) - 1
+        return self.seqs[block][position - offsets[block]]
+
+    def find(self, value: Any, seq: int) -> tuple:
+        """Block und Position eines vorhandenen Eintrags"""
+        block = bisect_left(self.maxes, value)
+        position = bisect_left(self.keys[block], value)
+        while True:
+            seqs = self.seqs[block]
+            for i in range(position, len(seqs)):
+                if seqs[i] == seq:
+                    return block, i
+            block += 1
+            position = 0
+
+    def row_of(self, value: Any, seq: int) -> int:
+        value = self.key(value)
+        if value is None:
+            return self.count + bisect_left(self.missing, seq)
+        block, position = self.find(value, seq)
+        return self.to_row(self.block_offsets()[block] + position)
+
+    def insertion_point(self, value: Any) -> tuple:
+        block = min(bisect_right(self.maxes, value), len(self.maxes) - 1)
+        return block, bisect_right(self.keys[block], value)
+
+    def insert_row(self, value: Any) -> int:
+        """Zeile, an der ein neuer Eintrag mit diesem Wert eingefügt wird"""
+        value = self.key(value)
+        if value is None:
+            return len(self)
+        if not self.keys:
+            return 0
+        block, position = self.insertion_point(value)
+        position += self.block_offsets()[block]
+        # Absteigend steht der neue Eintrag vor den gleichen Werten
+        return self.count - position if self.descending else position
+
+    def insert(self, value: Any, seq: int) -> None:
+        """Fügt einen Eintrag ein, seq muss größer als alle bisherigen sein"""
+        value = self.key(value)
+        if value is None:
+            self.missing.append(seq)
+            return
+
+        if not self.keys:
+            self.keys.append([])
+            self.seqs.append([])
+            self.maxes.append(value)
+        block, position = self.insertion_point(value)
+        keys, seqs = self.keys[block], self.seqs[block]
+        keys.insert(position, value)
+        seqs.insert(position, seq)
+        self.maxes[block] = keys[-1]
+        self.count += 1
+
+        if len(keys) > 2 * BLOCK_SIZE:
+            self.keys[block:block + 1] = [keys[:BLOCK_SIZE], keys[BLOCK_SIZE:]]
+            self.seqs[block:block + 1] = [seqs[:BLOCK_SIZE], seqs[BLOCK_SIZE:]]
+            self.maxes[block:block + 1] = [keys[BLOCK_SIZE - 1], keys[-1]]
+        self.offsets = None
+
+    def remove(self, value: Any, seq: int) -> None:
+        value = self.key(value)
+        if value is None:
+            del self.missing[bisect_left(self.missing, seq)]
+            return
+
+        block, position = self.find(value, seq)
+        keys, seqs = self.keys[block], self.seqs[block]
+        del keys[position]
+        del seqs[position]
+        if keys:
+            self.maxes[block] = keys[-1]
+        else:
+            del self.keys[block]
+            del self.seqs[block]
+            del self.maxes[block]
+        self.count -= 1
+        self.offsets = None
@@ -0,0 +1,148 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+TILE_SIZE = 256
+MAX_ZOOM = 18
+# Mitglieder werden nur auf jeder vierten Zoomstufe geführt, Zähler auf allen
+MEMBER_STRIDE = 4
+
+
+@dataclass(slots=True)
+class GridCell:
+    count: int = 0
+    lat_sum: float = 0.0
+    lon_sum: float = 0.0
+    members: Optional[Set[Hashable]] = None
+
+
+class SpatialIndex:
+    """Gitter über Positionen in Web-Mercator-Pixeln für alle Zoomstufen
+
+    Jede Zoomstufe hat ein eigenes Gitter aus Zellen von cell_size Pixeln mit
+    Anzahl und Schwerpunkt der enthaltenen Einträge. Eine Abfrage betrachtet
+    nur die Zellen im Ausschnitt, ihre Kosten hängen also von der Größe des
+    Ausschnitts am Bildschirm ab und nicht von der Anzahl der Einträge.
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        self.cell_size = cell_size
+        self.positions: Dict[Hashable, Tuple[float, float]] = {}
+        self.levels: List[Dict[Tuple[int, int], GridCell]] = [{} for _ in range(MAX_ZOOM + 1)]
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.positions
+
+    @staticmethod
+    def pixel(lat: float, lon: float, zoom: int) -> Tuple[float, float]:
+        scale = TILE_SIZE * 2 ** zoom
+        lat = math.radians(min(max(lat, -85.0511), 85.0511))
+        x = (min(max(lon, -180.0), 180.0) + 180.0) / 360.0 * scale
+        y = (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * scale
+        return x, y
+
+    def cell(self, lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+        x, y = self.pixel(lat, lon, zoom)
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def level_cells(self, lat: float, lon: float) -> Iterator[Tuple[int, int]]:
+        """Zellen aller Zoomstufen, aus einer einzigen Projektion auf MAX_ZOOM abgeleitet"""
+        x, y = self.pixel(lat, lon, MAX_ZOOM)
+        for zoom in range(MAX_ZOOM + 1):
+            size = self.cell_size * (1 << (MAX_ZOOM - zoom))
+            yield int(x // size), int(y // size)
+
+    def update(self, key: Hashable, lat: float, lon: float) -> bool:
+        """Setzt die Position eines Eintrags, False wenn sie sich nicht geändert hat"""
+        previous = self.positions.get(key)
+        if previous == (lat, lon):
+            return False
+        if previous is not None:
+            self.remove(key)
+
+        self.positions[key] = (lat, lon)
+        for zoom, (level, index) in enumerate(zip(self.levels, self.level_cells(lat, lon))):
+            cell = level.get(index)
+            if cell is None:
+                cell = level[index] = GridCell()
+                if zoom % MEMBER_STRIDE == 0:
+                    cell.members = set()
+            cell.count += 1
+            cell.lat_sum += lat
+            cell.lon_sum += lon
+            if cell.members is not None:
+                cell.members.add(key)
+        return True
+
+    def remove(self, key: Hashable) -> bool:
+        position = self.positions.pop(key, None)
+        if position is None:
+            return False
+
+        lat, lon = position
+        for level, index in zip(self.levels, self.level_cells(lat, lon)):
+            cell = level[index]
+            cell.count -= 1
+            if not cell.count:
+                del level[index]
+                continue
+            cell.lat_sum -= lat
+            cell.lon_sum -= lon
+            if cell.members is not None:
+                cell.members.discard(key)
+        return True
+
+    def cells(self, bounds: Tuple[float, float, float, float],
+              zoom: int) -> Iterator[GridCell]:
+        """Belegte Zellen der Zoomstufe, die den Ausschnitt (Süd, West, Nord, Ost) schneiden"""
+        zoom = min(max(int(zoom), 0), MAX_ZOOM)
+        level = self.levels[zoom]
+        south, west, north, east = bounds
+        x0, y0 = self.cell(north, west, zoom)
+        x1, y1 = self.cell(south, east, zoom)
+
+        # Bei großem Ausschnitt mit wenigen belegten Zellen diese direkt filtern
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(level):
+            for (x, y), cell in level.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield cell
+            return
+
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = level.get((x, y))
+                if cell is not None:
+                    yield cell
+
+    def count(self, bounds: Tuple[float, float, float, float], zoom: int) -> int:
+        """Anzahl der Einträge in den Zellen des Ausschnitts"""
+        return sum(cell.count for cell in self.cells(bounds, zoom))
+
+    def query(self, bounds: Tuple[float, float, float, float], zoom: int) -> List[Hashable]:
+        """Alle Einträge im Ausschnitt"""
+        south, west, north, east = bounds
+        zoom = min(max(int(zoom), 0), MAX_ZOOM)
+        result = []
+        for cell in self.cells(bounds, zoom - zoom % MEMBER_STRIDE):
+            for key in cell.members:
+                lat, lon = self.positions[key]
+                if south <= lat <= north and west <= lon <= east:
+                    result.append(key)
+        return result
+
+    def clusters(self, bounds: Tuple[float, float, float, float],
+                 zoom: int) -> List[Tuple[float, float, int]]:
+        """Schwerpunkt und Anzahl je belegter Zelle als (lat, lon, Anzahl)"""
+        return [(cell.lat_sum / cell.count, cell.lon_sum / cell.count, cell.count)
+                for cell in self.cells(bounds, zoom)]
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """Ausschnitt (Süd, West, Nord, Ost) über alle Einträge"""
+        if not self.positions:
+            return None
+        latitudes = [lat for lat, lon in self.positions.values()]
+        longitudes = [lon for lat, lon in self.positions.values()]
+        return min(latitudes), min(longitudes), max(latitudes), max(longitudes)
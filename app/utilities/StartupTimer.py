@@ -0,0 +1,36 @@
+import logging
+import time
+from typing import List, Tuple
+
+
+class StartupTimer:
+    """Dauer der Startphasen bis zur bedienbaren Node-Liste
+
+    Eingeschaltet mit --startup-timing, sonst merkt sich mark() nichts. Jede
+    Phase reicht vom vorherigen mark() bis zum eigenen, report() schreibt sie
+    ins Log.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self) -> None:
+        if not self.enabled:
+            return
+        for phase, duration in self.phases:
+            logging.info(f"Startup {phase}: {duration * 1000:.1f} ms")
+        logging.info(f"Startup total: {(self.last - self.start) * 1000:.1f} ms")
+
+
+# Gemeinsam für main.py, app.init und MainWindow
+startup_timer = StartupTimer()
@@ -0,0 +1,127 @@
+import random
+import time
+from typing import Dict, Optional
+
+from app.utilities.LocalInterface import LocalInterface
+
+# Anteil der Portnummern am erzeugten Verkehr, grob nach einem öffentlichen Mesh
+DEFAULT_PORTNUM_MIX = {
+    'TELEMETRY_APP': 0.35,
+    'POSITION_APP': 0.25,
+    'NODEINFO_APP': 0.15,
+    'ROUTING_APP': 0.15,
+    'TEXT_MESSAGE_APP': 0.10,
+}
+
+HW_MODELS = ['HELTEC_V3', 'TBEAM', 'RAK4631', 'T_ECHO', 'STATION_G2', 'TRACKER_T1000_E']
+
+
+class SyntheticInterface(LocalInterface):
+    """Erzeugt realistische meshtastic-Pakete und NodeDB-Einträge ohne Funkgerät
+
+    rate ist die Anzahl Pakete pro Sekunde (0 = so schnell wie möglich),
+    position_churn die Wahrscheinlichkeit, dass ein POSITION_APP-Paket den
+    Standort des Senders verschiebt. Mit seed ist der Verkehr reproduzierbar.
+    """
+
+    def __init__(self, nodes: int = 100, rate: float = 50.0,
+                 portnum_mix: Optional[Dict[str, float]] = None, position_churn: float = 0.2,
+                 center=(51.1657, 10.4515), seed: Optional[int] = None) -> None:
+        super().__init__("SyntheticInterface")
+        self.rate = rate
+        self.portnum_mix = portnum_mix or DEFAULT_PORTNUM_MIX
+        self.position_churn = position_churn
+        self.random = random.Random(seed)
+
+        for i in range(nodes):
+            node = self.create_node(i, center)
+            self.nodes[node['user']['id']] = node
+        self.node_ids = list(self.nodes)
+
+    def create_node(self, index: int, center) -> dict:
+        num = 0x10000000 + index
+        latitude = center[0] + self.random.uniform(-0.5, 0.5)
+        longitude = center[1] + self.random.uniform(-0.8, 0.8)
+        now = time.time()
+        return {
+            'num': num,
+            'user': {
+                'id': f"!{num:08x}",
+                'longName': f"Synthetic Node {index}",
+                'shortName': f"S{index % 1000:03d}",
+                'macaddr': self.random.randbytes(6).hex(),
+                'hwModel': self.random.choice(HW_MODELS),
+                'role': 'CLIENT',
+            },
+            'position': {
+                'latitudeI': int(latitude * 1e7),
+                'longitudeI': int(longitude * 1e7),
+                'latitude': latitude,
+                'longitude': longitude,
+                'altitude': self.random.randint(50, 600),
+                'time': int(now),
+            },
+            'deviceMetrics': {
+                'batteryLevel': self.random.randint(10, 101),
+                'voltage': round(self.random.uniform(3.3, 4.2), 2),
+                'channelUtilization': round(self.random.uniform(0, 30), 2),
+                'airUtilTx': round(self.random.uniform(0, 5), 2),
+                'uptimeSeconds': self.random.randint(0, 10 ** 6),
+            },
+            'snr': round(self.random.uniform(-20, 12), 2),
+            'lastHeard': int(now),
+            'hopsAway': self.random.randint(0, 4),
+        }
+
+    def create_packet(self) -> dict:
+        node = self.nodes[self.random.choice(self.node_ids)]
+        portnum = self.random.choices(list(self.portnum_mix), weights=list(self.portnum_mix.values()))[0]
+        hop_start = 3
+        hop_limit = hop_start - min(node['hopsAway'], hop_start)
+
+        payload = self.random.randbytes(self.random.randint(8, 64))
+        decoded = {'portnum': portnum, 'payload': payload, 'bitfield': 1}
+        if portnum == 'TEXT_MESSAGE_APP':
+            decoded['text'] = "synthetic message"
+            decoded['payload'] = decoded['text'].encode()
+        elif portnum == 'POSITION_APP' and self.random.random() < self.position_churn:
+            self.move_node(node)
+
+        packet = {
+            'from': node['num'],
+            'to': 0xFFFFFFFF,
+            'fromId': node['user']['id'],
+            'toId': '^all',
+            'id': self.random.getrandbits(32),
+            # Float statt ganzer Sekunden, damit die Latenz bis zur Anzeige messbar ist
+            'rxTime': time.time(),
+            'rxSnr': round(node['snr'] + self.random.gauss(0, 2), 2),
+            'rxRssi': int(-120 + (node['snr'] + 20) * 2 + self.random.gauss(0, 3)),
+            'hopLimit': hop_limit,
+            'hopStart': hop_start,
+            'channel': 0,
+            'decoded': decoded,
+        }
+        if hop_limit < hop_start:
+            packet['relayNode'] = self.random.getrandbits(8)
+        return packet
+
+    def move_node(self, node: dict) -> None:
+        position = dict(node['position'])
+        position['latitude'] += self.random.uniform(-0.002, 0.002)
+        position['longitude'] += self.random.uniform(-0.002, 0.002)
+        position['latitudeI'] = int(position['latitude'] * 1e7)
+        position['longitudeI'] = int(position['longitude'] * 1e7)
+        position['time'] = int(time.time())
+        self.publish_node(node['user']['id'], dict(node, position=position, lastHeard=int(time.time())))
+
+    def play(self) -> None:
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        next_time = time.monotonic()
+        while not self.stopped.is_set():
+            if interval:
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay > 0 and self.stopped.wait(delay):
+                    break
+            self.publish_packet(self.create_packet())
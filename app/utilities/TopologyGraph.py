@@ -0,0 +1,207 @@
+import colorsys
+import math
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utilities.NodeInfo import NodeInfo
+from app.utilities.Packet import Packet
+
+# Platzhalter für den eigenen Empfänger, solange dessen Node-Nummer unbekannt ist
+RECEIVER = 0
+
+
+@dataclass(slots=True)
+class TopologyEdge:
+    """Beobachtete Funkverbindung source -> target"""
+    source: int
+    target: int
+    first_seen: float
+    last_seen: float
+    packets: int = 0
+    snr_sum: float = 0.0
+    snr_count: int = 0
+    version: int = 0
+
+    @property
+    def snr(self) -> Optional[float]:
+        return self.snr_sum / self.snr_count if self.snr_count else None
+
+
+class TopologyGraph:
+    """Gerichteter Graph der beobachteten Verbindungen im Mesh
+
+    Jedes Paket aktualisiert höchstens zwei Kanten in O(1). Die Kanten liegen
+    nach letzter Aktualisierung geordnet in einem OrderedDict, veraltete
+    Kanten werden daher vom Anfang her entfernt, ohne den Graph zu durchsuchen.
+    Ansichten holen mit changes_since() nur die Änderungen seit ihrem letzten Stand.
+
+    Erkannte Verbindungen:
+      - hops == 0: Absender -> Empfänger
+      - relayNode gesetzt: Relay -> Empfänger, bei hops == 1 zusätzlich Absender -> Relay
+      - hopsAway == 0 aus der NodeDB: Node -> Empfänger
+
+    Empfänger ist das Funkgerät, das das Paket geliefert hat (packet.receiver),
+    bei zusammengefassten Kopien mehrerer Funkgeräte das mit dem besten Empfang.
+    """
+
+    def __init__(self, max_age: float = 3600.0, max_edges: int = 20000) -> None:
+        self.max_age = max_age
+        self.max_edges = max_edges
+        # Name des Funkgeräts -> eigene Node-Nummer, soweit bekannt
+        self.receivers: Dict[str, int] = {}
+
+        self.edges: OrderedDict = OrderedDict()
+        self.adjacency: Dict[int, Set[int]] = {}
+        # meshtastic überträgt vom Relay nur das letzte Byte der Node-Nummer
+        self.relays: Dict[int, Set[int]] = {}
+        self.version = 0
+        # (Version, Kante) entfernter Kanten, ältere Stände lösen einen Neuaufbau aus
+        self.removed: deque = deque(maxlen=max_edges)
+
+    @property
+    def local(self) -> Optional[int]:
+        """Empfänger für Nachbarn aus der NodeDB, None wenn mehrere Funkgeräte in Frage kommen"""
+        nums = set(self.receivers.values())
+        if len(nums) > 1:
+            return None
+        return next(iter(nums), RECEIVER)
+
+    def is_receiver(self, num: int) -> bool:
+        return num == RECEIVER or num in self.receivers.values()
+
+    def receiver_of(self, packet: Packet) -> int:
+        return self.receivers.get(packet.receiver, RECEIVER)
+
+    def add_nodes(self, nodes: Iterable[NodeInfo]) -> None:
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: NodeInfo) -> None:
+        if node.num is None:
+            return
+        self.relays.setdefault(node.num & 0xFF, set()).add(node.num)
+        # Die zusammengeführte NodeDB verrät nicht, welches Funkgerät den Nachbarn kennt
+        local = self.local
+        if local is not None and node.hopsAway == 0 and node.lastHeard and node.num != local:
+            self.observe(node.num, local, node.lastHeard, node.snr, count=False)
+
+    def add_packets(self, packets: Iterable[Packet]) -> None:
+        for packet in packets:
+            self.add_packet(packet)
+        if packets:
+            self.prune(max(packet.rxTime for packet in packets))
+
+    def add_packet(self, packet: Packet) -> None:
+        source = packet.nodeFrom
+        local = self.receiver_of(packet)
+        if not isinstance(source, int) or source == local:
+            return
+        hops = None
+        if packet.hopStart is not None and packet.hopLimit is not None:
+            hops = packet.hopStart - packet.hopLimit
+        snr = packet.rxSnr if packet.rxRssi else None
+
+        if hops == 0:
+            self.observe(source, local, packet.rxTime, snr)
+            return
+
+        relay = self.resolve_relay(packet.relayNode)
+        if relay is None or relay == source:
+            return
+        self.observe(relay, local, packet.rxTime, snr)
+        if hops == 1:
+            self.observe(source, relay, packet.rxTime, None)
+
+    def resolve_relay(self, relay_node) -> Optional[int]:
+        """Node-Nummer zum letzten Byte aus relayNode, nur wenn eindeutig"""
+        if relay_node is None:
+            return None
+        candidates = self.relays.get(int(relay_node) & 0xFF)
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+    def observe(self, source: int, target: int, timestamp: float, snr: Optional[float],
+                count: bool = True) -> None:
+        key = (source, target)
+        edge = self.edges.get(key)
+        if edge is None:
+            edge = self.edges[key] = TopologyEdge(source, target, timestamp, timestamp)
+            self.adjacency.setdefault(source, set()).add(target)
+            self.adjacency.setdefault(target, set()).add(source)
+        else:
+            self.edges.move_to_end(key)
+            edge.last_seen = max(edge.last_seen, timestamp)
+        if count:
+            edge.packets += 1
+        if snr is not None:
+            edge.snr_sum += snr
+            edge.snr_count += 1
+        self.version += 1
+        edge.version = self.version
+
+    def prune(self, now: float) -> None:
+        """Entfernt Kanten, die länger als max_age nicht gesehen wurden, und hält max_edges ein"""
+        oldest = now - self.max_age
+        while self.edges:
+            key, edge = next(iter(self.edges.items()))
+            if edge.last_seen >= oldest and len(self.edges) <= self.max_edges:
+                break
+            self.remove(key)
+
+    def remove(self, key: Tuple[int, int]) -> None:
+        del self.edges[key]
+        source, target = key
+        if (target, source) not in self.edges:
+            for a, b in (key, (target, source)):
+                neighbors = self.adjacency.get(a)
+                if neighbors is not None:
+                    neighbors.discard(b)
+                    if not neighbors:
+                        del self.adjacency[a]
+        self.version += 1
+        self.removed.append((self.version, key))
+
+    def neighbors(self, num: int) -> Set[int]:
+        return self.adjacency.get(num, set())
+
+    def changes_since(self, version: int) -> Optional[Tuple[List[TopologyEdge],
+                                                          List[Tuple[int, int]]]]:
+        """Geänderte Kanten und entfernte Schlüssel seit version
+
+        None bedeutet, dass die Historie der entfernten Kanten nicht mehr so
+        weit zurückreicht, der Aufrufer muss dann alle Kanten neu übernehmen.
+        """
+        if version and self.removed and len(self.removed) == self.removed.maxlen \
+                and self.removed[0][0] > version:
+            return None
+
+        updated = []
+        for edge in reversed(self.edges.values()):
+            if edge.version <= version:
+                break
+            updated.append(edge)
+
+        removed = []
+        for removed_version, key in reversed(self.removed):
+            if removed_version <= version:
+                break
+            if key not in self.edges:
+                removed.append(key)
+        return updated, removed
+
+
+def edge_color(edge: TopologyEdge) -> str:
+    """Farbe nach mittlerem SNR, rot bei -15 dB bis grün ab 5 dB, grau ohne Messwert"""
+    snr = edge.snr
+    if snr is None:
+        return "#888888"
+    hue = min(max((snr + 15) / 20, 0.0), 1.0) / 3
+    red, green, blue = colorsys.hsv_to_rgb(hue, 0.85, 0.85)
+    return f"#{int(red * 255):02x}{int(green * 255):02x}{int(blue * 255):02x}"
+
+
+def edge_width(edge: TopologyEdge) -> float:
+    """Linienstärke wächst logarithmisch mit der Anzahl Pakete"""
+    return 1.0 + min(4.0, math.log2(edge.packets + 1) / 2)
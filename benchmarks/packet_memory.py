@@ -0,0 +1,63 @@
+"""Misst den Speicherbedarf pro Packet
+
+Aufruf aus dem Projektverzeichnis: python benchmarks/packet_memory.py [anzahl]
+Der Exit-Code ist 1, wenn das Budget BYTES_PER_PACKET_BUDGET überschritten wird.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utilities.Packet import Packet, PacketDecoded  # pylint: disable=wrong-import-position
+
+# Gemessen wurden ca. 410 Bytes (vorher mit __dict__ und datetime ca. 575),
+# das Budget lässt etwas Luft für andere Python-Versionen
+BYTES_PER_PACKET_BUDGET = 450
+
+PORTNUMS = ["TEXT_MESSAGE_APP", "POSITION_APP", "NODEINFO_APP", "TELEMETRY_APP"]
+
+
+def make_packet(i: int) -> Packet:
+    # Nachbildung von Interface.process_packet: interned Strings, Epoch-Zeitstempel
+    from_id = sys.intern(f"!{i % 200:08x}")
+    return Packet(
+        id=i,
+        nodeFrom=i % 200,
+        fromId=from_id,
+        nodeTo=0xFFFFFFFF,
+        toId=sys.intern("^all"),
+        decoded=PacketDecoded(
+            portnum=sys.intern(PORTNUMS[i % len(PORTNUMS)]),
+            payload=os.urandom(16),
+            text='',
+        ),
+        rxTime=float(int(time.time()) + i),
+        rxSnr=float(i % 40) / 4 - 5,
+        rxRssi=-(i % 120),
+        hopLimit=3,
+        hopStart=3,
+    )
+
+
+def main(count: int) -> int:
+    # IDs vorab erzeugen, damit sie nicht in die Messung eingehen
+    for i in range(200):
+        sys.intern(f"!{i:08x}")
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    packets = [make_packet(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Die Liste selbst gehört nicht zum Paket
+    per_packet = (after - before - sys.getsizeof(packets)) / len(packets)
+    print(f"{count} packets: {per_packet:.0f} bytes per packet (budget {BYTES_PER_PACKET_BUDGET})")
+    return 0 if per_packet <= BYTES_PER_PACKET_BUDGET else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
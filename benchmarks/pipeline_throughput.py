@@ -0,0 +1,105 @@
+"""End-to-End-Durchsatz der Paketverarbeitung
+
+Startet die echte Qt-Oberfläche offscreen, speist synthetischen Verkehr über
+Interface ein und misst, was in PacketTableModel und NodeListModel ankommt:
+
+    python benchmarks/pipeline_throughput.py --nodes 500 --rate 200 --duration 30
+
+Ausgabe: angebotene und verarbeitete Pakete pro Sekunde, Latenz von rxTime bis
+zum Einfügen in das Modell (p50/p95/max), größte Blockade der Event-Loop und
+Spitzenwert des Speichers. Fällt der Durchsatz unter die Rate oder wächst die
+Latenz über die Laufzeit, kommt die Oberfläche nicht mehr hinterher.
+"""
+
+import argparse
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QListView, QTableView
+
+from app.init import create_application
+from app.ui.MainWindow import MainWindow
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100.0, help="packets per second, 0 = unthrottled")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--churn", type=float, default=0.2, help="position churn per POSITION_APP packet")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = create_application(sys.argv)
+    window = MainWindow()
+    window.show()
+    window.packetWindow.show()
+    window.mapWindow.show()
+
+    packet_model = window.packetWindow.findChild(QTableView).model().sourceModel()
+    node_model = window.findChild(QListView).model().sourceModel()
+
+    latencies = []
+    received = [0]
+    stalls = [0.0]
+
+    def on_rows_inserted(parent, first, last):
+        now = time.time()
+        for row in range(first, last + 1):
+            latencies.append(now - packet_model.store.value(packet_model.store_row(row), 'rxTime'))
+        received[0] += last - first + 1
+
+    packet_model.rowsInserted.connect(on_rows_inserted)
+
+    # Herzschlag alle 10 ms, jede Verspätung ist eine Blockade der Event-Loop
+    heartbeat = QTimer()
+    heartbeat.setInterval(10)
+    last_beat = [time.monotonic()]
+
+    def on_heartbeat():
+        now = time.monotonic()
+        stalls[0] = max(stalls[0], now - last_beat[0] - 0.010)
+        last_beat[0] = now
+
+    heartbeat.timeout.connect(on_heartbeat)
+    heartbeat.start()
+
+    session = window.interface.connect('synthetic', '', '', '', options={
+        'nodes': args.nodes, 'rate': args.rate, 'position_churn': args.churn, 'seed': args.seed,
+    })
+
+    start = time.monotonic()
+    QTimer.singleShot(int(args.duration * 1000), app.quit)
+    app.exec()
+    elapsed = time.monotonic() - start
+    window.interface.disconnect()
+
+    offered = session.interface.rate if args.rate else float('nan')
+    print(f"nodes:       {args.nodes} ({node_model.rowCount()} rows in node list)")
+    print(f"offered:     {offered:.0f} packets/s")
+    print(f"processed:   {received[0] / elapsed:.0f} packets/s ({received[0]} in {elapsed:.1f}s)")
+    if latencies:
+        print(f"latency:     p50 {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+    print(f"max stall:   {stalls[0] * 1000:.1f} ms")
+    print(f"peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
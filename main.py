@@ -1,15 +1,28 @@
 """Main module to run application"""
 
-import logging
 import sys
 
-from app import init
+from app.utilities.StartupTimer import startup_timer
+from app.utilities.AppConfig import AppConfig
+from app.utilities.LogPipeline import setup_logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+# --startup-timing: Dauer der Startphasen ins Log schreiben
+startup_timer.enabled = '--startup-timing' in sys.argv[1:]
+
+config = AppConfig().load()
+setup_logging(
+    level=config.get('logging', 'level', fallback='INFO'),
+    path=config.get('logging', 'path', fallback=None),
+    max_bytes=config.getint('logging', 'max_bytes', fallback=1048576),
+    backups=config.getint('logging', 'backups', fallback=3),
+    repeat_interval=config.getfloat('logging', 'repeat_interval', fallback=10.0),
 )
+startup_timer.mark("logging")
 
 if __name__ == '__main__':
+    if '--headless' in sys.argv[1:]:
+        from app import headless
+        sys.exit(headless.run(sys.argv[1:]))
+
+    from app import init
     sys.exit(init.run())
@@ -0,0 +1,181 @@
+// Marker bridge for the map window.
+//
+// The page is rendered once by folium; afterwards MapWindow only talks to the
+// objects created here via QWebEnginePage.runJavaScript(). Zoom and viewport
+// changes go back to MapWindow through the QWebChannel object "mapEvents".
+
+function createMeshMap(map, cluster, heat) {
+    var markers = {};
+    var highlight = null;
+
+    // Pre-aggregated clusters from MapWindow, used instead of markers when too many are in view.
+    var clusterLayer = L.layerGroup().addTo(map);
+
+    // Topology links are drawn on a shared canvas, thousands of SVG paths are too slow.
+    var links = {};
+    var linkRenderer = L.canvas({padding: 0.5});
+    var linkLayer = L.layerGroup().addTo(map);
+
+    if (typeof QWebChannel !== "undefined" && typeof qt !== "undefined") {
+        new QWebChannel(qt.webChannelTransport, function (channel) {
+            var events = channel.objects.mapEvents;
+
+            function report() {
+                var bounds = map.getBounds();
+                events.moved(map.getZoom(), bounds.getSouth(), bounds.getWest(),
+                             bounds.getNorth(), bounds.getEast());
+            }
+
+            map.on("moveend", report);
+            report();
+        });
+    }
+
+    function applyStyle(entry) {
+        var highlighted = highlight !== null && highlight.id === entry.id;
+        entry.marker.setStyle({
+            color: entry.color,
+            fillColor: entry.color,
+            fillOpacity: highlighted ? 0.9 : 0.7,
+            weight: highlighted ? 5 : 3
+        });
+        entry.marker.setRadius(highlighted ? 20 : 15);
+        entry.marker.setTooltipContent((highlighted ? "🎯 " : "") + entry.tooltip);
+    }
+
+    function upsert(node) {
+        var entry = markers[node.id];
+        if (entry === undefined) {
+            entry = {id: node.id};
+            entry.marker = L.circleMarker([node.lat, node.lon], {fill: true});
+            entry.marker.bindPopup("");
+            entry.marker.bindTooltip("");
+            markers[node.id] = entry;
+            cluster.addLayer(entry.marker);
+        } else {
+            var latLng = entry.marker.getLatLng();
+            if (latLng.lat !== node.lat || latLng.lng !== node.lon) {
+                // Moving a marker inside a cluster requires re-adding it.
+                cluster.removeLayer(entry.marker);
+                entry.marker.setLatLng([node.lat, node.lon]);
+                cluster.addLayer(entry.marker);
+            }
+        }
+        entry.color = node.color;
+        entry.tooltip = node.tooltip;
+        entry.marker.setPopupContent(node.popup);
+        applyStyle(entry);
+
+        if (highlight !== null && highlight.id === node.id) {
+            highlight.ring.setLatLng([node.lat, node.lon]);
+        }
+    }
+
+    function remove(id) {
+        var entry = markers[id];
+        if (entry === undefined) {
+            return;
+        }
+        if (highlight !== null && highlight.id === id) {
+            clearHighlight();
+        }
+        cluster.removeLayer(entry.marker);
+        delete markers[id];
+    }
+
+    function setHighlight(id, position) {
+        clearHighlight();
+        var entry = markers[id];
+        var latLng = entry !== undefined ? entry.marker.getLatLng() : position;
+        if (latLng === null || latLng === undefined) {
+            return;
+        }
+        // The marker may only arrive after the view has moved to it, upsert() styles it then.
+        var ring = L.circleMarker(latLng, {
+            radius: 20, color: "red", fill: false, weight: 1, opacity: 0.5
+        }).addTo(map);
+        highlight = {id: id, ring: ring};
+        if (entry !== undefined) {
+            applyStyle(entry);
+        }
+        map.setView(latLng, 15);
+    }
+
+    function addCluster(item) {
+        var size = item.count < 10 ? "small" : item.count < 100 ? "medium" : "large";
+        var marker = L.marker([item.lat, item.lon], {
+            icon: L.divIcon({
+                html: "<div><span>" + item.count + "</span></div>",
+                className: "marker-cluster marker-cluster-" + size,
+                iconSize: L.point(40, 40)
+            })
+        });
+        marker.on("click", function () {
+            map.setView(marker.getLatLng(), map.getZoom() + 2);
+        });
+        clusterLayer.addLayer(marker);
+    }
+
+    function clearHighlight() {
+        if (highlight === null) {
+            return;
+        }
+        var entry = markers[highlight.id];
+        map.removeLayer(highlight.ring);
+        highlight = null;
+        if (entry !== undefined) {
+            applyStyle(entry);
+        }
+    }
+
+    function upsertLink(link) {
+        var line = links[link.id];
+        if (line === undefined) {
+            line = L.polyline([link.from, link.to], {renderer: linkRenderer, interactive: true});
+            line.bindTooltip("");
+            links[link.id] = line;
+            linkLayer.addLayer(line);
+        } else {
+            line.setLatLngs([link.from, link.to]);
+        }
+        line.setStyle({color: link.color, weight: link.weight, opacity: 0.7});
+        line.setTooltipContent(link.tooltip);
+    }
+
+    function removeLink(id) {
+        var line = links[id];
+        if (line !== undefined) {
+            linkLayer.removeLayer(line);
+            delete links[id];
+        }
+    }
+
+    return {
+        setHeat: function (points) {
+            if (heat !== null) {
+                heat.setLatLngs(points);
+            }
+        },
+        updateLinks: function (items) {
+            items.forEach(upsertLink);
+        },
+        removeLinks: function (ids) {
+            ids.forEach(removeLink);
+        },
+        update: function (nodes) {
+            nodes.forEach(upsert);
+        },
+        setClusters: function (items) {
+            clusterLayer.clearLayers();
+            items.forEach(addCluster);
+        },
+        fit: function (bounds) {
+            map.fitBounds([[bounds[0], bounds[1]], [bounds[2], bounds[3]]], {maxZoom: 12});
+        },
+        remove: function (ids) {
+            ids.forEach(remove);
+        },
+        highlight: setHighlight,
+        clearHighlight: clearHighlight
+    };
+}
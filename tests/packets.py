@@ -0,0 +1,14 @@
+from app.utilities.Packet import Packet, PacketDecoded
+
+
+def make_packet(packet_id: int = 1, node_from: int = 0x10000001, rx_time: float = 1000.0,
+                **values) -> Packet:
+    """Paket mit sinnvollen Standardwerten, einzelne Felder per Schlüsselwort"""
+    decoded = values.pop('decoded', None) or PacketDecoded(
+        portnum=values.pop('portnum', 'TEXT_MESSAGE_APP'), payload=values.pop('payload', b'hello'),
+        text='hello', bitfield=None)
+    fields = dict(id=packet_id, nodeFrom=node_from, fromId=f"!{node_from:08x}",
+                  nodeTo=0xFFFFFFFF, toId='^all', decoded=decoded, rxTime=rx_time,
+                  rxSnr=5.0, rxRssi=-90)
+    fields.update(values)
+    return Packet(**fields)
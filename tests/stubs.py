@@ -0,0 +1,18 @@
+from pubsub import pub
+
+from app.utilities.Session import Session
+
+TOPICS = [topic for _, topic in Session().subscriptions()]
+
+
+class StubInterface:
+    """Gerät ohne Verkehr, nur für Verbindungsaufbau und Trennen"""
+    nodes = {}
+
+    def close(self) -> None:
+        pass
+
+
+def listener_count(topic: str) -> int:
+    topic_obj = pub.getDefaultTopicMgr().getTopic(topic, okIfNone=True)
+    return 0 if topic_obj is None else len(topic_obj.getListeners())
@@ -0,0 +1,62 @@
+import pytest
+
+from app.utilities.Airtime import (AirtimeStatistics, HEADER_BYTES, DATA_OVERHEAD_BYTES,
+                                   MAX_PAYLOAD_BYTES, PKI_OVERHEAD_BYTES, packet_length,
+                                   time_on_air)
+from app.utilities.OutageLog import OutageLog
+from tests.packets import make_packet
+
+
+@pytest.mark.parametrize("length, bandwidth, spreading_factor, preamble, expected", [
+    # Semtech LoRa Calculator, CR 4/5, expliziter Header, CRC an
+    (10, 125000, 7, 8, 0.041216),
+    (10, 125000, 12, 8, 0.991232),
+    (51, 250000, 11, 16, 0.641024),
+])
+def test_time_on_air_matches_semtech_calculator(length, bandwidth, spreading_factor, preamble,
+                                                expected):
+    assert time_on_air(length, bandwidth, spreading_factor, 5, preamble) == pytest.approx(expected)
+
+
+def test_time_on_air_grows_with_length():
+    short = time_on_air(20, 250000, 11, 5)
+    long = time_on_air(200, 250000, 11, 5)
+    assert 0 < short < long
+
+
+def test_packet_length():
+    assert packet_length(make_packet(payload=b'x' * 10)) == HEADER_BYTES + DATA_OVERHEAD_BYTES + 10
+    assert packet_length(make_packet(payload=b'x' * 10, pkiEncrypted=True)) == \
+        HEADER_BYTES + DATA_OVERHEAD_BYTES + 10 + PKI_OVERHEAD_BYTES
+    assert packet_length(make_packet(payload=b'x' * 1000)) == MAX_PAYLOAD_BYTES
+
+
+def test_utilization_per_node_and_channel():
+    airtime = AirtimeStatistics('LONG_FAST', window=600, bucket=60)
+    packets = [make_packet(i, node_from=1 + i % 2, rx_time=1200 + i * 5, channel=i % 2)
+               for i in range(60)]
+    airtime.add_packets(packets)
+
+    duration = airtime.airtime(packets[0])
+    assert airtime.node_airtime(1) == pytest.approx(30 * duration)
+    assert airtime.channel_utilization() == pytest.approx(60 * duration / airtime.span() * 100)
+    assert airtime.channel_utilization(0) == pytest.approx(airtime.channel_utilization() / 2)
+    assert sum(airtime.node_histogram(1)) == pytest.approx(airtime.node_airtime(1))
+
+
+def test_window_expires_old_buckets():
+    airtime = AirtimeStatistics('LONG_FAST', window=120, bucket=60)
+    airtime.add_packet(make_packet(1, rx_time=0))
+    airtime.add_packet(make_packet(2, rx_time=1000))
+    assert airtime.node_airtime(0x10000001) == pytest.approx(airtime.airtime(make_packet()))
+
+
+def test_outages_are_left_out_of_the_span():
+    outages = OutageLog()
+    airtime = AirtimeStatistics('LONG_FAST', window=600, bucket=60, outages=outages)
+    airtime.add_packet(make_packet(1, rx_time=1000))
+    airtime.add_packet(make_packet(2, rx_time=1600))
+    assert airtime.span() == pytest.approx(600)
+    outages.begin(1100)
+    outages.end(1400)
+    assert airtime.span() == pytest.approx(300)
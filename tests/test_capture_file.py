@@ -0,0 +1,63 @@
+import pytest
+
+from app.utilities.CaptureFile import (CaptureReader, CaptureWriter, RECORD_NODES,
+                                       RECORD_PACKET)
+from app.utilities.ReplayInterface import ReplayInterface
+
+PACKET = {'id': 7, 'from': 1, 'to': 2, 'rxSnr': 4.5,
+          'decoded': {'portnum': 'TEXT_MESSAGE_APP', 'payload': b'\x00\xffhi', 'text': 'hi'}}
+NODES = {'!00000001': {'num': 1, 'user': {'id': '!00000001', 'longName': 'One'}}}
+
+
+def test_round_trip_keeps_bytes_and_order(tmp_path):
+    path = tmp_path / "capture.mtmcap"
+    writer = CaptureWriter(str(path))
+    writer.write_nodes(NODES)
+    writer.write_packet(PACKET)
+    writer.close()
+
+    records = list(CaptureReader(str(path)))
+    assert [record[0] for record in records] == [RECORD_NODES, RECORD_PACKET]
+    assert records[0][2] == NODES
+    assert records[1][2] == PACKET
+    assert records[0][1] <= records[1][1]
+
+
+def test_append_to_existing_capture(tmp_path):
+    path = str(tmp_path / "capture.mtmcap")
+    for _ in range(2):
+        writer = CaptureWriter(path)
+        writer.write_packet(PACKET)
+        writer.close()
+    assert len(list(CaptureReader(path))) == 2
+
+
+def test_truncated_last_record_is_skipped(tmp_path):
+    path = tmp_path / "capture.mtmcap"
+    writer = CaptureWriter(str(path))
+    writer.write_packet(PACKET)
+    writer.write_packet(PACKET)
+    writer.close()
+    path.write_bytes(path.read_bytes()[:-3])
+    assert len(list(CaptureReader(str(path)))) == 1
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a capture")
+    with pytest.raises(ValueError):
+        CaptureReader(str(path))
+
+
+def test_replay_loads_leading_node_database(tmp_path):
+    path = str(tmp_path / "capture.mtmcap")
+    writer = CaptureWriter(path)
+    writer.write_nodes(NODES)
+    writer.write_packet(PACKET)
+    writer.close()
+
+    interface = ReplayInterface(path, speed=0)
+    try:
+        assert interface.nodes == NODES
+    finally:
+        interface.close()
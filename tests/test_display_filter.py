@@ -0,0 +1,56 @@
+import pytest
+
+from app.utilities.DisplayFilter import DisplayFilter, FilterError
+
+
+def row(**values):
+    return values.get
+
+
+def test_numeric_comparison():
+    display_filter = DisplayFilter("rxSnr > 0 && hopLimit <= 3")
+    assert display_filter(row(rxSnr=5.0, hopLimit=3))
+    assert not display_filter(row(rxSnr=-1.0, hopLimit=3))
+    assert not display_filter(row(rxSnr=5.0, hopLimit=7))
+
+
+def test_missing_value_matches_only_not_equal():
+    assert not DisplayFilter("rxSnr > 0")(row(rxSnr=None))
+    assert DisplayFilter("rxSnr != 0")(row(rxSnr=None))
+    assert DisplayFilter("rxSnr == none")(row(rxSnr=None))
+
+
+def test_hex_node_number():
+    display_filter = DisplayFilter("from == 0x10")
+    assert display_filter(row(nodeFrom=16))
+    assert not display_filter(row(nodeFrom=17))
+
+
+def test_non_numeric_value_does_not_match():
+    assert not DisplayFilter("from > 5")(row(nodeFrom='Unknown'))
+
+
+def test_in_and_not():
+    display_filter = DisplayFilter("!(hopLimit in {1, 2})")
+    assert display_filter(row(hopLimit=3))
+    assert not display_filter(row(hopLimit=2))
+
+
+@pytest.mark.parametrize("op", ['<', '<=', '>', '>='])
+def test_ordering_against_none_is_rejected(op):
+    with pytest.raises(FilterError):
+        DisplayFilter(f"rxSnr {op} none")
+
+
+@pytest.mark.parametrize("expression", ["", "rxSnr >", "unknownField == 1", "rxSnr > abc",
+                                        "(rxSnr > 1"])
+def test_invalid_expressions(expression):
+    with pytest.raises(FilterError):
+        DisplayFilter(expression)
+
+
+def test_candidates_intersect_indexed_fields():
+    index = {('portnum', 'TEXT_MESSAGE_APP'): [1, 2, 3], ('fromId', '!0000000a'): [2, 3, 4]}
+    display_filter = DisplayFilter("portnum == TEXT_MESSAGE_APP && fromId == !0000000a")
+    assert display_filter.candidates(lambda field, value: index.get((field, value), ())) == {2, 3}
+    assert DisplayFilter("rxSnr > 0").candidates(lambda field, value: ()) is None
@@ -0,0 +1,46 @@
+import time
+
+from PyQt6.QtCore import QThread
+
+from app.utilities.Interface import Interface
+from tests.stubs import StubInterface, TOPICS, listener_count
+
+
+class StubQtInterface(Interface):
+    def create_interface(self):
+        return StubInterface()
+
+
+def test_keyword_arguments_reach_session():
+    interface = Interface(batch_interval=0.5, batch_size=7, reconnect=False, reconnect_delay=2.0,
+                          reconnect_max_delay=9.0, reconnect_attempts=3, reconnect_stable=4.0)
+    assert isinstance(interface, QThread)
+    assert (interface.batch_interval, interface.batch_size) == (0.5, 7)
+    assert (interface.reconnect, interface.reconnect_delay, interface.reconnect_max_delay,
+            interface.reconnect_attempts, interface.reconnect_stable) == (False, 2.0, 9.0, 3, 4.0)
+
+    # Die Callbacks der Session landen in den Qt-Signalen
+    received = []
+    interface.connection_status.connect(lambda connected, message: received.append(message))
+    interface.outage_recorded.connect(lambda name, start, end: received.append(name))
+    interface.on_status(True, "Connected")
+    interface.on_outage("radio", 1.0, 2.0)
+    assert received == ["Connected", "radio"]
+
+
+def test_session_run_and_disconnect_in_qthread():
+    interface = StubQtInterface(batch_interval=0.01)
+    for _ in range(3):
+        interface.connect('synthetic', '', '', '')
+        deadline = time.monotonic() + 5
+        while not interface.connected:
+            assert time.monotonic() < deadline, "interface did not connect"
+            time.sleep(0.01)
+        # QThread.start() führt Session.run aus, nicht die leere QThread.run
+        assert interface.isRunning()
+        assert [listener_count(topic) for topic in TOPICS] == [1] * len(TOPICS)
+
+        interface.disconnect()
+        assert not interface.isRunning()
+        assert not interface.running
+        assert [listener_count(topic) for topic in TOPICS] == [0] * len(TOPICS)
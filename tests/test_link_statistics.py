@@ -0,0 +1,53 @@
+import pytest
+
+from app.utilities.LinkStatistics import LinkStatistics
+from app.utilities.OutageLog import OutageLog
+from tests.packets import make_packet
+
+NODE = 0x10000001
+
+
+def test_summary_of_signal_values_and_hops():
+    statistics = LinkStatistics(window=600, bucket=10)
+    snrs = [-10.0, -5.0, 0.0, 5.0, 10.0]
+    statistics.add_packets([make_packet(i, rx_time=1000 + i * 30, rxSnr=snr, rxRssi=-100 + i,
+                                        hopStart=3, hopLimit=3 - i % 2)
+                            for i, snr in enumerate(snrs)])
+
+    summary = statistics.summary(NODE)
+    assert summary.packets == 5
+    assert summary.snr_mean == pytest.approx(0.0)
+    assert (summary.snr_min, summary.snr_max) == (-10.0, 10.0)
+    assert summary.snr_p50 == pytest.approx(0.25)
+    assert (summary.rssi_min, summary.rssi_max) == (-100, -96)
+    assert summary.hops == {0: 3, 1: 2}
+    # 5 Pakete in 120 s
+    assert summary.rate == pytest.approx(2.5)
+
+
+def test_packets_without_signal_count_only_for_rate():
+    statistics = LinkStatistics()
+    statistics.add_packet(make_packet(1, rxRssi=0))
+    summary = statistics.summary(NODE)
+    assert summary.packets == 1
+    assert summary.snr_mean is None
+
+
+def test_old_packets_leave_the_window():
+    statistics = LinkStatistics(window=60, bucket=10)
+    statistics.add_packet(make_packet(1, rx_time=1000, rxSnr=-20.0))
+    statistics.add_packet(make_packet(2, rx_time=2000, rxSnr=8.0))
+    summary = statistics.summary(NODE)
+    assert summary.packets == 1
+    assert (summary.snr_min, summary.snr_max) == (8.0, 8.0)
+    assert statistics.summary(0x12345678) is None
+
+
+def test_outages_do_not_lower_the_rate():
+    outages = OutageLog()
+    statistics = LinkStatistics(window=600, bucket=10, outages=outages)
+    statistics.add_packets([make_packet(1, rx_time=1000), make_packet(2, rx_time=1300)])
+    assert statistics.summary(NODE).rate == pytest.approx(0.4)
+    outages.begin(1100)
+    outages.end(1250)
+    assert statistics.summary(NODE).rate == pytest.approx(0.8)
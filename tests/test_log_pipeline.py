@@ -0,0 +1,46 @@
+import logging
+
+from app.utilities.LogPipeline import LogCollector, RepeatFilter
+
+
+def collector_with_filter(interval: float = 10.0):
+    collector = LogCollector()
+    repeat_filter = RepeatFilter(collector, interval)
+    collector.addFilter(repeat_filter)
+    return collector, repeat_filter
+
+
+def record(message: str, created: float) -> logging.LogRecord:
+    entry = logging.LogRecord("test", logging.ERROR, "", 0, message, None, None)
+    entry.created = created
+    return entry
+
+
+def messages(collector: LogCollector) -> list:
+    return [message for _, _, _, message in collector.drain()]
+
+
+def test_storm_is_summarized_on_next_distinct_message():
+    collector, _ = collector_with_filter()
+    for i in range(50):
+        collector.handle(record("boom", 100 + i * 0.01))
+    collector.handle(record("other", 101))
+    assert messages(collector) == ["boom", "boom (repeated 49 more times)", "other"]
+
+
+def test_storm_is_summarized_on_flush():
+    collector, repeat_filter = collector_with_filter()
+    for i in range(3):
+        collector.handle(record("boom", 100 + i))
+    repeat_filter.flush()
+    assert messages(collector) == ["boom", "boom (repeated 2 more times)"]
+
+
+def test_repeat_after_interval_passes_unchanged():
+    collector, _ = collector_with_filter(interval=10.0)
+    original = record("boom", 100)
+    collector.handle(original)
+    collector.handle(record("boom", 101))
+    collector.handle(record("boom", 111))
+    assert messages(collector) == ["boom", "boom (repeated 1 more times)", "boom"]
+    assert original.getMessage() == "boom"
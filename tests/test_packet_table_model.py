@@ -0,0 +1,53 @@
+from app.ui.models.PacketTableModel import PacketTableModel
+from tests.packets import make_packet
+
+
+def column(model: PacketTableModel, field: str) -> list:
+    return [model.store.value(model.store_row(row), field) for row in range(model.rowCount())]
+
+
+def test_repeats_fold_into_one_row():
+    model = PacketTableModel(100)
+    model.add_packets([make_packet(1, rxSnr=2.0, relayNode=0x11),
+                       make_packet(2),
+                       make_packet(1, rxSnr=-4.0, relayNode=0x22)])
+    model.add_packets([make_packet(1, rxSnr=7.0, relayNode=0x11)])
+
+    assert column(model, 'id') == [1, 2]
+    assert column(model, 'heard') == [3, 1]
+    assert column(model, 'relays')[0] == (0x11, 0x22)
+    assert (column(model, 'snrBest')[0], column(model, 'snrWorst')[0]) == (7.0, -4.0)
+
+
+def test_same_id_from_other_node_is_a_new_row():
+    model = PacketTableModel(100)
+    model.add_packets([make_packet(1, node_from=1), make_packet(1, node_from=2)])
+    assert model.rowCount() == 2
+
+
+def test_repeat_after_window_is_a_new_row():
+    model = PacketTableModel(100, repeat_window=60)
+    model.add_packets([make_packet(1, rx_time=1000)])
+    model.add_packets([make_packet(1, rx_time=1100)])
+    assert column(model, 'heard') == [1, 1]
+
+
+def test_raw_view_keeps_every_copy():
+    model = PacketTableModel(100, collapse=False)
+    model.add_packets([make_packet(1), make_packet(1)])
+    assert model.rowCount() == 2
+
+
+def test_missing_snr_does_not_break_folding():
+    model = PacketTableModel(100)
+    model.add_packets([make_packet(1, rxSnr=None), make_packet(1, rxSnr=None),
+                       make_packet(1, rxSnr=3.0)])
+    assert column(model, 'heard') == [3]
+    assert (column(model, 'snrBest')[0], column(model, 'snrWorst')[0]) == (3.0, 3.0)
+
+
+def test_evicted_row_is_not_folded():
+    model = PacketTableModel(2)
+    model.add_packets([make_packet(1), make_packet(2), make_packet(3)])
+    model.add_packets([make_packet(1)])
+    assert column(model, 'id') == [3, 1]
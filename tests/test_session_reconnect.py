@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from pubsub import pub
+
+from app.utilities.Session import Session
+from tests.stubs import StubInterface
+
+
+class FlakySession(Session):
+    """Sitzung, deren Verbindungsaufbau nach dem ersten Mal failures-mal scheitert"""
+
+    def __init__(self, failures: int = 0, **kwargs) -> None:
+        super().__init__(batch_interval=0.01, reconnect_delay=0.01, reconnect_max_delay=0.05,
+                         on_status=lambda connected, message: self.status.append(connected),
+                         on_outage=lambda name, start, end: self.outage_log.append(end - start),
+                         **kwargs)
+        self.failures = failures
+        self.opened = 0
+        self.status = []
+        self.outage_log = []
+
+    def create_interface(self):
+        self.opened += 1
+        if self.opened > 1 and self.failures:
+            self.failures -= 1
+            raise ConnectionError("device busy")
+        return StubInterface()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def lose_connection(session: Session) -> None:
+    wait_for(lambda: session.connected)
+    pub.sendMessage("meshtastic.connection.lost", interface=session.interface)
+
+
+def test_backoff_doubles_up_to_max_delay():
+    session = Session(reconnect_delay=1.0, reconnect_max_delay=10.0)
+    session.random.uniform = lambda low, high: high
+    assert [session.backoff(attempt) for attempt in range(1, 7)] == [1, 2, 4, 8, 10, 10]
+
+
+def test_backoff_jitter_stays_within_half_delay():
+    session = Session(reconnect_delay=4.0)
+    delays = [session.backoff(1) for _ in range(200)]
+    assert all(2.0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize("reconnect, attempts, attempt, expected", [
+    (False, 0, 0, True),
+    (True, 0, 1000, False),
+    (True, 3, 2, False),
+    (True, 3, 3, True),
+])
+def test_gave_up(reconnect, attempts, attempt, expected):
+    session = Session(reconnect=reconnect, reconnect_attempts=attempts)
+    assert session.gave_up(attempt) is expected
+
+
+def test_reconnects_after_connection_lost():
+    session = FlakySession(failures=2)
+    session.connect('synthetic', '', '', '')
+    try:
+        lose_connection(session)
+        wait_for(lambda: session.opened == 4 and session.connected)
+        assert session.isRunning()
+        assert len(session.outage_log) == 1
+        assert session.status[0] is True and session.status[-1] is True
+    finally:
+        session.disconnect()
+    assert not session.isRunning()
+
+
+def test_gives_up_after_max_attempts():
+    session = FlakySession(failures=5, reconnect_attempts=2)
+    session.connect('synthetic', '', '', '')
+    lose_connection(session)
+    wait_for(lambda: not session.isRunning())
+    # Erster Aufbau und zwei Wiederholungen
+    assert session.opened == 3
+    assert not session.connected
+    assert session.status[-1] is False
+
+
+def test_first_connect_is_not_retried():
+    session = FlakySession()
+    session.opened = 1
+    session.failures = 1
+    session.connect('synthetic', '', '', '')
+    wait_for(lambda: not session.isRunning())
+    assert session.opened == 2
+    assert session.status == [False]
+
+
+def test_flapping_connection_keeps_backing_off():
+    session = FlakySession(reconnect_stable=60.0)
+    delays = []
+    session.backoff = lambda attempt: delays.append(attempt) or 0.0
+    session.connect('synthetic', '', '', '')
+    try:
+        for _ in range(3):
+            opened = session.opened
+            lose_connection(session)
+            wait_for(lambda: session.opened > opened and session.connected)
+    finally:
+        session.disconnect()
+    assert delays == [1, 2, 3]
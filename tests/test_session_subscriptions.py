@@ -0,0 +1,28 @@
+import time
+
+from app.utilities.Session import Session
+from tests.stubs import StubInterface, TOPICS, listener_count
+
+
+class StubSession(Session):
+    def create_interface(self):
+        return StubInterface()
+
+
+def wait_connected(session: Session, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not session.connected:
+        assert time.monotonic() < deadline, "session did not connect"
+        time.sleep(0.01)
+
+
+def test_one_listener_per_topic_across_reconnects():
+    session = StubSession(batch_interval=0.01)
+    for _ in range(5):
+        session.connect('synthetic', '', '', '')
+        wait_connected(session)
+        assert [listener_count(topic) for topic in TOPICS] == [1] * len(TOPICS)
+
+        session.disconnect()
+        assert not session.isRunning()
+        assert [listener_count(topic) for topic in TOPICS] == [0] * len(TOPICS)
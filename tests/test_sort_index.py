@@ -0,0 +1,54 @@
+import random
+
+from app.utilities.SortIndex import BLOCK_SIZE, SortIndex
+
+
+def rows(index: SortIndex) -> list:
+    return [index.seq_at(row) for row in range(len(index))]
+
+
+def test_numeric_sort_is_stable_with_missing_values_last():
+    values = [3.0, None, 1.0, 3.0, 2.0]
+    index = SortIndex(values, first_seq=10, numeric=True)
+    assert rows(index) == [12, 14, 10, 13, 11]
+
+
+def test_descending_keeps_missing_values_last():
+    index = SortIndex([1, None, 2], first_seq=0, descending=True, numeric=True)
+    assert rows(index) == [2, 0, 1]
+
+
+def test_non_numeric_values_in_numeric_column_sort_last():
+    index = SortIndex([5, 'Unknown', 3], first_seq=0, numeric=True)
+    assert rows(index) == [2, 0, 1]
+    index.insert('Unknown', 3)
+    index.insert(4, 4)
+    assert rows(index) == [2, 4, 0, 1, 3]
+    assert index.row_of('Unknown', 3) == 4
+    index.remove('Unknown', 1)
+    assert rows(index) == [2, 4, 0, 3]
+
+
+def test_text_sort():
+    index = SortIndex(['b', 'a', None, 'c'], first_seq=0)
+    assert rows(index) == [1, 0, 3, 2]
+
+
+def test_incremental_inserts_match_full_sort():
+    rng = random.Random(1)
+    values = [rng.choice([None, rng.randint(0, 50)]) for _ in range(3 * BLOCK_SIZE)]
+    index = SortIndex([], first_seq=0, numeric=True)
+    for seq, value in enumerate(values):
+        assert index.insert_row(value) == index.insert_row(value)
+        index.insert(value, seq)
+    assert rows(index) == rows(SortIndex(values, first_seq=0, numeric=True))
+
+    for seq in range(BLOCK_SIZE):
+        index.remove(values[seq], seq)
+    assert rows(index) == rows(SortIndex(values[BLOCK_SIZE:], first_seq=BLOCK_SIZE, numeric=True))
+
+
+def test_row_of_and_insert_row_descending():
+    index = SortIndex([1.0, 2.0, 3.0], first_seq=0, descending=True, numeric=True)
+    assert index.insert_row(2.5) == 1
+    assert [index.row_of(value, seq) for seq, value in enumerate([1.0, 2.0, 3.0])] == [2, 1, 0]